@@ -0,0 +1,139 @@
+"""
+BatchSolve
+
+- A program that solves a large number of cubes across every core of the machine with a process pool
+- States can be Cube objects, canonical integers from Cube.encode(), compact keys from Cube.compact_key(), or lines of text holding a compact key in hex
+- Every worker process memory-maps the solver tables from disk (see the Tables module) instead of receiving a pickled copy,
+    so the operating system shares one copy of the tables between all the workers
+- Results come back in the same order as the states, streamed one window of states at a time
+    only two windows are ever held in memory (one being solved while the one before it is handed back), so the input never needs to fit in memory
+- Usage:
+    python BatchSolve.py states.txt [--output solutions.txt] [--processes N] [--optimal]
+    every line of the output is the compact key in hex followed by the solution, or "error: ..." if the state couldn't be solved
+    the first --optimal run builds the tables of the optimal solver before any worker starts, which takes about 8 minutes and is reported on stderr
+    (python OptimalSolver.py builds them ahead of time)
+
+"""
+
+import argparse
+import sys
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from RubiksCube import Cube
+
+# the solver of the current worker process, created once by init_worker
+worker_solver = None
+
+# turns any supported kind of state into a compact key, which is the smallest thing to send to a worker
+def to_compact_key(state):
+
+    if isinstance(state, Cube):
+        return state.compact_key()
+
+    elif isinstance(state, int):
+        return Cube.decode(state).compact_key()
+
+    elif isinstance(state, (bytes, bytearray)):
+        return bytes(state)
+
+    return bytes.fromhex(state.strip())
+
+# loads the tables of a solver, which memory-maps them when they are already on disk
+def make_solver(optimal):
+
+    if optimal:
+        from OptimalSolver import OptimalSolver
+        return OptimalSolver()
+
+    from TwoPhaseSolver import TwoPhaseSolver
+    return TwoPhaseSolver()
+
+def init_worker(optimal):
+
+    global worker_solver
+    worker_solver = make_solver(optimal)
+
+# solves one state in a worker, returning its compact key (or the state itself if it couldn't be read) and either the list of move names or the error
+def solve_state(job):
+
+    key, max_length = job
+
+    try:
+        key = to_compact_key(key)
+        cube = Cube.decode(key)
+
+        if max_length is None:
+            return key, worker_solver.solve(cube), None
+
+        return key, worker_solver.solve(cube, max_length), None
+
+    except Exception as error:
+        return key, None, str(error)
+
+# solves every state of an iterable in a process pool, yielding (compact key, solution, error) in the same order as the states
+# states are read inside the workers, so a bad state only gives an error for its own result
+def solve_all(states, processes = None, optimal = False, max_length = 22, chunksize = 16):
+
+    # building the tables once up front keeps the workers from all building them at the same time
+    make_solver(optimal)
+
+    if optimal:
+        max_length = None
+
+    jobs = ((state, max_length) for state in states)
+    window = (processes or cpu_count()) * chunksize * 4
+
+    with Pool(processes, initializer = init_worker, initargs = (optimal,)) as pool:
+        pending = None
+
+        # the next window is handed to the workers before the results of the last one are yielded, so the workers never wait on the caller
+        while True:
+            batch = list(islice(jobs, window))
+
+            if not batch:
+                break
+
+            submitted = pool.map_async(solve_state, batch, chunksize)
+
+            if pending is not None:
+                yield from pending.get()
+
+            pending = submitted
+
+        if pending is not None:
+            yield from pending.get()
+
+# reads states from the lines of a file (or stdin when the path is "-") and writes one line per solution
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Solve many cubes at once across every core")
+    parser.add_argument("input", help = "file of compact keys in hex, one per line, or - for stdin")
+    parser.add_argument("--output", default = "-", help = "file to write the solutions to, or - for stdout")
+    parser.add_argument("--processes", type = int, default = None, help = "number of worker processes (defaults to the number of cores)")
+    parser.add_argument("--optimal", action = "store_true", help = "find shortest solutions with the optimal solver")
+    parser.add_argument("--max-length", type = int, default = 22, help = "longest solution the two-phase solver may return")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    lines = (line for line in source if line.strip())
+
+    for key, solution, error in solve_all(lines, args.processes, args.optimal, args.max_length):
+
+        if isinstance(key, bytes):
+            key = key.hex()
+
+        if error is not None:
+            output.write(key.strip() + " error: " + error + "\n")
+
+        else:
+            output.write(key + " " + " ".join(solution) + "\n")
+
+    if source is not sys.stdin:
+        source.close()
+
+    if output is not sys.stdout:
+        output.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+Benchmark
+
+- A program that measures the speed of the hot paths of the cube so that changes to the engine can be compared against a saved baseline
+- Every benchmark builds its workload up front from a fixed seed, so every run does exactly the same work
+- Every benchmark reports:
+    ops_per_sec - operations per second over the whole run
+    p50_us, p90_us, p99_us - percentiles of the time of a single operation in microseconds
+    peak_kb - the peak memory allocated while running the benchmark again under tracemalloc (which is slow, so it is a separate run)
+    the timed run is repeated (3 times by default) and the fastest run is reported, which keeps other programs on the machine from showing up as regressions
+- Results can be saved as a JSON baseline and later runs compared against it
+    a benchmark regresses when its ops_per_sec drops, or its p99_us or peak_kb grows, by more than the threshold (10% by default)
+- The cold start of a new process can be measured with --startup, which runs fresh Python processes that import a module and make a single move
+    the time from the start of the import to the end of the move is measured inside every process, and the median and fastest are reported against STARTUP_TARGET_MS
+- Usage:
+    python Benchmark.py [--quick] [--repeat N] [--only NAME ...] [--save baseline.json] [--compare baseline.json] [--threshold 0.1]
+    python Benchmark.py --startup [--repeat N]
+    the exit code is 1 when the comparison finds a regression
+
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from time import perf_counter
+from Matrix import matrix_mul
+from RotationMatrices import ROTATIONS
+from RubiksCube import Cube, Piece, SOLVED_STICKERS
+from PlayRubiksCube import PlayCube
+
+SEED = 2024
+
+# the most milliseconds a new process should take from importing the cube to making its first move
+STARTUP_TARGET_MS = 50
+
+# the program every startup process runs, which prints how many milliseconds the import and the first move took
+STARTUP_CODE = "from time import perf_counter; start = perf_counter(); import {module}; from RubiksCube import Cube; Cube().apply_move(0); print((perf_counter() - start) * 1000)"
+ANGLES = (90, 180, 270, -90, -180, -270)
+
+# the number of operations of every benchmark, and the smaller numbers used by --quick
+COUNTS = {
+    "matrix_mul": 200000,
+    "piece_rotate": 200000,
+    "cube_rotate": 200000,
+    "cube_turn": 200000,
+    "get_face": 200000,
+    "print_cube": 20000,
+    "random_walk": 1000000,
+    "scramble_verify": 2000,
+}
+QUICK_COUNTS = {
+    "matrix_mul": 20000,
+    "piece_rotate": 20000,
+    "cube_rotate": 20000,
+    "cube_turn": 20000,
+    "get_face": 20000,
+    "print_cube": 2000,
+    "random_walk": 100000,
+    "scramble_verify": 200,
+}
+
+# every benchmark takes the number of operations and a seeded random number generator and returns a function that does one operation per call
+
+# multiplies a rotation matrix by a position
+def bench_matrix_mul(count, rng):
+
+    args = [([[rng.choice((-1, 0, 1))] for n in range(3)], ROTATIONS[rng.randrange(24)]) for n in range(count)]
+    calls = iter(args)
+
+    def op():
+        pos, matrix = next(calls)
+        matrix_mul(pos, matrix)
+
+    return op
+
+# rotates a single corner piece
+def bench_piece_rotate(count, rng):
+
+    piece = Piece([[1], [1], [-1]], ["red", "white", "green"])
+    args = [(rng.choice("xyz"), rng.choice(ANGLES)) for n in range(count)]
+    calls = iter(args)
+
+    def op():
+        axis, angle = next(calls)
+        piece.rotate(axis, angle, "degrees")
+
+    return op
+
+# rotates a 3 x 3 portion of the cube picked through a front face piece, like PlayCube.rotate
+def bench_cube_rotate(count, rng):
+
+    cube = Cube()
+    args = [(rng.randint(1, 9), rng.choice("xyz"), rng.choice(ANGLES)) for n in range(count)]
+    calls = iter(args)
+
+    def op():
+        piece_num, axis, angle = next(calls)
+        cube.rotate(cube.get_face_piece(piece_num), axis, angle, "degrees")
+
+    return op
+
+# rotates the entire cube
+def bench_cube_turn(count, rng):
+
+    cube = Cube()
+    args = [(rng.choice("xyz"), rng.choice(ANGLES)) for n in range(count)]
+    calls = iter(args)
+
+    def op():
+        axis, angle = next(calls)
+        cube.turn(axis, angle, "degrees")
+
+    return op
+
+# makes a move and reads the front face, so the face always has to be read again
+def bench_get_face(count, rng):
+
+    cube = Cube()
+    moves = iter([rng.randrange(36) for n in range(count)])
+
+    def op():
+        cube.apply_move(next(moves))
+        cube.get_face()
+
+    return op
+
+# makes a move and renders the full net of the cube
+def bench_print_cube(count, rng):
+
+    cube = Cube()
+    moves = iter([rng.randrange(36) for n in range(count)])
+    sink = io.StringIO()
+
+    def op():
+
+        cube.apply_move(next(moves))
+        sink.seek(0)
+
+        with contextlib.redirect_stdout(sink):
+            cube.print_cube()
+
+    return op
+
+# a long random walk of single moves
+def bench_random_walk(count, rng):
+
+    cube = Cube()
+    moves = iter([rng.randrange(36) for n in range(count)])
+
+    def op():
+        cube.apply_move(next(moves))
+
+    return op
+
+# scrambles the cube with PlayCube's 100 random moves, then undoes every move and checks that the cube is solved again
+def bench_scramble_verify(count, rng):
+
+    play = PlayCube()
+
+    def op():
+
+        play.random_moves(rng = rng)
+
+        while play.journal.undo():
+            pass
+
+        if play.cube.stickers != SOLVED_STICKERS:
+            raise Exception("Undoing a scramble did not solve the cube")
+
+        play.journal.clear()
+
+    return op
+
+BENCHMARKS = {
+    "matrix_mul": bench_matrix_mul,
+    "piece_rotate": bench_piece_rotate,
+    "cube_rotate": bench_cube_rotate,
+    "cube_turn": bench_cube_turn,
+    "get_face": bench_get_face,
+    "print_cube": bench_print_cube,
+    "random_walk": bench_random_walk,
+    "scramble_verify": bench_scramble_verify,
+}
+
+# the value at a fraction of the way through sorted samples
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+# runs one benchmark repeat times, timing every operation and keeping the fastest run, and then runs it again under tracemalloc for its peak memory
+def run_benchmark(name, count, repeat = 3):
+
+    total = None
+
+    for r in range(repeat):
+        op = BENCHMARKS[name](count, random.Random(SEED))
+        run_samples = [0.0] * count
+        start = perf_counter()
+
+        for n in range(count):
+            t = perf_counter()
+            op()
+            run_samples[n] = perf_counter() - t
+
+        run_total = perf_counter() - start
+
+        if total is None or run_total < total:
+            total = run_total
+            samples = run_samples
+
+    samples.sort()
+
+    op = BENCHMARKS[name](count, random.Random(SEED))
+    tracemalloc.start()
+
+    for n in range(count):
+        op()
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "ops": count,
+        "seconds": round(total, 4),
+        "ops_per_sec": round(count / total, 1),
+        "p50_us": round(percentile(samples, 0.5) * 1e6, 3),
+        "p90_us": round(percentile(samples, 0.9) * 1e6, 3),
+        "p99_us": round(percentile(samples, 0.99) * 1e6, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+# runs every benchmark (or only the named ones) and returns the results by name
+def run_all(names = None, quick = False, repeat = 3, verbose = True):
+
+    counts = QUICK_COUNTS if quick else COUNTS
+    results = {}
+
+    for name in names or BENCHMARKS:
+
+        if name not in BENCHMARKS:
+            raise Exception("There is no benchmark called " + name)
+
+        results[name] = run_benchmark(name, counts[name], repeat)
+
+        if verbose:
+            print(format_result(name, results[name]))
+
+    return results
+
+def format_result(name, result):
+    return name.ljust(16) + str(result["ops_per_sec"]).rjust(12) + " ops/s   p50 " + str(result["p50_us"]).rjust(9) + " us   p90 " + str(result["p90_us"]).rjust(9) + " us   p99 " + str(result["p99_us"]).rjust(9) + " us   peak " + str(result["peak_kb"]).rjust(9) + " KB"
+
+# compares results against a baseline, returning a line for every measurement that got worse by more than the threshold
+def compare(results, baseline, threshold = 0.1):
+
+    regressions = []
+
+    for name in results:
+
+        if name not in baseline:
+            continue
+
+        new = results[name]
+        old = baseline[name]
+
+        if new["ops_per_sec"] < old["ops_per_sec"] * (1 - threshold):
+            regressions.append(name + ": ops_per_sec dropped from " + str(old["ops_per_sec"]) + " to " + str(new["ops_per_sec"]))
+
+        for key in ("p99_us", "peak_kb"):
+
+            # tiny values are mostly noise, so they only count once they grow by more than a microsecond or a kilobyte
+            if new[key] > old[key] * (1 + threshold) and new[key] - old[key] > 1:
+                regressions.append(name + ": " + key + " grew from " + str(old[key]) + " to " + str(new[key]))
+
+    return regressions
+
+# runs repeat new processes that each import a module and make one move, returning the milliseconds every process took
+# the first process is not counted, as it may be the one that compiles the modules and saves the tables of the Tables module
+def measure_startup(module = "RubiksCube", repeat = 11):
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    timings = []
+
+    for n in range(repeat + 1):
+        result = subprocess.run([sys.executable, "-c", STARTUP_CODE.format(module = module)], cwd = directory, capture_output = True, text = True, check = True)
+        timings.append(float(result.stdout))
+
+    return timings[1:]
+
+def format_startup(module, timings):
+
+    median = statistics.median(timings)
+    line = "cold start (import " + module + " and make one move): median " + str(round(median, 1)) + " ms, fastest " + str(round(min(timings), 1)) + " ms"
+    return line + (" - over the " + str(STARTUP_TARGET_MS) + " ms target" if median > STARTUP_TARGET_MS else "")
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Measure the speed of the cube and compare it against a saved baseline")
+    parser.add_argument("--quick", action = "store_true", help = "run every benchmark with a tenth of the operations")
+    parser.add_argument("--repeat", type = int, default = 3, help = "number of timed runs of every benchmark, of which the fastest is reported")
+    parser.add_argument("--only", nargs = "+", default = None, choices = list(BENCHMARKS), help = "run only these benchmarks")
+    parser.add_argument("--save", default = None, help = "file to save the results to as a JSON baseline")
+    parser.add_argument("--compare", default = None, help = "JSON baseline to compare the results against")
+    parser.add_argument("--threshold", type = float, default = 0.1, help = "fraction a measurement may get worse by before it counts as a regression")
+    parser.add_argument("--startup", action = "store_true", help = "measure the cold start of new processes instead of running the benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+
+        for module in ("RubiksCube", "PlayRubiksCube"):
+            print(format_startup(module, measure_startup(module)))
+
+        return 0
+
+    results = run_all(args.only, args.quick, args.repeat)
+
+    if args.save is not None:
+
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent = 2)
+
+    if args.compare is not None:
+
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+        for line in regressions:
+            print("regression - " + line)
+
+        if regressions:
+            return 1
+
+        print("no regressions")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
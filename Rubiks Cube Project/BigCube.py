@@ -0,0 +1,317 @@
+"""
+BigCube
+
+- A program that implements an N x N x N rubiks cube (2 x 2 x 2 and up) with one array of stickers per face, instead of one Piece object per piece
+- Every face is a bytearray of N * N sticker color codes, read row by row exactly like the faces of the MoveTables module
+    (U held so that B is above it, D held so that F is above it, and every other face held with U above it), with the faces in the order U, R, F, D, L, B
+    so the stickers of a 3 x 3 x 3 BigCube are laid out exactly like the stickers of a Cube
+- Layers are numbered 0 through N - 1 along an axis, from the negative end (L, D, or F) to the positive end (R, U, or B)
+    so layer n of a 3 x 3 x 3 is the layer at the coordinate value n - 1 of the RubiksCube module
+- Directions of positive rotation are defined by applying the right hand rule on an axis of rotation, exactly like Cube.rotate and Cube.turn
+- A move is (axis, layer, quarter turns), where layer is None when turning the entire cube
+    the stickers a layer carries around the axis are 4 rows or columns of N stickers, which every face array holds as a single slice (with a step of 1 or N)
+    so a quarter turn of a layer is 4 slice copies of N stickers, and an outer layer also turns the N x N stickers of its face
+- The slices of every move are found once per size, by rotating the position of every sticker with the rotation matrices of the RotationMatrices module, and shared by every cube of that size
+
+"""
+
+from operator import itemgetter
+from Matrix import matrix_mul, matrix_positions, positions_matrix
+from MoveTables import AXES, FACES, FACE_AXES
+from RotationMatrices import COLOR_ORDERS, QUARTER_TURNS, ROTATIONS, quarter_turns
+from RubiksCube import COLOR_LETTERS, FACELET_LETTERS
+
+# the move tables of every size that has been used, built the first time a cube of that size is made
+SIZE_TABLES = {}
+
+# returns the position of every sticker of a face of an N x N x N cube in reading order
+# positions are doubled so they stay integers: the layers along an axis are at -(N - 1), -(N - 3), ..., N - 3, N - 1
+def face_positions(face, size):
+
+    positions = []
+    h = size - 1
+
+    for r in range(size):
+
+        for c in range(size):
+            row = h - 2 * r
+            col = 2 * c - h
+
+            if face == "U":
+                positions.append((col, h, row))
+
+            elif face == "R":
+                positions.append((h, row, col))
+
+            elif face == "F":
+                positions.append((col, row, -h))
+
+            elif face == "D":
+                positions.append((col, -h, -row))
+
+            elif face == "L":
+                positions.append((-h, row, -col))
+
+            elif face == "B":
+                positions.append((-col, row, h))
+
+    return positions
+
+# returns the slice of a face array that covers indices which go up or down by the same step
+def index_slice(indices):
+
+    step = indices[1] - indices[0] if len(indices) > 1 else 1
+
+    for n in range(1, len(indices)):
+
+        if indices[n] - indices[n - 1] != step:
+            raise Exception("The stickers of a layer aren't a single row or column of a face")
+
+    stop = indices[-1] + step
+    return slice(indices[0], stop if stop >= 0 else None, step)
+
+# builds the moves of every layer of an N x N x N cube
+# moves[(axis, layer, k)] is (strips, spin), where strips is a list of (face, slice, new face, new slice) of the stickers carried around the axis
+# and spin is (face, itemgetter) that turns the stickers of the face of an outer layer, or None for an inner layer
+def build_tables(size):
+
+    # a sticker is identified by its position and the axis its color faces, like the STICKERS of the MoveTables module
+    stickers = []
+    sticker_index = {}
+
+    for f in range(len(FACES)):
+        positions = face_positions(FACES[f], size)
+        axis_index = FACE_AXES[FACES[f]][0]
+
+        for i in range(len(positions)):
+            sticker_index[(positions[i], axis_index)] = (f, i)
+            stickers.append((positions[i], axis_index, f, i))
+
+    # the stickers of every layer of every axis
+    layers = {}
+
+    for pos, color_axis, f, i in stickers:
+
+        for axis_index in range(3):
+            layer = (pos[axis_index] + size - 1) // 2
+            layers.setdefault((axis_index, layer), []).append((pos, color_axis, f, i))
+
+    moves = {}
+
+    for axis_index in range(3):
+        axis = AXES[axis_index]
+
+        for layer in range(size):
+            moved = layers[(axis_index, layer)]
+
+            for k in range(1, 4):
+                q = QUARTER_TURNS[(axis, k)]
+                rotated = matrix_positions(matrix_mul(positions_matrix([s[0] for s in moved]), ROTATIONS[q]))
+
+                # every sticker of the layer is sent to where its rotated position and color axis end up, gathered by the face it came from
+                sent = {}
+
+                for n in range(len(moved)):
+                    pos, color_axis, f, i = moved[n]
+                    sent.setdefault(f, []).append((i, sticker_index[(rotated[n], COLOR_ORDERS[q].index(color_axis))]))
+
+                strips = []
+                spin = None
+
+                for f in sent:
+                    pairs = sorted(sent[f])
+
+                    # the face of an outer layer turns in place, which is a permutation of all of its stickers
+                    if FACE_AXES[FACES[f]][0] == axis_index:
+                        p = [0] * (size * size)
+
+                        for i, (g, j) in pairs:
+                            p[j] = i
+
+                        spin = (f, itemgetter(*p))
+
+                    else:
+                        strips.append((f, index_slice([i for i, (g, j) in pairs]), pairs[0][1][0], index_slice([j for i, (g, j) in pairs])))
+
+                moves[(axis, layer, k)] = (strips, spin)
+
+    return moves
+
+# returns the move tables of a size, building them the first time
+def size_tables(size):
+
+    if size not in SIZE_TABLES:
+        SIZE_TABLES[size] = build_tables(size)
+
+    return SIZE_TABLES[size]
+
+"""
+BigCube Class
+
+"""
+
+# faces are mutable bytearrays, so unlike a Cube a BigCube isn't hashable, and key() should be used to keep its state
+class BigCube:
+
+    __slots__ = ("size", "faces", "moves")
+
+    def __init__(self, size = 3):
+
+        if size < 2:
+            raise Exception("A cube must be at least 2 x 2 x 2")
+
+        self.size = size
+        self.moves = size_tables(size)
+        self.init_cube()
+
+    # puts every sticker back on its solved face
+    def init_cube(self):
+        self.faces = [bytearray([f]) * (self.size * self.size) for f in range(len(FACES))]
+
+    # builds a cube out of the 6 * N * N bytes returned by key()
+    @classmethod
+    def from_key(cls, key):
+
+        size = 2
+
+        while 6 * size * size < len(key):
+            size += 1
+
+        if 6 * size * size != len(key):
+            raise Exception("A cube key must be 6 * N * N bytes long")
+
+        cube = cls(size)
+        area = size * size
+        cube.faces = [bytearray(key[f * area:(f + 1) * area]) for f in range(len(FACES))]
+        return cube
+
+    # the state of the cube as 6 * N * N bytes, face after face
+    def key(self):
+        return b"".join(self.faces)
+
+    # the state of the cube as a string of 6 * N * N face letters, like Cube.facelets()
+    def facelets(self):
+        return self.key().translate(FACELET_LETTERS).decode()
+
+    def copy(self):
+
+        cube = BigCube.__new__(BigCube)
+        cube.size = self.size
+        cube.moves = self.moves
+        cube.faces = [bytearray(face) for face in self.faces]
+        return cube
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __eq__(self, other):
+
+        if not isinstance(other, BigCube):
+            return NotImplemented
+
+        return self.faces == other.faces
+
+    __hash__ = None
+
+    # a cube is solved when every face is a single color, no matter how the entire cube is held
+    def is_solved(self):
+        return all([face.count(face[0]) == len(face) for face in self.faces])
+
+    # turns a layer (or the entire cube when layer is None) k quarter turns about an axis
+    def apply_move(self, axis, layer, k):
+
+        if layer is None:
+
+            for layer in range(self.size):
+                self.apply_move(axis, layer, k)
+
+            return
+
+        strips, spin = self.moves[(axis, layer, k % 4)] if k % 4 else ((), None)
+        faces = self.faces
+
+        # every strip is read before any is written, as the strips are carried around in a cycle
+        values = [faces[f][s] for f, s, g, t in strips]
+
+        for n in range(len(strips)):
+            f, s, g, t = strips[n]
+            faces[g][t] = values[n]
+
+        if spin is not None:
+            f, getter = spin
+            faces[f][:] = bytes(getter(faces[f]))
+
+    # rotates a layer of the cube, numbered 0 through N - 1 from the negative end of the axis
+    def rotate(self, layer, axis, angle, units = "radians"):
+
+        if axis not in AXES:
+            raise Exception("Inputted an invalid axis")
+
+        if not 0 <= layer < self.size:
+            raise Exception("Inputted an invalid layer")
+
+        k = quarter_turns(angle, units)
+
+        # returns the move that was applied, or None when the angle is a multiple of 360 degrees
+        if k == 0:
+            return None
+
+        self.apply_move(axis, layer, k)
+        return (axis, layer, k)
+
+    # rotates all layers of the cube
+    def turn(self, axis, angle, units = "radians"):
+
+        if axis not in AXES:
+            raise Exception("Inputted an invalid axis")
+
+        k = quarter_turns(angle, units)
+
+        if k == 0:
+            return None
+
+        self.apply_move(axis, None, k)
+        return (axis, None, k)
+
+    # returns a face as N strings, one per column, so face[c][r] is the first letter of the color at column c and row r (read like the MoveTables module)
+    def get_face(self, face = "F"):
+
+        letters = bytes(self.faces[FACES.index(face)]).translate(COLOR_LETTERS).decode()
+        return tuple([letters[c::self.size] for c in range(self.size)])
+
+    # returns the lines of an unfolded net of the cube, with U above F, then L, F, R, and B side by side, and D below F
+    def cube_lines(self):
+
+        faces = {}
+
+        for face in FACES:
+            faces[face] = self.get_face(face)
+
+        size = self.size
+        width = 2 * size + 2
+        blank = " " * width
+        border = "-" * (width * 4 + 1)
+        lines = ["Rubik's Cube (" + str(size) + " x " + str(size) + " x " + str(size) + "):", blank + "-" * (width + 1)]
+
+        for r in range(size):
+            lines.append(blank + "| " + " ".join([faces["U"][c][r] for c in range(size)]) + " |")
+
+        lines.append(border)
+
+        for r in range(size):
+            lines.append("| " + " | ".join([" ".join([faces[face][c][r] for c in range(size)]) for face in "LFRB"]) + " |")
+
+        lines.append(border)
+
+        for r in range(size):
+            lines.append(blank + "| " + " ".join([faces["D"][c][r] for c in range(size)]) + " |")
+
+        lines.append(blank + "-" * (width + 1))
+        return lines
+
+    # prints out all faces of the cube as an unfolded net
+    def print_cube(self):
+        print("\n".join(self.cube_lines()))
@@ -0,0 +1,41 @@
+"""
+Commands
+
+- A helper module with the commands shared by the programs that work on cubes one line of text at a time, which are the headless mode of PlayRubiksCube and the Server
+- A scramble request is "scramble [number of moves] [seed]", made of random moves of 3 x 3 portions of the cube (the moves of LAYER_MOVES)
+    a scramble has no limit on its moves unless max_moves is given, which the Server does so a single request can't keep it busy for long
+- A state is written either as a facelet string (see Cube.facelets()) or as the compact key of Cube.compact_key() in hex
+
+"""
+
+import random
+from MoveTables import MOVES
+
+# the moves that only rotate a 3 x 3 portion of the cube, which are the moves a scramble is made of
+LAYER_MOVES = [m for m in range(len(MOVES)) if MOVES[m][1] is not None]
+
+# applies a "scramble [number of moves] [seed]" request to a cube, using rng when no seed is given
+# a scramble of more than max_moves moves is refused, and max_moves = None allows any number of moves
+def scramble_cube(cube, words, rng, max_moves = None):
+
+    if len(words) > 3:
+        raise Exception("A scramble takes at most a number of moves and a seed")
+
+    num_moves = int(words[1]) if len(words) > 1 else 100
+
+    if max_moves is not None and num_moves > max_moves:
+        raise Exception("A scramble can be at most " + str(max_moves) + " moves")
+
+    if len(words) > 2:
+        rng = random.Random(int(words[2]))
+
+    for n in range(num_moves):
+        cube.apply_move(rng.choice(LAYER_MOVES))
+
+# writes the state of a cube in one of the compact line formats
+def format_state(cube, state_format = "facelets"):
+
+    if state_format == "key":
+        return cube.compact_key().hex()
+
+    return cube.facelets()
@@ -0,0 +1,104 @@
+"""
+CubeBatch
+
+- A program that holds a whole population of rubiks cubes in a single NumPy array and moves all of them at once
+- Requires NumPy
+- self.states is an (N, 54) uint8 array with one row per cube, holding exactly the same color codes as Cube.stickers
+- Moves use the same ids, names, and (axis, layer, quarter turns) conventions as the MoveTables module and Cube.rotate/Cube.turn
+- Applying a move to every cube is a single vectorized gather of the (N, 54) array
+
+"""
+
+import numpy as np
+from MoveTables import MOVES, MOVE_IDS, NAMED_MOVES, PERMS
+from RubiksCube import Cube, SOLVED_STICKERS
+
+# every permutation as one (36, 54) array so a different move can be gathered for every row
+# uint8 indices keep the per-row index arrays 8 times smaller than the default integer type, which roughly halves the gather time
+PERM_ARRAY = np.array(PERMS, dtype=np.uint8)
+
+# the sticker codes of a solved cube
+SOLVED = np.frombuffer(SOLVED_STICKERS, dtype=np.uint8)
+
+# the moves that only rotate a 3 x 3 portion of the cube, which are the moves PlayCube.scramble uses
+LAYER_MOVES = np.array([m for m in range(len(MOVES)) if MOVES[m][1] is not None], dtype=np.intp)
+
+# every pair of layer moves composed into one permutation, so scrambling gathers once per two moves
+LAYER_PAIRS = PERM_ARRAY[LAYER_MOVES][:, PERM_ARRAY[LAYER_MOVES]].reshape(-1, 54)
+
+# turns a move id, name, or (axis, layer, quarter turns) tuple into a move id
+def move_id(move):
+
+    if isinstance(move, str):
+        return NAMED_MOVES[move]
+
+    elif isinstance(move, tuple):
+        return MOVE_IDS[move]
+
+    return int(move)
+
+
+class CubeBatch:
+
+    def __init__(self, n):
+        self.states = np.tile(SOLVED, (n, 1))
+
+    def __len__(self):
+        return len(self.states)
+
+    # builds a batch out of a list of Cube objects
+    @classmethod
+    def from_cubes(cls, cubes):
+
+        batch = cls(0)
+        batch.states = np.frombuffer(b"".join([cube.stickers for cube in cubes]), dtype=np.uint8).reshape(-1, 54).copy()
+        return batch
+
+    # returns a Cube object with the same state as row i
+    def to_cube(self, i):
+
+        return Cube.from_key(self.states[i].tobytes())
+
+    # applies the same move to every cube
+    def apply_move(self, move):
+        self.states = self.states[:, PERM_ARRAY[move_id(move)]]
+
+    # applies a different move to every cube, where moves is a vector of move ids with one entry per row
+    def apply_moves(self, moves):
+
+        moves = np.asarray(moves, dtype=np.intp)
+
+        if moves.shape != (len(self.states),):
+            raise Exception("Provided moves do not match the number of cubes!")
+
+        self.states = np.take_along_axis(self.states, PERM_ARRAY[moves], axis = 1)
+
+    # applies a sequence of moves to every cube
+    def apply_sequence(self, moves):
+
+        # composing the sequence first means the population is only gathered once
+        perm = np.arange(54, dtype=np.uint8)
+
+        for m in moves:
+            perm = perm[PERM_ARRAY[move_id(m)]]
+
+        self.states = self.states[:, perm]
+
+    # randomly scrambles every cube independently by rotating random 3 x 3 portions
+    def scramble(self, num_moves = 100, rng = None):
+
+        if rng is None:
+            rng = np.random.default_rng()
+
+        for n in range(num_moves // 2):
+            pairs = rng.integers(len(LAYER_PAIRS), size = len(self.states))
+            self.states = np.take_along_axis(self.states, LAYER_PAIRS[pairs], axis = 1)
+
+        if num_moves % 2 == 1:
+            self.apply_moves(rng.choice(LAYER_MOVES, size = len(self.states)))
+
+    # returns a boolean vector telling which cubes have every face a single color
+    def solved(self):
+
+        faces = self.states.reshape(-1, 6, 9)
+        return np.all(faces == faces[:, :, :1], axis = (1, 2))
@@ -0,0 +1,370 @@
+"""
+Cubies
+
+- A helper module that describes the state of a rubiks cube by where its pieces (cubies) are and how they are twisted, rather than by its 54 stickers
+- Uses the standard numbering of the two-phase algorithm, with stickers laid out as described in the MoveTables module:
+    corner positions - URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB
+    side positions - UR, UF, UL, UB, DR, DF, DL, DB, FR, FL, BL, BR
+- cp[i] is the corner sitting at corner position i and co[i] is its twist (0, 1, or 2), counted by how far its U or D sticker is from the first sticker of the position
+- ep[i] is the side sitting at side position i and eo[i] is its flip (0 or 1)
+- centers is the index in MoveTables.ROTATION_PERMS of the way the 6 face pieces are held, since slice moves and entire cube turns move them
+- Standard coordinates:
+    twist - the twists of the first 7 corners in base 3 (the 8th is implied), 0 to 2186
+    flip - the flips of the first 11 sides in base 2 (the 12th is implied), 0 to 2047
+    slice - which 4 of the 12 side positions hold the 4 sides that belong between U and D (FR, FL, BL, BR), 0 to 494
+    corner_perm - rank of cp among all 8! permutations, 0 to 40319
+    edge_perm - rank of ep among all 12! permutations, 0 to 479001599
+    ud_edge_perm and slice_perm - ranks of the first 8 and last 4 sides, 0 to 40319 and 0 to 23, only meaningful once slice is 0
+- Every state also has a canonical integer built from centers, corner_perm, twist, edge_perm, and flip, which fits in ENCODED_BYTES bytes
+- References:
+    Two-phase algorithm - https://kociemba.org/cube.htm
+
+"""
+
+from math import comb
+from MoveTables import ROTATION_PERMS
+from Tables import load_or_build
+
+# the stickers of every corner and side position, starting with the sticker used to measure twists and flips
+CORNER_FACELETS = ((8, 9, 20), (6, 18, 38), (0, 36, 47), (2, 45, 11), (29, 26, 15), (27, 44, 24), (33, 53, 42), (35, 17, 51))
+EDGE_FACELETS = ((5, 10), (7, 19), (3, 37), (1, 46), (32, 16), (28, 25), (30, 43), (34, 52), (23, 12), (21, 41), (50, 39), (48, 14))
+CENTER_FACELETS = (4, 13, 22, 31, 40, 49)
+
+# the color codes of every corner and side, which are the face of each solved sticker
+CORNER_COLORS = tuple([tuple([f // 9 for f in facelets]) for facelets in CORNER_FACELETS])
+EDGE_COLORS = tuple([tuple([f // 9 for f in facelets]) for facelets in EDGE_FACELETS])
+
+# the color codes of the 6 face pieces for each of the 24 ways of holding the cube
+CENTER_ARRANGEMENTS = tuple([tuple([p[f] // 9 for f in CENTER_FACELETS]) for p in ROTATION_PERMS])
+CENTER_INDEX = {}
+
+for n in range(len(CENTER_ARRANGEMENTS)):
+    CENTER_INDEX[CENTER_ARRANGEMENTS[n]] = n
+
+# returns CENTER_MULTIPLY as one flat list, row after row
+def build_center_multiply():
+
+    table = []
+
+    for a in CENTER_ARRANGEMENTS:
+
+        for p in ROTATION_PERMS:
+            table.append(CENTER_INDEX[tuple([a[CENTER_FACELETS.index(p[f])] for f in CENTER_FACELETS])])
+
+    return table
+
+# CENTER_MULTIPLY[a][b] is the way the face pieces are held after holding them like b on top of a, built once and then loaded from disk
+CENTER_MULTIPLY_TABLE = load_or_build("center_multiply", "B", build_center_multiply)
+CENTER_MULTIPLY = [CENTER_MULTIPLY_TABLE[a * 24:(a + 1) * 24].tolist() for a in range(24)]
+
+# the colors read from the stickers of a position for every corner and twist (and every side and flip)
+CORNER_LOOKUP = {}
+EDGE_LOOKUP = {}
+
+for c in range(8):
+
+    for o in range(3):
+        read = [0, 0, 0]
+
+        for n in range(3):
+            read[(n + o) % 3] = CORNER_COLORS[c][n]
+
+        CORNER_LOOKUP[tuple(read)] = (c, o)
+
+for e in range(12):
+    EDGE_LOOKUP[EDGE_COLORS[e]] = (e, 0)
+    EDGE_LOOKUP[(EDGE_COLORS[e][1], EDGE_COLORS[e][0])] = (e, 1)
+
+FACTORIALS = [1]
+
+for n in range(1, 13):
+    FACTORIALS.append(FACTORIALS[-1] * n)
+
+NUM_CENTERS = 24
+NUM_CORNER_PERMS = FACTORIALS[8]
+NUM_TWISTS = 3 ** 7
+NUM_EDGE_PERMS = FACTORIALS[12]
+NUM_FLIPS = 2 ** 11
+NUM_STATES = NUM_CENTERS * NUM_CORNER_PERMS * NUM_TWISTS * NUM_EDGE_PERMS * NUM_FLIPS
+ENCODED_BYTES = (NUM_STATES.bit_length() + 7) // 8
+
+# returns the rank of a permutation of 0 to n - 1 among all n! permutations (its Lehmer code)
+def perm_rank(p):
+
+    rank = 0
+    n = len(p)
+
+    for i in range(n):
+        smaller = 0
+
+        for j in range(i + 1, n):
+
+            if p[j] < p[i]:
+                smaller += 1
+
+        rank += smaller * FACTORIALS[n - 1 - i]
+
+    return rank
+
+# returns the permutation of 0 to n - 1 with a given rank
+def perm_unrank(rank, n):
+
+    remaining = list(range(n))
+    p = []
+
+    for i in range(n):
+        d, rank = divmod(rank, FACTORIALS[n - 1 - i])
+        p.append(remaining.pop(d))
+
+    return p
+
+# returns 0 for even permutations and 1 for odd ones
+def perm_parity(p):
+
+    parity = 0
+
+    for i in range(len(p)):
+
+        for j in range(i + 1, len(p)):
+
+            if p[j] < p[i]:
+                parity ^= 1
+
+    return parity
+
+# the parity of the face pieces of every way of holding the cube
+CENTER_PARITIES = [perm_parity([arrangement.index(n) for n in range(6)]) for arrangement in CENTER_ARRANGEMENTS]
+
+
+class CubieCube:
+
+    __slots__ = ("centers", "cp", "co", "ep", "eo")
+
+    def __init__(self, centers = 0, cp = None, co = None, ep = None, eo = None):
+        self.centers = centers
+        self.cp = list(range(8)) if cp is None else list(cp)
+        self.co = [0] * 8 if co is None else list(co)
+        self.ep = list(range(12)) if ep is None else list(ep)
+        self.eo = [0] * 12 if eo is None else list(eo)
+
+    def copy(self):
+        return CubieCube(self.centers, self.cp, self.co, self.ep, self.eo)
+
+    # applies the corners of another cubie cube (usually a move) on top of this one
+    def corner_multiply(self, other):
+
+        cp = self.cp
+        co = self.co
+        self.cp = [cp[p] for p in other.cp]
+        self.co = [(co[other.cp[i]] + other.co[i]) % 3 for i in range(8)]
+
+    # applies the sides of another cubie cube (usually a move) on top of this one
+    def edge_multiply(self, other):
+
+        ep = self.ep
+        eo = self.eo
+        self.ep = [ep[p] for p in other.ep]
+        self.eo = [(eo[other.ep[i]] + other.eo[i]) % 2 for i in range(12)]
+
+    # applies another cubie cube on top of this one, so multiplying by the cubie cube of a move is the same as doing the move
+    def multiply(self, other):
+
+        self.corner_multiply(other)
+        self.edge_multiply(other)
+        self.centers = CENTER_MULTIPLY[self.centers][other.centers]
+
+    # reads the pieces off the 54 sticker color codes of a cube (see Cube.stickers)
+    @classmethod
+    def from_stickers(cls, stickers):
+
+        cube = cls()
+        centers = tuple([stickers[f] for f in CENTER_FACELETS])
+
+        if centers not in CENTER_INDEX:
+            raise Exception("The face pieces of the provided stickers are not a real cube")
+
+        cube.centers = CENTER_INDEX[centers]
+
+        for i in range(8):
+            read = tuple([stickers[f] for f in CORNER_FACELETS[i]])
+
+            if read not in CORNER_LOOKUP:
+                raise Exception("Corner position " + str(i) + " does not hold a real corner piece")
+
+            cube.cp[i], cube.co[i] = CORNER_LOOKUP[read]
+
+        for i in range(12):
+            read = tuple([stickers[f] for f in EDGE_FACELETS[i]])
+
+            if read not in EDGE_LOOKUP:
+                raise Exception("Side position " + str(i) + " does not hold a real side piece")
+
+            cube.ep[i], cube.eo[i] = EDGE_LOOKUP[read]
+
+        return cube
+
+    # returns the 54 sticker color codes of the cube as bytes
+    def to_stickers(self):
+
+        stickers = bytearray(54)
+        centers = CENTER_ARRANGEMENTS[self.centers]
+
+        for n in range(6):
+            stickers[CENTER_FACELETS[n]] = centers[n]
+
+        for i in range(8):
+
+            for n in range(3):
+                stickers[CORNER_FACELETS[i][(n + self.co[i]) % 3]] = CORNER_COLORS[self.cp[i]][n]
+
+        for i in range(12):
+
+            for n in range(2):
+                stickers[EDGE_FACELETS[i][(n + self.eo[i]) % 2]] = EDGE_COLORS[self.ep[i]][n]
+
+        return bytes(stickers)
+
+    # whether every piece appears once, the twists and flips add up, and the permutations have matching parity
+    def is_solvable(self):
+
+        if sorted(self.cp) != list(range(8)) or sorted(self.ep) != list(range(12)):
+            return False
+
+        if sum(self.co) % 3 != 0 or sum(self.eo) % 2 != 0:
+            return False
+
+        # slice moves swap face pieces, so the parity of the face pieces makes up for any difference between the corners and sides
+        return perm_parity(self.cp) ^ perm_parity(self.ep) == CENTER_PARITIES[self.centers]
+
+    def twist(self):
+
+        result = 0
+
+        for i in range(7):
+            result = result * 3 + self.co[i]
+
+        return result
+
+    def set_twist(self, twist):
+
+        total = 0
+
+        for i in range(6, -1, -1):
+            twist, self.co[i] = divmod(twist, 3)
+            total += self.co[i]
+
+        self.co[7] = -total % 3
+
+    def flip(self):
+
+        result = 0
+
+        for i in range(11):
+            result = result * 2 + self.eo[i]
+
+        return result
+
+    def set_flip(self, flip):
+
+        total = 0
+
+        for i in range(10, -1, -1):
+            flip, self.eo[i] = divmod(flip, 2)
+            total += self.eo[i]
+
+        self.eo[11] = total % 2
+
+    def corner_perm(self):
+        return perm_rank(self.cp)
+
+    def set_corner_perm(self, rank):
+        self.cp = perm_unrank(rank, 8)
+
+    def edge_perm(self):
+        return perm_rank(self.ep)
+
+    def set_edge_perm(self, rank):
+        self.ep = perm_unrank(rank, 12)
+
+    def slice(self):
+
+        result = 0
+        found = 0
+
+        for j in range(11, -1, -1):
+
+            if self.ep[j] >= 8:
+                result += comb(11 - j, found + 1)
+                found += 1
+
+        return result
+
+    # puts the 4 slice sides at the positions of a slice coordinate and fills the rest with the other sides in order
+    def set_slice(self, index):
+
+        slice_edges = [8, 9, 10, 11]
+        other_edges = [0, 1, 2, 3, 4, 5, 6, 7]
+        self.ep = [-1] * 12
+        left = 4
+
+        for j in range(12):
+
+            if left > 0 and index - comb(11 - j, left) >= 0:
+                self.ep[j] = slice_edges[4 - left]
+                index -= comb(11 - j, left)
+                left -= 1
+
+        for j in range(12):
+
+            if self.ep[j] == -1:
+                self.ep[j] = other_edges.pop(0)
+
+    def ud_edge_perm(self):
+        return perm_rank(self.ep[:8])
+
+    def set_ud_edge_perm(self, rank):
+        self.ep = perm_unrank(rank, 8) + self.ep[8:]
+
+    def slice_perm(self):
+        return perm_rank([e - 8 for e in self.ep[8:]])
+
+    def set_slice_perm(self, rank):
+        self.ep = self.ep[:8] + [e + 8 for e in perm_unrank(rank, 4)]
+
+    # returns the canonical integer of the state
+    def encode(self):
+
+        if sum(self.co) % 3 != 0 or sum(self.eo) % 2 != 0:
+            raise Exception("Only states with valid twists and flips can be encoded")
+
+        value = self.centers
+        value = value * NUM_CORNER_PERMS + self.corner_perm()
+        value = value * NUM_TWISTS + self.twist()
+        value = value * NUM_EDGE_PERMS + self.edge_perm()
+        return value * NUM_FLIPS + self.flip()
+
+    # builds the state of a canonical integer
+    @classmethod
+    def decode(cls, value):
+
+        if not 0 <= value < NUM_STATES:
+            raise Exception("Provided value is not the encoding of a cube")
+
+        cube = cls()
+        value, flip = divmod(value, NUM_FLIPS)
+        value, edge_perm = divmod(value, NUM_EDGE_PERMS)
+        value, twist = divmod(value, NUM_TWISTS)
+        cube.centers, corner_perm = divmod(value, NUM_CORNER_PERMS)
+        cube.set_flip(flip)
+        cube.set_edge_perm(edge_perm)
+        cube.set_twist(twist)
+        cube.set_corner_perm(corner_perm)
+        return cube
+
+# returns the canonical integer of 54 sticker color codes
+def encode(stickers):
+    return CubieCube.from_stickers(stickers).encode()
+
+# returns the 54 sticker color codes of a canonical integer
+def decode(value):
+    return CubieCube.decode(value).to_stickers()
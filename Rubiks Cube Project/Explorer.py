@@ -0,0 +1,399 @@
+"""
+Explorer
+
+- A program that goes through every state reachable from a starting cube, one depth (number of moves) at a time, counting how many states first show up at every depth
+- The moves can be any subgroup of the cube's moves, such as <U, R>, written as the letters of the moves that make it up
+    with the half turn metric (htm) every turn of a letter (U, U2, U') counts as one move, and with the quarter turn metric (qtm) only U and U' do
+- A projection decides what part of the cube a state is:
+    full - the whole cube, as the canonical integer of the Cubies module
+    corners - only the corners, as corner_perm * 2187 + twist, which only face moves can be used with
+- The states of every depth (the frontier) are written to disk as fixed width big-endian records (ENCODED_BYTES bytes for full, 4 bytes for corners)
+    and read back a chunk at a time, so only chunk_size states are ever held in memory besides the visited set
+- States already seen are found in one of two ways:
+    a bitset with one bit per state when the projection has few enough states (up to max_bitset_bits), which is saved to disk after every depth
+    otherwise, as every move has its inverse among the moves, new states can only come from the last two depths, so the candidates of the next depth
+        are sorted into runs on disk, merged, and compared against the sorted records of the last two depths
+- Progress is saved after every depth, so an exploration that was interrupted picks up from the last finished depth when it is run again with the same work folder
+- Usage:
+    python Explorer.py work_folder [--moves "U R"] [--projection full|corners] [--metric htm|qtm] [--max-depth N] [--start KEY] [--chunk-size N]
+    KEY is the compact key in hex of the starting state (see Cube.compact_key()), and the solved cube is used when it is left out
+
+"""
+
+import argparse
+import heapq
+import json
+import os
+from time import perf_counter
+from Cubies import ENCODED_BYTES, CubieCube, encode, decode
+from MoveTables import MOVES, MOVE_IDS, apply_move
+from Notation import parse
+from RubiksCube import Cube
+
+NUM_CORNER_STATES = 40320 * 2187
+
+# returns the move ids of a subgroup written as move letters, such as "U R", with every quarter turn count allowed by the metric
+def subgroup_moves(letters, metric = "htm"):
+
+    if metric not in ("htm", "qtm"):
+        raise Exception("Unknown metric " + metric + ", expected htm or qtm")
+
+    moves = []
+
+    for token in letters.split():
+
+        for m in parse(token):
+            axis, layer, k = MOVES[m]
+
+            for k in ((1, 3) if metric == "qtm" else (1, 2, 3)):
+
+                if MOVE_IDS[(axis, layer, k)] not in moves:
+                    moves.append(MOVE_IDS[(axis, layer, k)])
+
+    if not moves:
+        raise Exception("A subgroup needs at least one move")
+
+    return moves
+
+
+class FullProjection:
+
+    record_size = ENCODED_BYTES
+    size = None
+
+    def __init__(self, moves):
+        self.moves = moves
+
+    def index(self, cube):
+        return cube.encode()
+
+    # the states one move away from a state
+    def neighbors(self, value):
+
+        stickers = decode(value)
+        return [encode(apply_move(stickers, m)) for m in self.moves]
+
+
+class CornerProjection:
+
+    record_size = 4
+    size = NUM_CORNER_STATES
+
+    def __init__(self, moves):
+
+        # the corners are moved through small move tables of the face moves, the same ones the two-phase solver uses
+        from TwoPhaseSolver import FACE_MOVES, build_move_table
+
+        for m in moves:
+
+            if m not in FACE_MOVES:
+                raise Exception("Only face moves can be used with the corners projection")
+
+        face_moves = [FACE_MOVES.index(m) for m in moves]
+        self.num_moves = len(moves)
+        self.corner_perm_move = build_move_table(40320, CubieCube.corner_perm, CubieCube.set_corner_perm, face_moves, True)
+        self.twist_move = build_move_table(2187, CubieCube.twist, CubieCube.set_twist, face_moves, True)
+
+    def index(self, cube):
+
+        cubie = CubieCube.from_stickers(cube.stickers)
+        return cubie.corner_perm() * 2187 + cubie.twist()
+
+    def neighbors(self, value):
+
+        corner_perm, twist = divmod(value, 2187)
+        corner_perm *= self.num_moves
+        twist *= self.num_moves
+        return [self.corner_perm_move[corner_perm + n] * 2187 + self.twist_move[twist + n] for n in range(self.num_moves)]
+
+PROJECTIONS = {"full": FullProjection, "corners": CornerProjection}
+
+# writes states to a file as fixed width records
+def write_records(f, values, record_size):
+    f.write(b"".join([v.to_bytes(record_size, "big") for v in values]))
+
+# yields the states of a file of fixed width records, reading count records at a time
+def read_records(path, record_size, count = 65536):
+
+    with open(path, "rb") as f:
+
+        while True:
+            data = f.read(record_size * count)
+
+            if not data:
+                break
+
+            for i in range(0, len(data), record_size):
+                yield int.from_bytes(data[i:i + record_size], "big")
+
+# yields the values of a sorted iterable that aren't in any of the sorted iterables of excluded values
+def exclude_sorted(values, excluded):
+
+    excluded = heapq.merge(*excluded)
+    current = next(excluded, None)
+    last = None
+
+    for v in values:
+
+        if v == last:
+            continue
+
+        last = v
+
+        while current is not None and current < v:
+            current = next(excluded, None)
+
+        if v != current:
+            yield v
+
+
+class Explorer:
+
+    def __init__(self, work_dir, moves = "U R", projection = "full", metric = "htm", start = None, chunk_size = 1000000, max_bitset_bits = 2 ** 33):
+
+        if projection not in PROJECTIONS:
+            raise Exception("Unknown projection " + projection + ", expected full or corners")
+
+        self.work_dir = work_dir
+        self.chunk_size = chunk_size
+        self.moves = subgroup_moves(moves, metric)
+        self.projection = PROJECTIONS[projection](self.moves)
+        self.record_size = self.projection.record_size
+        self.use_bitset = self.projection.size is not None and self.projection.size <= max_bitset_bits
+        self.start = self.projection.index(start if start is not None else Cube())
+
+        # everything that has to match for a saved exploration to be picked up again
+        self.settings = {"moves": moves, "projection": projection, "metric": metric, "start": self.start}
+        self.counts = []
+        self.timings = []
+        self.complete = False
+        os.makedirs(work_dir, exist_ok = True)
+
+        if os.path.exists(self.path("progress.json")):
+            self.load_progress()
+
+        else:
+            self.start_over()
+
+    def path(self, name):
+        return os.path.join(self.work_dir, name)
+
+    def frontier_path(self, depth):
+        return self.path("depth_" + str(depth) + ".bin")
+
+    # the visited set as it was after a depth
+    def visited_path(self, depth):
+        return self.path("visited_" + str(depth) + ".bin")
+
+    # writes a file through a temporary file, so a half written file is never picked up
+    def replace_file(self, path, data, mode = "wb"):
+
+        with open(path + ".tmp", mode) as f:
+            f.write(data)
+
+        os.replace(path + ".tmp", path)
+
+    def save_progress(self):
+
+        progress = {"settings": self.settings, "counts": self.counts, "timings": self.timings, "complete": self.complete}
+        self.replace_file(self.path("progress.json"), json.dumps(progress), "w")
+
+    def load_progress(self):
+
+        with open(self.path("progress.json")) as f:
+            progress = json.load(f)
+
+        if progress["settings"] != self.settings:
+            raise Exception("The work folder holds an exploration with different settings")
+
+        self.counts = progress["counts"]
+        self.timings = progress["timings"]
+        self.complete = progress["complete"]
+
+        # files left behind by a depth that was interrupted are thrown away, as that depth is done again
+        self.remove_stale_files()
+
+        if self.use_bitset:
+
+            with open(self.visited_path(len(self.counts) - 1), "rb") as f:
+                self.visited = bytearray(f.read())
+
+    # removes every file the saved progress doesn't need, which is all but the frontiers of the last two depths and the visited set of the last depth
+    # along with the temporary files and sorted runs of a depth that was interrupted
+    def remove_stale_files(self):
+
+        depth = len(self.counts) - 1
+        keep = ["depth_" + str(depth) + ".bin", "visited_" + str(depth) + ".bin"]
+
+        # the depth before the last is only needed to find the next depth, which a complete exploration never does
+        if depth >= 1 and not self.complete:
+            keep.append("depth_" + str(depth - 1) + ".bin")
+
+        for name in os.listdir(self.work_dir):
+
+            if name.endswith(".tmp") or name.startswith("run_") or (name.startswith(("depth_", "visited_")) and name not in keep):
+                os.remove(self.path(name))
+
+    # depth 0 is only the starting state
+    def start_over(self):
+
+        with open(self.frontier_path(0), "wb") as f:
+            write_records(f, [self.start], self.record_size)
+
+        if self.use_bitset:
+            self.visited = bytearray((self.projection.size + 7) // 8)
+            self.visited[self.start >> 3] |= 1 << (self.start & 7)
+            self.replace_file(self.visited_path(0), self.visited)
+
+        self.counts = [1]
+        self.timings = [0.0]
+        self.save_progress()
+
+    # finds the states of the next depth, returning how many there are
+    def explore_depth(self):
+
+        depth = len(self.counts) - 1
+        start = perf_counter()
+
+        if self.use_bitset:
+            count = self.next_with_bitset(depth)
+
+        else:
+            count = self.next_with_sorting(depth)
+
+        if count == 0:
+            self.complete = True
+
+        else:
+            self.counts.append(count)
+            self.timings.append(round(perf_counter() - start, 3))
+
+        self.save_progress()
+
+        # files are only removed once the progress says they aren't needed, so an interrupted run can always resume
+        # (the depth before the last frontier is still read by next_with_sorting when a depth is done again)
+        self.remove_stale_files()
+        return count
+
+    def next_with_bitset(self, depth):
+
+        visited = self.visited
+        record_size = self.record_size
+        count = 0
+        block = []
+
+        with open(self.frontier_path(depth + 1) + ".tmp", "wb") as f:
+
+            for value in read_records(self.frontier_path(depth), record_size):
+
+                for n in self.projection.neighbors(value):
+
+                    if not visited[n >> 3] & (1 << (n & 7)):
+                        visited[n >> 3] |= 1 << (n & 7)
+                        block.append(n)
+
+                if len(block) >= self.chunk_size:
+                    write_records(f, block, record_size)
+                    count += len(block)
+                    block = []
+
+            write_records(f, block, record_size)
+            count += len(block)
+
+        # the bitset of every depth is its own file, so an interrupted depth is simply done again from the bitset of the depth before it
+        self.replace_file(self.visited_path(depth + 1), visited)
+        os.replace(self.frontier_path(depth + 1) + ".tmp", self.frontier_path(depth + 1))
+        return count
+
+    def next_with_sorting(self, depth):
+
+        record_size = self.record_size
+        runs = []
+        candidates = []
+
+        # the neighbors of every state are sorted into runs of at most chunk_size states
+        for value in read_records(self.frontier_path(depth), record_size):
+            candidates += self.projection.neighbors(value)
+
+            if len(candidates) >= self.chunk_size:
+                runs.append(self.write_run(len(runs), candidates))
+                candidates = []
+
+        if candidates or not runs:
+            runs.append(self.write_run(len(runs), candidates))
+
+        # the runs are merged, and any state that is in this depth or the one before it is left out
+        excluded = [read_records(self.frontier_path(depth), record_size)]
+
+        if depth >= 1:
+            excluded.append(read_records(self.frontier_path(depth - 1), record_size))
+
+        merged = heapq.merge(*[read_records(run, record_size) for run in runs])
+        count = 0
+        block = []
+
+        with open(self.frontier_path(depth + 1) + ".tmp", "wb") as f:
+
+            for value in exclude_sorted(merged, excluded):
+                block.append(value)
+
+                if len(block) >= self.chunk_size:
+                    write_records(f, block, record_size)
+                    count += len(block)
+                    block = []
+
+            write_records(f, block, record_size)
+            count += len(block)
+
+        for run in runs:
+            os.remove(run)
+
+        os.replace(self.frontier_path(depth + 1) + ".tmp", self.frontier_path(depth + 1))
+        return count
+
+    # sorts states and writes them as a run file, returning its path
+    def write_run(self, n, values):
+
+        path = self.path("run_" + str(n) + ".bin")
+        values.sort()
+
+        with open(path, "wb") as f:
+            write_records(f, values, self.record_size)
+
+        return path
+
+    # explores depth after depth until every state was found or max_depth is reached, returning the number of states of every depth
+    def run(self, max_depth = None, verbose = True):
+
+        while not self.complete and (max_depth is None or len(self.counts) - 1 < max_depth):
+            depth = len(self.counts)
+            count = self.explore_depth()
+
+            if verbose and count:
+                seconds = self.timings[-1]
+                rate = round(count / seconds) if seconds > 0 else count
+                print("depth " + str(depth) + ": " + str(count) + " states in " + str(seconds) + " seconds (" + str(rate) + " states/s), " + str(sum(self.counts)) + " in total")
+
+        if verbose and self.complete:
+            print("every state was found, " + str(sum(self.counts)) + " in total")
+
+        return self.counts
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Count the states of the cube at every depth, one depth at a time on disk")
+    parser.add_argument("work_dir", help = "folder the depths and progress are kept in, which picks up where it left off when it already holds an exploration")
+    parser.add_argument("--moves", default = "U R", help = "letters of the moves of the subgroup, such as \"U R\"")
+    parser.add_argument("--projection", choices = list(PROJECTIONS), default = "full", help = "part of the cube that makes up a state")
+    parser.add_argument("--metric", choices = ["htm", "qtm"], default = "htm", help = "whether half turns count as one move")
+    parser.add_argument("--max-depth", type = int, default = None, help = "depth to stop at")
+    parser.add_argument("--start", default = None, help = "compact key in hex of the starting state")
+    parser.add_argument("--chunk-size", type = int, default = 1000000, help = "most states held in memory at once")
+    args = parser.parse_args(argv)
+
+    start = Cube.decode(bytes.fromhex(args.start)) if args.start else None
+    explorer = Explorer(args.work_dir, args.moves, args.projection, args.metric, start, args.chunk_size)
+    explorer.run(args.max_depth)
+
+if __name__ == "__main__":
+    main()
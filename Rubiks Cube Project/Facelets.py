@@ -0,0 +1,250 @@
+"""
+Facelets
+
+- A program that reads and writes many cubes at once as facelet strings, one 54 letter string per line such as "UUUUUUUUURRR..." (see Cube.facelets())
+- Files are read a chunk of lines at a time, and every chunk becomes a single bytes object of 54 sticker color codes per line, in the layout of Cube.stickers
+    so line i of a chunk is data[i * 54:(i + 1) * 54], which can be passed to Cube.from_key() or turned into the rows of a CubeBatch with numpy.frombuffer()
+- Every line of a chunk is checked at once, with NumPy when it is installed (one array operation per check for the whole chunk) and one line at a time otherwise
+    the checks, in order, are that a line is 54 face letters, has 9 stickers of every color, has face pieces held in one of the 24 ways of holding the cube,
+    has every corner piece and every side piece exactly once, has corner twists that add up to a multiple of 3 and side flips that add up to a multiple of 2,
+    and has permutations whose parities match (the corners and sides have the same parity, unless slice moves made the face pieces odd)
+    lines are reported by their index in the file (starting at 0) along with the first check they failed
+- Usage:
+    python Facelets.py file [--chunk-size N] [--valid-output file] [--no-numpy]
+    writes "index: reason" for every line that isn't a solvable cube, then the number of lines read and how many were invalid
+
+"""
+
+import argparse
+import sys
+from Cubies import CENTER_ARRANGEMENTS, CENTER_FACELETS, CENTER_INDEX, CENTER_PARITIES, CORNER_FACELETS, CORNER_LOOKUP, EDGE_FACELETS, EDGE_LOOKUP, perm_parity
+from RubiksCube import FACELET_CODES, FACELET_LETTERS
+
+try:
+    import numpy as np
+
+except ImportError:
+    np = None
+
+# the reason of every check a line can fail, in the order they are checked
+REASONS = (
+    "not 54 face letters",
+    "not 9 stickers of every color",
+    "face pieces are not a real cube",
+    "corner pieces are not all there exactly once",
+    "side pieces are not all there exactly once",
+    "corner twists don't add up",
+    "side flips don't add up",
+    "permutation parities don't match",
+)
+
+# the stickers of a line that can't be read at all, which fail the first check
+UNREADABLE = b"\xff" * 54
+
+# returns the index in REASONS of the first check some stickers fail, or None when they are a solvable cube
+def check_stickers(stickers):
+
+    if len(stickers) != 54 or 255 in stickers:
+        return 0
+
+    if any([stickers.count(c) != 9 for c in range(6)]):
+        return 1
+
+    centers = tuple([stickers[f] for f in CENTER_FACELETS])
+
+    if centers not in CENTER_INDEX:
+        return 2
+
+    corners = [CORNER_LOOKUP.get(tuple([stickers[f] for f in facelets])) for facelets in CORNER_FACELETS]
+
+    if None in corners or len(set([c for c, o in corners])) != 8:
+        return 3
+
+    edges = [EDGE_LOOKUP.get(tuple([stickers[f] for f in facelets])) for facelets in EDGE_FACELETS]
+
+    if None in edges or len(set([e for e, o in edges])) != 12:
+        return 4
+
+    if sum([o for c, o in corners]) % 3 != 0:
+        return 5
+
+    if sum([o for e, o in edges]) % 2 != 0:
+        return 6
+
+    if perm_parity([c for c, o in corners]) ^ perm_parity([e for e, o in edges]) != CENTER_PARITIES[CENTER_INDEX[centers]]:
+        return 7
+
+    return None
+
+# the lookup tables of the NumPy checks, indexed by the color codes of a piece read as a number in base 6 (or -1 where there is no such piece)
+if np is not None:
+    CENTER_TABLE = np.full(6 ** 6, -1, dtype = np.intp)
+
+    for n in range(len(CENTER_ARRANGEMENTS)):
+        CENTER_TABLE[sum([CENTER_ARRANGEMENTS[n][k] * 6 ** k for k in range(6)])] = n
+
+    CENTER_PARITY_TABLE = np.array(CENTER_PARITIES, dtype = np.int8)
+
+    # corner * 3 + twist and side * 2 + flip
+    CORNER_TABLE = np.full(6 ** 3, -1, dtype = np.intp)
+    EDGE_TABLE = np.full(6 ** 2, -1, dtype = np.intp)
+
+    for colors, (c, o) in CORNER_LOOKUP.items():
+        CORNER_TABLE[colors[0] * 36 + colors[1] * 6 + colors[2]] = c * 3 + o
+
+    for colors, (e, o) in EDGE_LOOKUP.items():
+        EDGE_TABLE[colors[0] * 6 + colors[1]] = e * 2 + o
+
+# returns the parity of every row of an (N, n) array of permutations, counting the pairs that are out of order
+def parities(perms):
+
+    parity = np.zeros(len(perms), dtype = np.int8)
+
+    for i in range(perms.shape[1]):
+
+        for j in range(i + 1, perms.shape[1]):
+            parity ^= perms[:, i] > perms[:, j]
+
+    return parity
+
+# returns the index in REASONS of the first check every row of an (N, 54) array of color codes fails, or -1 for rows that are a solvable cube
+def check_array(states):
+
+    unreadable = (states == 255).any(axis = 1)
+    codes = np.where(states == 255, 0, states).astype(np.intp)
+    counts = np.stack([(codes == c).sum(axis = 1) for c in range(6)], axis = 1)
+
+    centers = CENTER_TABLE[sum([codes[:, CENTER_FACELETS[k]] * 6 ** k for k in range(6)])]
+
+    corners = np.stack([CORNER_TABLE[codes[:, a] * 36 + codes[:, b] * 6 + codes[:, c]] for a, b, c in CORNER_FACELETS], axis = 1)
+    edges = np.stack([EDGE_TABLE[codes[:, a] * 6 + codes[:, b]] for a, b in EDGE_FACELETS], axis = 1)
+
+    # pieces that aren't real are counted as piece 0, which can't matter as those rows already failed
+    cp = np.where(corners < 0, 0, corners // 3)
+    ep = np.where(edges < 0, 0, edges // 2)
+    co = np.where(corners < 0, 0, corners % 3)
+    eo = np.where(edges < 0, 0, edges % 2)
+
+    failed = [
+        unreadable,
+        (counts != 9).any(axis = 1),
+        centers < 0,
+        (corners < 0).any(axis = 1) | (np.bitwise_or.reduce(1 << cp, axis = 1) != 255),
+        (edges < 0).any(axis = 1) | (np.bitwise_or.reduce(1 << ep, axis = 1) != 4095),
+        co.sum(axis = 1) % 3 != 0,
+        eo.sum(axis = 1) % 2 != 0,
+        (parities(cp) ^ parities(ep)) != CENTER_PARITY_TABLE[np.where(centers < 0, 0, centers)],
+    ]
+
+    # the checks are applied from the last to the first so every row ends up with the first check it failed
+    reasons = np.full(len(states), -1, dtype = np.intp)
+
+    for n in range(len(failed) - 1, -1, -1):
+        reasons[failed[n]] = n
+
+    return reasons
+
+# returns (index, reason) for every line of a block of 54 color codes per line that isn't a solvable cube
+def validate(data, use_numpy = True):
+
+    if use_numpy and np is not None:
+        reasons = check_array(np.frombuffer(data, dtype = np.uint8).reshape(-1, 54))
+        return [(int(i), REASONS[reasons[i]]) for i in np.nonzero(reasons >= 0)[0]]
+
+    invalid = []
+
+    for i in range(len(data) // 54):
+        reason = check_stickers(data[i * 54:(i + 1) * 54])
+
+        if reason is not None:
+            invalid.append((i, REASONS[reason]))
+
+    return invalid
+
+# turns facelet strings (as bytes or str) into one block of 54 color codes per line, with lines that aren't 54 letters long unreadable
+def facelets_to_codes(lines):
+
+    rows = []
+
+    for line in lines:
+
+        if isinstance(line, str):
+            line = line.encode()
+
+        line = line.strip()
+        rows.append(line if len(line) == 54 else UNREADABLE)
+
+    return b"".join(rows).translate(FACELET_CODES)
+
+# turns a block of 54 color codes per line back into facelet strings, one per line
+def codes_to_facelets(data):
+
+    letters = data.translate(FACELET_LETTERS)
+    return b"".join([letters[i:i + 54] + b"\n" for i in range(0, len(letters), 54)])
+
+# yields (index of the first line, block of color codes, invalid lines) for every chunk of chunk_size lines of a file (or file object opened in binary)
+# invalid lines are (index in the file, reason), and the codes of every line are in the block, whether the line is valid or not
+def read_facelets(source, chunk_size = 65536, use_numpy = True):
+
+    f = open(source, "rb") if isinstance(source, str) else source
+    start = 0
+
+    try:
+
+        while True:
+            lines = []
+
+            for line in f:
+                lines.append(line)
+
+                if len(lines) == chunk_size:
+                    break
+
+            if not lines:
+                break
+
+            data = facelets_to_codes(lines)
+            yield start, data, [(start + i, reason) for i, reason in validate(data, use_numpy)]
+            start += len(lines)
+
+    finally:
+
+        if f is not source:
+            f.close()
+
+# writes a block of 54 color codes per line as facelet strings to a file object opened in binary
+def write_facelets(output, data):
+    output.write(codes_to_facelets(data))
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Check a file of facelet strings, one cube per line, and report the lines that aren't a solvable cube")
+    parser.add_argument("file", help = "file of facelet strings, or - for stdin")
+    parser.add_argument("--chunk-size", type = int, default = 65536, help = "number of lines read and checked at once")
+    parser.add_argument("--valid-output", default = None, help = "file to write only the valid lines to")
+    parser.add_argument("--no-numpy", action = "store_true", help = "check one line at a time even when NumPy is installed")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin.buffer if args.file == "-" else args.file
+    output = open(args.valid_output, "wb") if args.valid_output is not None else None
+    total = 0
+    bad = 0
+
+    for start, data, invalid in read_facelets(source, args.chunk_size, not args.no_numpy):
+        total += len(data) // 54
+        bad += len(invalid)
+
+        for index, reason in invalid:
+            print(str(index) + ": " + reason)
+
+        if output is not None:
+            skip = set([index - start for index, reason in invalid])
+            write_facelets(output, b"".join([data[i * 54:(i + 1) * 54] for i in range(len(data) // 54) if i not in skip]))
+
+    if output is not None:
+        output.close()
+
+    print(str(total) + " lines read, " + str(bad) + " invalid")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Instrumentation
+
+- A helper module that counts and times the hot paths of the cube while it is turned on, and costs nothing while it is off
+- Turning it on replaces the instrumented functions (see PATCHES) with wrappers that count every call and add up its time, and turning it off puts the original functions back
+    nothing is checked on the hot paths while it is off, since the original functions are the ones being called
+- Besides the calls and seconds of every function, it counts:
+    moves - moves applied to cubes, counting every move of an algorithm
+    pieces_touched - pieces moved by those moves (9 for a face, 8 for a middle slice, and 26 for the entire cube)
+    matrix_muls - calls of Matrix.matrix_mul, including the ones made through modules that imported it
+- The numbers can be read as a dict, as JSON, or as a single log line, which can also be logged every log_interval seconds through the "rubiks" logger
+- Usage:
+    with measure() as stats:
+        ...
+    print(stats.log_line())
+
+"""
+
+import importlib
+import json
+import logging
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+from MoveTables import LAYER_POSITIONS, MOVES, PIECE_STICKERS
+from Notation import compile_algorithm
+
+# the (module, class or None, function) of every instrumented function
+PATCHES = [
+    ("RubiksCube", "Cube", "apply_move"),
+    ("RubiksCube", "Cube", "apply_algorithm"),
+    ("RubiksCube", "Cube", "rotate"),
+    ("RubiksCube", "Cube", "turn"),
+    ("RubiksCube", "Cube", "get_face"),
+    ("RubiksCube", "Cube", "get_faces"),
+    ("RubiksCube", "Cube", "print_face"),
+    ("RubiksCube", "Cube", "print_cube"),
+    ("RubiksCube", "Piece", "rotate"),
+    ("RubiksCube", "Piece", "apply_rotation"),
+    ("Matrix", None, "matrix_mul"),
+    ("Renderer", "Renderer", "draw"),
+]
+
+# the number of pieces every move moves
+PIECES_TOUCHED = [len(PIECE_STICKERS) if layer is None else len(LAYER_POSITIONS[(axis, layer)]) for axis, layer, k in MOVES]
+
+logger = logging.getLogger("rubiks")
+
+
+class Stats:
+
+    def __init__(self, log_interval = None):
+
+        self.calls = {}
+        self.seconds = {}
+        self.moves = 0
+        self.pieces_touched = 0
+        self.matrix_muls = 0
+
+        # a log line is written through the "rubiks" logger every log_interval seconds, checked whenever an instrumented function returns
+        self.log_interval = log_interval
+        self.last_log = perf_counter()
+
+    # adds a call of an instrumented function and how long it took
+    def add(self, name, seconds):
+
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+        if self.log_interval is not None and perf_counter() - self.last_log >= self.log_interval:
+            self.last_log = perf_counter()
+            logger.info(self.log_line())
+
+    def reset(self):
+        self.__init__(self.log_interval)
+
+    def to_dict(self):
+        return {
+            "moves": self.moves,
+            "pieces_touched": self.pieces_touched,
+            "matrix_muls": self.matrix_muls,
+            "calls": dict(self.calls),
+            "seconds": dict([(name, round(self.seconds[name], 6)) for name in self.seconds]),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    # the counters and the calls and total milliseconds of every function on one line, such as "moves=100 pieces_touched=900 ... Cube.rotate=100/1.234ms"
+    def log_line(self):
+
+        parts = ["moves=" + str(self.moves), "pieces_touched=" + str(self.pieces_touched), "matrix_muls=" + str(self.matrix_muls)]
+
+        for name in sorted(self.calls):
+            parts.append(name + "=" + str(self.calls[name]) + "/" + str(round(self.seconds[name] * 1000, 3)) + "ms")
+
+        return " ".join(parts)
+
+# the stats being collected, or None while instrumentation is off
+active = None
+
+# the original functions that the wrappers replaced, as (owner, attribute, original) so they can be put back
+originals = []
+
+# counts the extra numbers of the functions that have them, after a call that succeeded
+def count_extra(stats, name, args):
+
+    if name == "Cube.apply_move":
+        stats.moves += 1
+        stats.pieces_touched += PIECES_TOUCHED[args[1]]
+
+    elif name == "Cube.apply_algorithm":
+
+        # the wrapper already compiled the algorithm, so this only reads its moves
+        for move in args[1].moves:
+            stats.moves += 1
+            stats.pieces_touched += PIECES_TOUCHED[move]
+
+    elif name == "matrix_mul":
+        stats.matrix_muls += 1
+
+# wraps a function so every call is counted and timed into stats
+def wrap(stats, name, func):
+
+    def wrapper(*args, **kwargs):
+
+        start = perf_counter()
+
+        try:
+
+            # the algorithm is compiled once here and passed on compiled, so counting its moves doesn't compile it again
+            if name == "Cube.apply_algorithm":
+                args = (args[0], compile_algorithm(args[1] if len(args) > 1 else kwargs.pop("algorithm"))) + args[2:]
+
+            result = func(*args, **kwargs)
+
+        finally:
+            stats.add(name, perf_counter() - start)
+
+        # a call that raised is timed but not counted, so nothing here can hide its exception
+        count_extra(stats, name, args + tuple(kwargs.values()))
+        return result
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    wrapper.__wrapped__ = func
+    return wrapper
+
+# turns instrumentation on, collecting into stats (a new Stats by default), and returns the stats
+def enable(stats = None):
+
+    global active
+
+    if active is not None:
+        raise Exception("Instrumentation is already turned on")
+
+    active = stats if stats is not None else Stats()
+
+    for module_name, class_name, attribute in PATCHES:
+        module = importlib.import_module(module_name)
+
+        if class_name is None:
+            owner = module
+            name = attribute
+
+        else:
+            owner = getattr(module, class_name)
+            name = class_name + "." + attribute
+
+        func = getattr(owner, attribute)
+        wrapper = wrap(active, name, func)
+        originals.append((owner, attribute, func))
+        setattr(owner, attribute, wrapper)
+
+        # modules that imported a function by name hold their own reference to it, which has to be replaced too
+        if class_name is None:
+
+            for other in list(sys.modules.values()):
+
+                if other is not module and getattr(other, attribute, None) is func:
+                    originals.append((other, attribute, func))
+                    setattr(other, attribute, wrapper)
+
+    return active
+
+# turns instrumentation off, putting every original function back, and returns the stats that were collected
+def disable():
+
+    global active
+
+    stats = active
+
+    while originals:
+        owner, attribute, func = originals.pop()
+        setattr(owner, attribute, func)
+
+    active = None
+    return stats
+
+def is_enabled():
+    return active is not None
+
+# turns instrumentation on for the body of a with statement, giving the Stats collected, and turns it off again at the end
+@contextmanager
+def measure(log_interval = None):
+
+    stats = enable(Stats(log_interval))
+
+    try:
+        yield stats
+
+    finally:
+        disable()
@@ -0,0 +1,152 @@
+"""
+Journal
+
+- A helper module that keeps the history of the moves of a cube so they can be undone and redone
+- The history is one byte per move (the move ids of the MoveTables module), and undoing a move applies the inverse move from MoveTables.INVERSE_MOVES
+    so undo() and redo() each cost a single move no matter how long the history is
+- Making a new move after undoing throws away the moves that could have been redone, like the history of a text editor
+- Every snapshot_interval moves the stickers of the cube are saved as a snapshot (54 immutable bytes shared with the cube)
+    so jump(n) goes to the state after any number of moves by replaying at most snapshot_interval moves from the nearest snapshot
+- A journal given max_moves forgets its oldest moves once the history is longer than that, so a journal that is kept for a long time doesn't keep growing
+    the history then starts from the first snapshot that leaves at most max_moves moves (or from the current state when there is no such snapshot)
+
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from MoveTables import INVERSE_MOVES
+from Notation import compile_algorithm
+
+
+class MoveJournal:
+
+    def __init__(self, cube, snapshot_interval = 64, max_moves = None):
+
+        if snapshot_interval < 1:
+            raise Exception("The snapshot interval must be at least 1 move")
+
+        if max_moves is not None and max_moves < 1:
+            raise Exception("The history must be able to hold at least 1 move")
+
+        self.cube = cube
+        self.snapshot_interval = snapshot_interval
+        self.max_moves = max_moves
+        self.clear()
+
+    # forgets every move, so the current state of the cube becomes the start of the history
+    def clear(self):
+
+        self.moves = array("B")
+        self.position = 0
+
+        # snapshot_positions[i] is the number of moves after which snapshot_stickers[i] was saved, starting with the state before any move
+        self.snapshot_positions = [0]
+        self.snapshot_stickers = [self.cube.stickers]
+
+    def __len__(self):
+        return len(self.moves)
+
+    # adds a move to the history at the current position
+    def append(self, move):
+
+        # a new move replaces every move that could have been redone
+        if self.position < len(self.moves):
+            del self.moves[self.position:]
+            n = bisect_right(self.snapshot_positions, self.position)
+            del self.snapshot_positions[n:]
+            del self.snapshot_stickers[n:]
+
+        self.moves.append(move)
+        self.position += 1
+
+    # saves the stickers of the cube once snapshot_interval moves were made since the last snapshot
+    def snapshot(self):
+
+        if self.position - self.snapshot_positions[-1] >= self.snapshot_interval:
+            self.snapshot_positions.append(self.position)
+            self.snapshot_stickers.append(self.cube.stickers)
+
+        self.trim()
+
+    # forgets the oldest moves once the history is longer than max_moves, only ever called when the cube is at the end of the history
+    def trim(self):
+
+        if self.max_moves is None or len(self.moves) <= self.max_moves:
+            return
+
+        n = bisect_left(self.snapshot_positions, len(self.moves) - self.max_moves)
+
+        # without a snapshot that late the history starts over from the current state
+        if n == len(self.snapshot_positions):
+            self.snapshot_positions.append(self.position)
+            self.snapshot_stickers.append(self.cube.stickers)
+
+        start = self.snapshot_positions[n]
+        del self.moves[:start]
+        self.position -= start
+        self.snapshot_positions = [p - start for p in self.snapshot_positions[n:]]
+        self.snapshot_stickers = self.snapshot_stickers[n:]
+
+    # records a move that was already applied to the cube, such as the move returned by Cube.rotate() or Cube.turn()
+    def record(self, move):
+
+        if move is not None:
+            self.append(move)
+            self.snapshot()
+
+    # applies a move to the cube and records it
+    def apply_move(self, move):
+
+        self.cube.apply_move(move)
+        self.record(move)
+
+    # applies a whole algorithm to the cube at once and records every one of its moves
+    def apply_algorithm(self, algorithm):
+
+        algorithm = compile_algorithm(algorithm)
+
+        # the states in the middle of the algorithm are never built, so the only snapshot is of the state after it
+        for move in algorithm.moves:
+            self.append(move)
+
+        self.cube.apply_algorithm(algorithm)
+        self.snapshot()
+
+    # undoes the last move, returning whether there was a move to undo
+    def undo(self):
+
+        if self.position == 0:
+            return False
+
+        self.position -= 1
+        self.cube.apply_move(INVERSE_MOVES[self.moves[self.position]])
+        return True
+
+    # redoes the last undone move, returning whether there was a move to redo
+    def redo(self):
+
+        if self.position == len(self.moves):
+            return False
+
+        self.cube.apply_move(self.moves[self.position])
+        self.position += 1
+        return True
+
+    # puts the cube in the state it was in after the first n moves of the history
+    def jump(self, n):
+
+        if n < 0 or n > len(self.moves):
+            raise Exception("The history only has " + str(len(self.moves)) + " moves")
+
+        # replays from the nearest snapshot at or before move n, unless stepping from the current position is shorter
+        i = bisect_right(self.snapshot_positions, n) - 1
+
+        if abs(n - self.position) > n - self.snapshot_positions[i]:
+            self.cube.set_key(self.snapshot_stickers[i])
+            self.position = self.snapshot_positions[i]
+
+        while self.position < n:
+            self.redo()
+
+        while self.position > n:
+            self.undo()
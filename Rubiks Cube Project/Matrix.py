@@ -17,8 +17,18 @@ Matrix
 
     * for indexing into a matrix, do matrix[column][row]
 
+- Every matrix multiplication in the project rotates positions: a position (x, y, z) is the 1 x 3 matrix [[x], [y], [z]] multiplied by a 3 x 3 rotation matrix
+    fast_matrix_mul() unrolls that case and falls back on general_matrix_mul() for every other size
+    any number of positions can be rotated in one call as an N x 3 matrix, [[x1, x2, ...], [y1, y2, ...], [z1, z2, ...]], built by positions_matrix()
+- matrix_mul is chosen when the module is imported, from the RUBIKS_MATRIX_BACKEND environment variable:
+    "python" (the default) - fast_matrix_mul()
+    "numpy" - numpy_matrix_mul(), which is only worth it for large batches of positions and falls back on "python" when NumPy isn't installed
+    every backend takes and returns the same column-major lists, so they can be swapped without changing any caller
+
 """
 
+import os
+
 # completes the dot product between a row and column, each represented by a singular list
 def dot_product(r, c):
     result = 0
@@ -30,8 +40,8 @@ def dot_product(r, c):
 def matrix_size(m):
     return len(m[0]), len(m)
 
-# multiples two matrices together
-def matrix_mul(m1, m2):
+# multiples two matrices together of any size
+def general_matrix_mul(m1, m2):
     # retrieving matrix sizes
     m1_row_size, m1_col_size = matrix_size(m1) 
     m2_row_size, m2_col_size = matrix_size(m2) 
@@ -64,4 +74,63 @@ def matrix_mul(m1, m2):
             d = dot_product(r, c)
             result_col.append(d)
         m3.append(result_col)
-    return m3
\ No newline at end of file
+    return m3
+
+# multiplies two matrices together, unrolling the multiplication of positions by a 3 x 3 matrix
+def fast_matrix_mul(m1, m2):
+
+    if len(m1) != 3 or len(m2) != 3 or len(m2[0]) != 3:
+        return general_matrix_mul(m1, m2)
+
+    a, b, c = m2
+    x, y, z = m1
+
+    # a single position, which is by far the most common case
+    if len(x) == 1:
+        x = x[0]
+        y = y[0]
+        z = z[0]
+        return [[x * a[0] + y * a[1] + z * a[2]], [x * b[0] + y * b[1] + z * b[2]], [x * c[0] + y * c[1] + z * c[2]]]
+
+    return [
+        [xn * a[0] + yn * a[1] + zn * a[2] for xn, yn, zn in zip(x, y, z)],
+        [xn * b[0] + yn * b[1] + zn * b[2] for xn, yn, zn in zip(x, y, z)],
+        [xn * c[0] + yn * c[1] + zn * c[2] for xn, yn, zn in zip(x, y, z)],
+    ]
+
+# multiplies two matrices together with NumPy
+# a column-major list is the transpose of the matrix it holds, so m1 * m2 is (m2 * m1) with the lists read as they are
+def numpy_matrix_mul(m1, m2):
+
+    if len(m1) != len(m2[0]):
+        raise Exception("Provided matrices are not of proper dimensions!")
+
+    return (numpy.array(m2) @ numpy.array(m1)).tolist()
+
+# turns a list of (x, y, z) positions into the N x 3 matrix that rotates all of them in one multiplication
+def positions_matrix(positions):
+    return [[pos[0] for pos in positions], [pos[1] for pos in positions], [pos[2] for pos in positions]]
+
+# turns an N x 3 matrix back into a list of (x, y, z) positions
+def matrix_positions(m):
+    return list(zip(m[0], m[1], m[2]))
+
+# choosing the backend of matrix_mul
+BACKEND = os.environ.get("RUBIKS_MATRIX_BACKEND", "python")
+
+if BACKEND == "numpy":
+
+    try:
+        import numpy
+
+    except ImportError:
+        BACKEND = "python"
+
+if BACKEND == "numpy":
+    matrix_mul = numpy_matrix_mul
+
+elif BACKEND == "python":
+    matrix_mul = fast_matrix_mul
+
+else:
+    raise Exception("Unknown matrix backend " + BACKEND + ", expected either python or numpy")
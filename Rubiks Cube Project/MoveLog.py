@@ -0,0 +1,273 @@
+"""
+MoveLog
+
+- A program that records move histories in a compact binary file and replays them from a memory-mapped copy of the file
+- Moves are the move ids of the MoveTables module, one byte per move, so moves returned by Cube.rotate and Cube.turn and the history of a MoveJournal can be recorded as they are
+    (the 36 moves don't fit in a nibble, so a byte is the smallest whole unit per move)
+- Layout of a file, with every number big-endian:
+    header - MAGIC, VERSION (1 byte), the checkpoint interval (4 bytes), the 54 stickers of the starting state, and the CRC32 of all of those (4 bytes)
+    blocks - one per checkpoint interval moves, each being the number of moves in the block (4 bytes), interval bytes of moves (unused ones are 255),
+        the 54 stickers of the state after the block (the checkpoint), and the CRC32 of all of those (4 bytes)
+    every block has the same size, so block k is found at HEADER_SIZE + k * block size, and only the last block can hold fewer than interval moves
+- Blocks are written once they are full and the last block when the writer is closed, so a log that was never closed loses at most its last interval moves
+- The reader checks the CRC32 of every block it reads, so a damaged file is never replayed quietly
+    going to move n starts from the checkpoint before the block of move n and replays at most interval moves
+- Usage:
+    python MoveLog.py file [--verify] [--state N] [--format facelets|key]
+    prints the number of moves and checkpoints, checks every block with --verify, and prints the state after N moves with --state
+
+"""
+
+import argparse
+import mmap
+import struct
+import zlib
+from MoveTables import apply_move
+from RubiksCube import Cube, SOLVED_STICKERS
+
+MAGIC = b"RCML"
+VERSION = 1
+HEADER = struct.Struct(">4sBI54s")
+HEADER_SIZE = HEADER.size + 4
+NO_MOVE = 255
+
+
+class MoveLogWriter:
+
+    # output is a path or a file object opened in binary, and start is the stickers of the state before the first move
+    def __init__(self, output, start = SOLVED_STICKERS, interval = 4096):
+
+        if not 1 <= interval < 2 ** 32:
+            raise Exception("The checkpoint interval must be at least 1 move")
+
+        if len(start) != 54:
+            raise Exception("The starting state must be 54 stickers")
+
+        self.file = open(output, "wb") if isinstance(output, str) else output
+        self.owns_file = isinstance(output, str)
+        self.interval = interval
+        self.stickers = bytes(start)
+        self.block = bytearray()
+        self.count = 0
+
+        header = HEADER.pack(MAGIC, VERSION, interval, self.stickers)
+        self.file.write(header + struct.pack(">I", zlib.crc32(header)))
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # adds a move, writing the block once it is full
+    def append(self, move):
+
+        self.block.append(move)
+        self.stickers = apply_move(self.stickers, move)
+        self.count += 1
+
+        if len(self.block) == self.interval:
+            self.write_block()
+
+    def extend(self, moves):
+
+        for move in moves:
+            self.append(move)
+
+    # adds the move returned by Cube.rotate or Cube.turn, which is None when nothing moved
+    def record(self, move):
+
+        if move is not None:
+            self.append(move)
+
+    def write_block(self):
+
+        block = struct.pack(">I", len(self.block)) + bytes(self.block).ljust(self.interval, bytes([NO_MOVE])) + self.stickers
+        self.file.write(block + struct.pack(">I", zlib.crc32(block)))
+        self.block = bytearray()
+
+    # writes the last block, even when it isn't full, and closes the file if the writer opened it
+    def close(self):
+
+        if self.file is None:
+            return
+
+        if self.block:
+            self.write_block()
+
+        if self.owns_file:
+            self.file.close()
+
+        else:
+            self.file.flush()
+
+        self.file = None
+
+# writes every move of a MoveJournal up to its current position as a move log
+def save_journal(journal, output, interval = 4096):
+
+    with MoveLogWriter(output, journal.snapshot_stickers[0], interval) as writer:
+        writer.extend(journal.moves[:journal.position])
+
+
+class MoveLogReader:
+
+    def __init__(self, path):
+
+        self.file = open(path, "rb")
+
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+
+        except ValueError:
+            self.file.close()
+            raise Exception("The move log is empty")
+
+        if len(self.data) < HEADER_SIZE:
+            self.close()
+            raise Exception("The move log is too short to have a header")
+
+        magic, version, self.interval, start = HEADER.unpack_from(self.data, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise Exception("The file is not a move log of version " + str(VERSION))
+
+        if struct.unpack_from(">I", self.data, HEADER.size)[0] != zlib.crc32(self.data[:HEADER.size]):
+            self.close()
+            raise Exception("The header of the move log is damaged")
+
+        self.start = bytes(start)
+        self.block_size = 4 + self.interval + 54 + 4
+        self.num_blocks = (len(self.data) - HEADER_SIZE) // self.block_size
+
+        # every block but the last is full
+        self.count = 0
+
+        if self.num_blocks:
+            self.count = (self.num_blocks - 1) * self.interval + self.block(self.num_blocks - 1)[0]
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+
+        self.data.close()
+        self.file.close()
+
+    # returns the number of moves, the moves, and the checkpoint of block k after checking its CRC32
+    def block(self, k):
+
+        offset = HEADER_SIZE + k * self.block_size
+        end = offset + self.block_size - 4
+
+        if struct.unpack_from(">I", self.data, end)[0] != zlib.crc32(self.data[offset:end]):
+            raise Exception("Block " + str(k) + " of the move log is damaged")
+
+        count = struct.unpack_from(">I", self.data, offset)[0]
+
+        if count > self.interval:
+            raise Exception("Block " + str(k) + " of the move log is damaged")
+
+        return count, self.data[offset + 4:offset + 4 + count], self.data[end - 54:end]
+
+    # checks the CRC32 of every block and that replaying every block reaches its checkpoint, returning the number of moves
+    def verify(self):
+
+        stickers = self.start
+
+        for k in range(self.num_blocks):
+            count, moves, checkpoint = self.block(k)
+
+            for move in moves:
+                stickers = apply_move(stickers, move)
+
+            if stickers != checkpoint:
+                raise Exception("Replaying block " + str(k) + " of the move log doesn't reach its checkpoint")
+
+        return self.count
+
+    # returns move n (counting from 0)
+    def move(self, n):
+
+        if not 0 <= n < self.count:
+            raise Exception("The move log only has " + str(self.count) + " moves")
+
+        return self.block(n // self.interval)[1][n % self.interval]
+
+    # returns the moves from start up to (not including) stop as bytes
+    def moves(self, start = 0, stop = None):
+
+        stop = self.count if stop is None else min(stop, self.count)
+        result = []
+
+        for k in range(start // self.interval, (stop + self.interval - 1) // self.interval):
+            first = max(start - k * self.interval, 0)
+            result.append(self.block(k)[1][first:stop - k * self.interval])
+
+        return b"".join(result)
+
+    # returns the stickers after the first n moves, replaying from the checkpoint before the block of move n
+    def stickers_at(self, n):
+
+        if not 0 <= n <= self.count:
+            raise Exception("The move log only has " + str(self.count) + " moves")
+
+        k = n // self.interval
+        stickers = self.start if k == 0 else self.block(k - 1)[2]
+
+        if n % self.interval:
+
+            for move in self.block(k)[1][:n % self.interval]:
+                stickers = apply_move(stickers, move)
+
+        return stickers
+
+    def cube_at(self, n):
+        return Cube.from_key(self.stickers_at(n))
+
+    # yields (number of moves, stickers) after every move from start up to stop, seeking to start through the nearest checkpoint
+    def replay(self, start = 0, stop = None):
+
+        stop = self.count if stop is None else min(stop, self.count)
+        stickers = self.stickers_at(start)
+        n = start
+
+        for k in range(start // self.interval, (stop + self.interval - 1) // self.interval):
+
+            for move in self.block(k)[1][max(n - k * self.interval, 0):stop - k * self.interval]:
+                stickers = apply_move(stickers, move)
+                n += 1
+                yield n, stickers
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Read a binary move log")
+    parser.add_argument("file", help = "move log to read")
+    parser.add_argument("--verify", action = "store_true", help = "check every block and checkpoint")
+    parser.add_argument("--state", type = int, default = None, help = "print the state after this many moves")
+    parser.add_argument("--format", choices = ["facelets", "key"], default = "facelets", help = "how the state is printed")
+    args = parser.parse_args(argv)
+
+    with MoveLogReader(args.file) as reader:
+        print(str(len(reader)) + " moves, " + str(reader.num_blocks) + " checkpoints every " + str(reader.interval) + " moves")
+
+        if args.verify:
+            reader.verify()
+            print("every block is intact")
+
+        if args.state is not None:
+            cube = reader.cube_at(args.state)
+            print(cube.compact_key().hex() if args.format == "key" else cube.facelets())
+
+if __name__ == "__main__":
+    main()
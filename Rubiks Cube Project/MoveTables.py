@@ -0,0 +1,221 @@
+"""
+MoveTables
+
+- A helper module that precomputes every move of the rubiks cube as a permutation of its 54 stickers
+- The state of a cube is a flat list of 54 stickers, 9 per face, with the faces in the order U, R, F, D, L, B
+    (up, right, front, down, left, back, the same order used by the standard facelet notation)
+- Every face is read row by row while looking straight at it, with U held so that B is above it and D held so that F is above it
+- Coordinates follow the RubiksCube module: x points towards R, y points towards U and z points towards B (the front face is at z = -1)
+- A permutation p is applied to a state s by building new_s where new_s[i] = s[p[i]]
+- Moves are identified by (axis, layer, quarter turns)
+    axis is either "x", "y", or "z"
+    layer is the coordinate value (-1, 0, or 1) of the 3 x 3 portion being rotated, or None when rotating the entire cube
+    quarter turns is either 1, 2, or 3 and is directioned by the right hand rule, exactly like Cube.rotate and Cube.turn
+- Every one of the 36 moves also has a standard name (R, U', M2, x, ...), so the 18 face moves, 9 slice moves, and 9 entire cube turns are all covered
+- The permutations are only built the first time and are loaded from disk through the Tables module after that, which keeps importing the cube quick
+
+"""
+
+from operator import itemgetter
+from Matrix import matrix_mul, matrix_positions, positions_matrix
+from RotationMatrices import COLOR_ORDERS, QUARTER_TURNS, ROTATIONS
+from Tables import load_or_build
+
+AXES = ("x", "y", "z")
+LAYERS = (-1, 0, 1)
+FACES = "URFDLB"
+
+# the axis each face is perpendicular to and the coordinate value of that face along the axis
+FACE_AXES = {"U": (1, 1), "R": (0, 1), "F": (2, -1), "D": (1, -1), "L": (0, -1), "B": (2, 1)}
+
+# rotates a position (x, y, z) a quarter turn k times about an axis using the exact rotations of RotationMatrices
+def rotate_point(pos, axis, k):
+
+    m = ROTATIONS[QUARTER_TURNS[(axis, k % 4)]]
+    rotated = matrix_mul([[pos[0]], [pos[1]], [pos[2]]], m)
+    return (rotated[0][0], rotated[1][0], rotated[2][0])
+
+# returns the positions of the 9 stickers of a face in reading order
+def face_positions(face):
+
+    positions = []
+
+    for r in range(3):
+
+        for c in range(3):
+            row = 1 - r
+            col = c - 1
+
+            if face == "U":
+                positions.append((col, 1, row))
+
+            elif face == "R":
+                positions.append((1, row, col))
+
+            elif face == "F":
+                positions.append((col, row, -1))
+
+            elif face == "D":
+                positions.append((col, -1, -row))
+
+            elif face == "L":
+                positions.append((-1, row, -col))
+
+            elif face == "B":
+                positions.append((-col, row, 1))
+
+    return positions
+
+# a sticker is identified by the position of its piece and the axis its color faces
+STICKERS = []
+
+for face in FACES:
+
+    for pos in face_positions(face):
+        STICKERS.append((pos, FACE_AXES[face][0]))
+
+STICKER_INDEX = {}
+
+for i in range(len(STICKERS)):
+    STICKER_INDEX[STICKERS[i]] = i
+
+# builds the sticker permutation of rotating a layer (or the entire cube when layer is None) k quarter turns about an axis
+def build_perm(axis, layer, k):
+
+    perm = list(range(54))
+    axis_index = AXES.index(axis)
+    moved = [i for i in range(54) if layer is None or STICKERS[i][0][axis_index] == layer]
+
+    # every sticker of the layer is rotated in a single matrix multiplication
+    rotated = matrix_positions(matrix_mul(positions_matrix([STICKERS[i][0] for i in moved]), ROTATIONS[QUARTER_TURNS[(axis, k)]]))
+
+    for n in range(len(moved)):
+
+        # the color ends up facing the axis that the rotation reorders its current axis into
+        color_axis = COLOR_ORDERS[QUARTER_TURNS[(axis, k)]].index(STICKERS[moved[n]][1])
+
+        perm[STICKER_INDEX[(rotated[n], color_axis)]] = moved[n]
+
+    return tuple(perm)
+
+# returns the permutation of applying p1 followed by p2
+def compose(p1, p2):
+    return tuple([p1[i] for i in p2])
+
+# returns the permutation that undoes p
+def inverse(p):
+
+    result = [0] * len(p)
+
+    for i in range(len(p)):
+        result[p[i]] = i
+
+    return tuple(result)
+
+# the standard name of the clockwise quarter turn of every layer (and the entire cube) along with its quarter turns
+BASE_NAMES = {
+    ("x", 1): ("R", 3), ("x", 0): ("M", 1), ("x", -1): ("L", 1), ("x", None): ("x", 3),
+    ("y", 1): ("U", 3), ("y", 0): ("E", 1), ("y", -1): ("D", 1), ("y", None): ("y", 3),
+    ("z", -1): ("F", 1), ("z", 0): ("S", 1), ("z", 1): ("B", 3), ("z", None): ("z", 1),
+}
+
+# all 36 moves, where a move's id is its index in these lists
+MOVES = []
+MOVE_NAMES = []
+PERMS = []
+MOVE_IDS = {}
+NAMED_MOVES = {}
+
+for axis in AXES:
+
+    for layer in LAYERS + (None,):
+        base, clockwise = BASE_NAMES[(axis, layer)]
+
+        for k in range(1, 4):
+
+            if k == clockwise:
+                name = base
+
+            elif k == 2:
+                name = base + "2"
+
+            else:
+                name = base + "'"
+
+            MOVE_IDS[(axis, layer, k)] = len(MOVES)
+            NAMED_MOVES[name] = len(MOVES)
+            MOVES.append((axis, layer, k))
+            MOVE_NAMES.append(name)
+
+# the permutations of all 36 moves are only built once and then loaded from disk, 54 stickers after another
+PERMS_TABLE = load_or_build("move_perms", "B", lambda: [i for axis, layer, k in MOVES for i in build_perm(axis, layer, k)])
+
+for m in range(len(MOVES)):
+    PERMS.append(tuple(PERMS_TABLE[m * 54:(m + 1) * 54].tolist()))
+
+# itemgetters are the fastest way to gather a list by a fixed set of indices
+GETTERS = [itemgetter(*p) for p in PERMS]
+
+# the move that undoes each move
+INVERSE_MOVES = [MOVE_IDS[(axis, layer, 4 - k)] for axis, layer, k in MOVES]
+
+# the faces whose stickers are changed by a permutation, as a bitmask with bit f set for face FACES[f]
+def touched_faces(p):
+
+    mask = 0
+
+    for f in range(len(FACES)):
+
+        if any([p[i] != i for i in range(f * 9, f * 9 + 9)]):
+            mask |= 1 << f
+
+    return mask
+
+# the faces touched by each move, which tells a cube which of its cached faces are out of date after the move
+MOVE_FACES = [touched_faces(p) for p in PERMS]
+
+# the 24 ways of holding the cube, as sticker permutations found by repeatedly turning the entire cube until no new one shows up
+# ROTATION_PERMS[0] is the identity and ROTATION_MOVES[i] is a shortest sequence of entire cube turns that gives ROTATION_PERMS[i]
+ROTATION_PERMS = [tuple(range(54))]
+ROTATION_MOVES = [()]
+index = 0
+
+while index < len(ROTATION_PERMS):
+
+    for m in range(len(MOVES)):
+
+        if MOVES[m][1] is None:
+            p = compose(ROTATION_PERMS[index], PERMS[m])
+
+            if p not in ROTATION_PERMS:
+                ROTATION_PERMS.append(p)
+                ROTATION_MOVES.append(ROTATION_MOVES[index] + (m,))
+
+    index += 1
+
+# applies a move to the bytes of stickers of a cube and returns the new bytes
+def apply_move(stickers, move):
+    return bytes(GETTERS[move](stickers))
+
+# positional index of the cube: the indices of the stickers of the piece at every position, in x, y, z order (None where the piece has no sticker)
+# stickers move between fixed positions, so this index never changes and looking up a piece is a single dictionary access
+PIECE_STICKERS = {}
+
+for pos, a in STICKERS:
+    PIECE_STICKERS[pos] = tuple([STICKER_INDEX.get((pos, n)) for n in range(3)])
+
+# returns the indices of the stickers of the piece at a position
+def piece_stickers(pos):
+    return PIECE_STICKERS[pos]
+
+# the positions of the front face pieces numbered 1 through 9, in the same order as the front face stickers
+FRONT_POSITIONS = tuple(face_positions("F"))
+
+# slice membership: the positions of the 9 pieces that make up every 3 x 3 portion of the cube
+LAYER_POSITIONS = {}
+
+for axis in AXES:
+
+    for layer in LAYERS:
+        axis_index = AXES.index(axis)
+        LAYER_POSITIONS[(axis, layer)] = tuple([pos for pos in PIECE_STICKERS if pos[axis_index] == layer])
@@ -0,0 +1,233 @@
+"""
+Notation
+
+- A helper module that reads standard (Singmaster) move notation, such as "R U R' U' F2 M E' x y2", and compiles it into a single permutation
+- Supported moves:
+    U, D, R, L, F, B - turns of a face
+    M, E, S - turns of the middle slices (M follows L, E follows D, S follows F)
+    x, y, z - turns of the entire cube (x follows R, y follows U, z follows F)
+    u, d, r, l, f, b (or Uw, Dw, Rw, Lw, Fw, Bw) - turns of a face together with the middle slice next to it
+    a move is followed by nothing for a clockwise quarter turn, 2 for a half turn, ' for a counterclockwise quarter turn, or any number of quarter turns
+    parentheses group moves and can be repeated by a number after them, such as (R U R' U')3
+    a text may be at most MAX_MOVES moves (or the max_moves given to parse), which is checked before a repeated group is built, so a huge repeat can't use up all the memory
+- Moves are the ids of the MoveTables module, so a parsed algorithm can also be applied one move at a time with Cube.apply_move
+- simplify() merges and cancels moves that follow each other, including moves of other layers of the same axis in between, since those don't affect each other
+- An Algorithm is compiled once into one permutation of the stickers, so applying a 40 move algorithm costs the same as applying a single move
+
+"""
+
+from operator import itemgetter
+from MoveTables import MOVE_IDS, MOVE_NAMES, MOVES, PERMS, compose, inverse, touched_faces
+
+# the (axis, layer, quarter turns) of the clockwise quarter turn of every letter
+LETTERS = {
+    "R": [("x", 1, 3)], "M": [("x", 0, 1)], "L": [("x", -1, 1)], "x": [("x", None, 3)],
+    "U": [("y", 1, 3)], "E": [("y", 0, 1)], "D": [("y", -1, 1)], "y": [("y", None, 3)],
+    "F": [("z", -1, 1)], "S": [("z", 0, 1)], "B": [("z", 1, 3)], "z": [("z", None, 1)],
+    "r": [("x", 1, 3), ("x", 0, 3)], "l": [("x", -1, 1), ("x", 0, 1)],
+    "u": [("y", 1, 3), ("y", 0, 3)], "d": [("y", -1, 1), ("y", 0, 1)],
+    "f": [("z", -1, 1), ("z", 0, 1)], "b": [("z", 1, 3), ("z", 0, 3)],
+}
+
+# the most moves repeated groups may add up to in one text
+MAX_MOVES = 100000
+
+# reads the quarter turn suffix of a move starting at position i, returning how many clockwise quarter turns it means and where the suffix ends
+def read_suffix(text, i):
+
+    start = i
+
+    while i < len(text) and text[i].isdigit():
+        i += 1
+
+    turns = int(text[start:i]) if i > start else 1
+
+    if i < len(text) and text[i] == "'":
+        turns = -turns
+        i += 1
+
+    return turns, i
+
+# turns notation into a list of move ids, raising an exception when it is more than max_moves moves
+def parse(text, max_moves = MAX_MOVES):
+
+    moves = None
+
+    # notation without groups is usually single moves separated by spaces, which are looked up whole in TOKENS instead of being read letter by letter
+    if "(" not in text and ")" not in text:
+        moves = []
+
+        for token in text.split():
+
+            if token in TOKENS:
+                moves += TOKENS[token]
+
+            # anything else is read letter by letter, so errors give their position in the whole text
+            else:
+                moves = None
+                break
+
+    if moves is None:
+        moves, i = parse_group(text, 0, max_moves)
+
+        if i != len(text):
+            raise Exception("Unmatched ')' at position " + str(i) + " of the provided moves")
+
+    if len(moves) > max_moves:
+        raise Exception("The provided moves are more than " + str(max_moves) + " moves")
+
+    return moves
+
+# reads moves until the end of the text or a closing parenthesis, returning the moves and where reading stopped
+def parse_group(text, i, max_moves = MAX_MOVES):
+
+    moves = []
+
+    while i < len(text):
+        letter = text[i]
+
+        if letter.isspace():
+            i += 1
+
+        elif letter == "(":
+            start = i
+            group, i = parse_group(text, i + 1, max_moves)
+
+            if i >= len(text):
+                raise Exception("Missing ')' in the provided moves")
+
+            repeat, i = read_suffix(text, i + 1)
+
+            # a group repeated a negative number of times is the inverse of the group
+            if repeat < 0:
+                group = [MOVE_IDS[(axis, layer, 4 - k)] for axis, layer, k in [MOVES[m] for m in reversed(group)]]
+
+            # the size is checked before the repeated group is built
+            if len(moves) + len(group) * abs(repeat) > max_moves:
+                raise Exception("The group at position " + str(start) + " repeats to more than " + str(max_moves) + " moves")
+
+            moves += group * abs(repeat)
+
+        elif letter == ")":
+            return moves, i
+
+        elif letter in LETTERS:
+
+            # Rw is the same as r
+            if letter.isupper() and i + 1 < len(text) and text[i + 1] == "w":
+                letter = letter.lower()
+                i += 1
+
+            turns, i = read_suffix(text, i + 1)
+
+            for axis, layer, k in LETTERS[letter]:
+
+                if (k * turns) % 4 != 0:
+                    moves.append(MOVE_IDS[(axis, layer, (k * turns) % 4)])
+
+        else:
+            raise Exception("Unknown move '" + letter + "' at position " + str(i) + " of the provided moves")
+
+    return moves, i
+
+# the moves of every single move written with one of the usual suffixes
+TOKENS = {}
+
+for letter in LETTERS:
+
+    for suffix in ("", "2", "'", "2'", "3", "3'"):
+        TOKENS[letter + suffix] = parse_group(letter + suffix, 0)[0]
+
+        if letter.isupper() and letter not in "MESxyz":
+            TOKENS[letter + "w" + suffix] = parse_group(letter + "w" + suffix, 0)[0]
+
+# merges and cancels moves that follow each other, looking past moves of the same axis since they don't affect each other
+def simplify(moves):
+
+    result = []
+
+    for m in moves:
+        axis, layer, k = MOVES[m]
+        i = len(result) - 1
+
+        while i >= 0 and MOVES[result[i]][0] == axis and MOVES[result[i]][1] != layer:
+            i -= 1
+
+        if i >= 0 and MOVES[result[i]][0] == axis:
+            k = (MOVES[result[i]][2] + k) % 4
+
+            if k == 0:
+                result.pop(i)
+
+            else:
+                result[i] = MOVE_IDS[(axis, layer, k)]
+
+        else:
+            result.append(m)
+
+    return result
+
+# turns a list of move ids back into notation
+def format_moves(moves):
+    return " ".join([MOVE_NAMES[m] for m in moves])
+
+
+class Algorithm:
+
+    # takes either notation or a list of move ids, simplifying the moves and compiling them into one permutation
+    def __init__(self, moves):
+
+        if isinstance(moves, str):
+            moves = parse(moves)
+
+        self.moves = simplify(moves)
+        self.perm = tuple(range(54))
+
+        for m in self.moves:
+            self.perm = compose(self.perm, PERMS[m])
+
+        self.getter = itemgetter(*self.perm)
+        self.faces = touched_faces(self.perm)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __str__(self):
+        return format_moves(self.moves)
+
+    # applies the whole algorithm to the bytes of stickers of a cube with one gather
+    def apply(self, stickers):
+        return bytes(self.getter(stickers))
+
+    # the algorithm that undoes this one
+    def inverse(self):
+
+        result = Algorithm([])
+        result.moves = [MOVE_IDS[(axis, layer, 4 - k)] for axis, layer, k in [MOVES[m] for m in reversed(self.moves)]]
+        result.perm = inverse(self.perm)
+        result.getter = itemgetter(*result.perm)
+        result.faces = self.faces
+        return result
+
+# compiled algorithms of notation that was already seen, so notation that is applied over and over is only parsed and compiled once
+# only the COMPILED_LIMIT most recently added algorithms are kept, so streaming millions of different algorithms doesn't keep growing the memory used
+COMPILED = {}
+COMPILED_LIMIT = 4096
+
+# returns the compiled Algorithm of notation, a list of move ids, or an Algorithm
+def compile_algorithm(moves):
+
+    if isinstance(moves, Algorithm):
+        return moves
+
+    if not isinstance(moves, str):
+        return Algorithm(moves)
+
+    if moves not in COMPILED:
+
+        if len(COMPILED) >= COMPILED_LIMIT:
+            del COMPILED[next(iter(COMPILED))]
+
+        COMPILED[moves] = Algorithm(moves)
+
+    return COMPILED[moves]
@@ -0,0 +1,413 @@
+"""
+OptimalSolver
+
+- A program that finds provably shortest solutions (counting every face turn as one move) with IDA* and pattern databases
+- Three pattern databases give lower bounds of the number of moves left, and the search uses the largest of them:
+    corners - the positions and twists of all 8 corners, 88179840 entries
+    first sides - the positions and flips of the sides UR, UF, UL, UB, DR, DF, 42577920 entries
+    last sides - the positions and flips of the sides DL, DB, FR, FL, BL, BR, 42577920 entries
+- Entries are 4 bits each, packed two to a byte, and memory-mapped from disk through the Tables module
+- Every database is a breadth-first search out of the solved cube that can be stopped after max_depth moves
+    entries that weren't reached are filled with max_depth + 1, which is still a valid lower bound, so a smaller max_depth trades search speed for build time
+    a complete build (max_depth = None) takes hours in pure python, while the default of 8 takes about 8 minutes and about 90 MB of disk
+    tables are built the first time a solver needs them, reporting every table and every depth of every database on stderr so the first solve doesn't look stuck
+- The search never builds Piece, Cube, or CubieCube objects; every node is a handful of integer coordinates moved through small move tables
+    the 6 sides of a database are tracked as two groups of 3, each with its own 10560 entry coordinate (positions and flips of the 3 sides)
+- Symmetry reduction of the databases is not done, every database holds every one of its states
+- Usage:
+    python OptimalSolver.py
+    builds every table of the default max_depth ahead of time, so no later solve has to wait for them
+- References:
+    Finding optimal solutions to Rubik's cube using pattern databases (Korf) - https://www.cs.princeton.edu/courses/archive/fall06/cos402/papers/korfrubik.pdf
+
+"""
+
+import sys
+from array import array
+from time import perf_counter
+from Cubies import CubieCube
+from MoveTables import MOVE_NAMES
+from Tables import load_or_build
+from TwoPhaseSolver import FACE_MOVES, MOVE_CUBES, build_move_table, prepare, skip_move
+
+NUM_TWISTS = 2187
+NUM_CORNER_PERMS = 40320
+NUM_CORNER_STATES = NUM_CORNER_PERMS * NUM_TWISTS
+
+# 3 sides have 12 * 11 * 10 ordered positions and 8 combinations of flips
+NUM_TRIPLES = 12 * 11 * 10 * 8
+
+# the second group of 3 sides only uses the 9 positions left over by the first group
+NUM_RELATIVE_TRIPLES = 9 * 8 * 7 * 8
+NUM_EDGE_STATES = NUM_TRIPLES * NUM_RELATIVE_TRIPLES
+
+# the two groups of 3 sides of each side database
+EDGE_GROUPS = (((0, 1, 2), (3, 4, 5)), ((6, 7, 8), (9, 10, 11)))
+
+DEFAULT_MAX_DEPTH = 8
+
+# where a side at position pos (0 to 11) with flip f ends up after each face move, stored as pos * 2 + f
+EDGE_STATE_MOVES = []
+
+for move in MOVE_CUBES:
+    row = [0] * 24
+
+    for i in range(12):
+
+        for f in range(2):
+            row[move.ep[i] * 2 + f] = i * 2 + (f + move.eo[i]) % 2
+
+    EDGE_STATE_MOVES.append(row)
+
+# returns the coordinate of 3 sides given the position * 2 + flip of each one, where the positions are ranked among the positions still free
+def triple_index(states, num_positions = 12, taken = ()):
+
+    free = [p for p in range(12) if p not in taken]
+    rank = 0
+    flips = 0
+
+    for s in states:
+        pos = free.index(s // 2)
+        rank = rank * num_positions + pos
+        num_positions -= 1
+        free.pop(pos)
+        flips = flips * 2 + s % 2
+
+    return rank * 8 + flips
+
+# returns the position * 2 + flip of each of the 3 sides of a coordinate from triple_index()
+def triple_states(index):
+
+    rank, flips = divmod(index, 8)
+    rank, third = divmod(rank, 10)
+    first, second = divmod(rank, 11)
+    free = list(range(12))
+    positions = [free.pop(first), free.pop(second), free.pop(third)]
+    return [positions[n] * 2 + (flips >> (2 - n)) % 2 for n in range(3)]
+
+# builds the move table of the 3 side coordinate
+def build_triple_move_table():
+
+    table = [0] * (NUM_TRIPLES * 18)
+
+    for index in range(NUM_TRIPLES):
+        states = triple_states(index)
+
+        for m in range(18):
+            table[index * 18 + m] = triple_index([EDGE_STATE_MOVES[m][s] for s in states])
+
+    return table
+
+# for every 3 side coordinate, the index of the set of positions it takes up
+def build_position_sets():
+
+    sets = {}
+    table = [0] * NUM_TRIPLES
+
+    for index in range(NUM_TRIPLES):
+        taken = tuple(sorted([s // 2 for s in triple_states(index)]))
+        table[index] = sets.setdefault(taken, len(sets))
+
+    return table
+
+# for every set of taken positions and every 3 side coordinate, the coordinate of those 3 sides among the 9 free positions
+# overlapping combinations can never happen and are left as 0
+def build_relative_table(position_sets):
+
+    taken_of_set = {}
+
+    for index in range(NUM_TRIPLES):
+        taken_of_set[position_sets[index]] = [s // 2 for s in triple_states(index)]
+
+    table = [0] * (len(taken_of_set) * NUM_TRIPLES)
+
+    for set_index in range(len(taken_of_set)):
+        taken = taken_of_set[set_index]
+
+        for index in range(NUM_TRIPLES):
+            states = triple_states(index)
+
+            if all([s // 2 not in taken for s in states]):
+                table[set_index * NUM_TRIPLES + index] = triple_index(states, 9, taken)
+
+    return table
+
+# prints the progress of building the tables to stderr, so it never mixes with the output of a program such as BatchSolve
+def log(message):
+    print(message, file = sys.stderr, flush = True)
+
+# returns build wrapped so that it reports the table it is building and how long that took, or build itself when verbose is False
+def announce(name, build, verbose = True):
+
+    if not verbose:
+        return build
+
+    def announced():
+
+        log("Building the " + name + " of the optimal solver, which is only done once (run python OptimalSolver.py to build every table ahead of time)")
+        start = perf_counter()
+        table = build()
+        log("Built the " + name + " in " + str(round(perf_counter() - start, 2)) + " seconds")
+        return table
+
+    return announced
+
+# reads the 4 bit entry i of a packed database
+def get_entry(table, i):
+    return (table[i >> 1] >> ((i & 1) << 2)) & 15
+
+# turns every unreached entry (15) of a packed database into value
+def fill_unreached(table, value):
+
+    translation = bytearray(range(256))
+
+    for byte in range(256):
+        low = byte & 15
+        high = byte >> 4
+
+        if low == 15:
+            low = value
+
+        if high == 15:
+            high = value
+
+        translation[byte] = (high << 4) | low
+
+    return bytearray(table.translate(translation))
+
+# breadth-first search out of the solved state, where expand(state) lists the (next state, database index) of every move
+# states and database indices are both ints, and the frontier is kept in a compact array
+# progress(depth, states) is called after every depth with the number of states first reached at that depth
+def build_database(size, start_state, start_index, expand, max_depth, progress = None):
+
+    table = bytearray([255]) * ((size + 1) // 2)
+    table[start_index >> 1] &= ~(15 << ((start_index & 1) << 2))
+    frontier = array("Q", [start_state])
+    depth = 0
+
+    while frontier and (max_depth is None or depth < max_depth):
+        next_frontier = array("Q")
+        value = depth + 1
+
+        for state in frontier:
+
+            for next_state, i in expand(state):
+                byte = table[i >> 1]
+                shift = (i & 1) << 2
+
+                if (byte >> shift) & 15 == 15:
+                    table[i >> 1] = (byte & ~(15 << shift)) | (value << shift)
+                    next_frontier.append(next_state)
+
+        frontier = next_frontier
+        depth += 1
+
+        if progress is not None:
+            progress(depth, len(frontier))
+
+    return fill_unreached(table, depth + 1)
+
+# prints the number of states first reached at a depth of a database
+def log_depth(depth, states):
+    log("  depth " + str(depth) + ": " + str(states) + " states")
+
+def build_corner_database(corner_perm_move, twist_move, max_depth, progress = None):
+
+    def expand(state):
+
+        c, t = divmod(state, NUM_TWISTS)
+        c *= 18
+        t *= 18
+        result = []
+
+        for m in range(18):
+            i = corner_perm_move[c + m] * NUM_TWISTS + twist_move[t + m]
+            result.append((i, i))
+
+        return result
+
+    return build_database(NUM_CORNER_STATES, 0, 0, expand, max_depth, progress)
+
+def build_edge_database(group, triple_move, position_sets, relative, max_depth, progress = None):
+
+    first = triple_index([e * 2 for e in group[0]])
+    second = triple_index([e * 2 for e in group[1]])
+
+    def expand(state):
+
+        a, b = divmod(state, NUM_TRIPLES)
+        a *= 18
+        b *= 18
+        result = []
+
+        for m in range(18):
+            a2 = triple_move[a + m]
+            b2 = triple_move[b + m]
+            result.append((a2 * NUM_TRIPLES + b2, a2 * NUM_RELATIVE_TRIPLES + relative[position_sets[a2] * NUM_TRIPLES + b2]))
+
+        return result
+
+    start_index = first * NUM_RELATIVE_TRIPLES + relative[position_sets[first] * NUM_TRIPLES + second]
+    return build_database(NUM_EDGE_STATES, first * NUM_TRIPLES + second, start_index, expand, max_depth, progress)
+
+# memory-maps every table of the optimal solver, building the ones that aren't on disk yet and reporting the builds on stderr when verbose is True
+def load_tables(max_depth = DEFAULT_MAX_DEPTH, verbose = True):
+
+    suffix = "_depth" + str(max_depth)
+    progress = log_depth if verbose else None
+    tables = {}
+    tables["corner_perm_move"] = load_or_build("optimal_corner_perm_move", "H", announce("corner permutation move table", lambda: build_move_table(NUM_CORNER_PERMS, CubieCube.corner_perm, CubieCube.set_corner_perm, list(range(18)), True), verbose))
+    tables["twist_move"] = load_or_build("optimal_twist_move", "H", announce("twist move table", lambda: build_move_table(NUM_TWISTS, CubieCube.twist, CubieCube.set_twist, list(range(18)), True), verbose))
+    tables["triple_move"] = load_or_build("optimal_triple_move", "H", announce("side triple move table", build_triple_move_table, verbose))
+    tables["position_sets"] = load_or_build("optimal_position_sets", "B", announce("position set table", build_position_sets, verbose))
+    tables["relative"] = load_or_build("optimal_relative", "H", announce("relative triple table", lambda: build_relative_table(tables["position_sets"]), verbose))
+    tables["corner_database"] = load_or_build("optimal_corner_database" + suffix, "B", announce("corner database", lambda: build_corner_database(tables["corner_perm_move"], tables["twist_move"], max_depth, progress), verbose))
+
+    for n in range(len(EDGE_GROUPS)):
+        name = "edge_database_" + str(n)
+        tables[name] = load_or_build("optimal_" + name + suffix, "B", announce("side database " + str(n), lambda: build_edge_database(EDGE_GROUPS[n], tables["triple_move"], tables["position_sets"], tables["relative"], max_depth, progress), verbose))
+
+    return tables
+
+
+class OptimalSolver:
+
+    def __init__(self, tables = None, max_depth = DEFAULT_MAX_DEPTH, verbose = True):
+
+        if tables is None:
+            tables = load_tables(max_depth, verbose)
+
+        self.corner_perm_move = tables["corner_perm_move"]
+        self.twist_move = tables["twist_move"]
+        self.triple_move = tables["triple_move"]
+        self.position_sets = tables["position_sets"]
+        self.relative = tables["relative"]
+        self.corner_database = tables["corner_database"]
+        self.edge_databases = (tables["edge_database_0"], tables["edge_database_1"])
+
+        # search state and the statistics of the last solve
+        self.path = []
+        self.nodes = 0
+        self.solve_time = 0
+
+    # the largest lower bound of the three databases
+    def heuristic(self, corners, a1, b1, a2, b2):
+
+        h = get_entry(self.corner_database, corners)
+        i = a1 * NUM_RELATIVE_TRIPLES + self.relative[self.position_sets[a1] * NUM_TRIPLES + b1]
+        h = max(h, get_entry(self.edge_databases[0], i))
+        i = a2 * NUM_RELATIVE_TRIPLES + self.relative[self.position_sets[a2] * NUM_TRIPLES + b2]
+        return max(h, get_entry(self.edge_databases[1], i))
+
+    # returns a shortest list of move names that solves a Cube
+    def solve(self, cube):
+
+        start_time = perf_counter()
+        self.nodes = 0
+        self.path = []
+        cubie, prefix = prepare(cube)
+
+        if cubie is None:
+            self.solve_time = perf_counter() - start_time
+            return []
+
+        corners = cubie.corner_perm() * NUM_TWISTS + cubie.twist()
+        states = [0] * 12
+
+        for i in range(12):
+            states[cubie.ep[i]] = i * 2 + cubie.eo[i]
+
+        triples = [triple_index([states[e] for e in group]) for pair in EDGE_GROUPS for group in pair]
+        h = self.heuristic(corners, *triples)
+        bound = h
+
+        # IDA*: every iteration searches again with the bound raised to the smallest estimate that went over the last bound
+        while True:
+            result = self.search(corners, triples[0], triples[1], triples[2], triples[3], h, 0, bound)
+
+            if result is True:
+                self.solve_time = perf_counter() - start_time
+                return prefix + [MOVE_NAMES[FACE_MOVES[m]] for m in self.path]
+
+            bound = result
+
+    # depth first search below a node that is g moves in with a lower bound of h moves left
+    # returns True once solved or else the smallest estimate that went over the bound
+    def search(self, corners, a1, b1, a2, b2, h, g, bound):
+
+        self.nodes += 1
+
+        # all three databases are only 0 for the solved cube
+        if h == 0:
+            return True
+
+        path = self.path
+        c, t = divmod(corners, NUM_TWISTS)
+        c *= 18
+        t *= 18
+        a1 *= 18
+        b1 *= 18
+        a2 *= 18
+        b2 *= 18
+        corner_perm_move = self.corner_perm_move
+        twist_move = self.twist_move
+        triple_move = self.triple_move
+        position_sets = self.position_sets
+        relative = self.relative
+        corner_database = self.corner_database
+        first_database, last_database = self.edge_databases
+        remaining = bound - g - 1
+        smallest = 255
+
+        for m in range(18):
+
+            if path and skip_move(m, path[-1]):
+                continue
+
+            # the databases are read one at a time (inlining get_entry), stopping as soon as one of them goes over the bound
+            next_corners = corner_perm_move[c + m] * NUM_TWISTS + twist_move[t + m]
+            next_h = (corner_database[next_corners >> 1] >> ((next_corners & 1) << 2)) & 15
+            x1 = triple_move[a1 + m]
+            y1 = triple_move[b1 + m]
+            x2 = triple_move[a2 + m]
+            y2 = triple_move[b2 + m]
+
+            if next_h <= remaining:
+                i = x1 * NUM_RELATIVE_TRIPLES + relative[position_sets[x1] * NUM_TRIPLES + y1]
+                next_h = max(next_h, (first_database[i >> 1] >> ((i & 1) << 2)) & 15)
+
+            if next_h <= remaining:
+                i = x2 * NUM_RELATIVE_TRIPLES + relative[position_sets[x2] * NUM_TRIPLES + y2]
+                next_h = max(next_h, (last_database[i >> 1] >> ((i & 1) << 2)) & 15)
+
+            # a bound from only some of the databases is still a lower bound, so it is fine to use for the next iteration's bound
+            if next_h > remaining:
+                smallest = min(smallest, g + 1 + next_h)
+                continue
+
+            path.append(m)
+            result = self.search(next_corners, x1, y1, x2, y2, next_h, g + 1, bound)
+
+            if result is True:
+                return True
+
+            smallest = min(smallest, result)
+            path.pop()
+
+        return smallest
+
+    # the statistics of the last solve
+    def report(self):
+
+        nodes_per_second = 0
+
+        if self.solve_time > 0:
+            nodes_per_second = self.nodes / self.solve_time
+
+        return {"length": len(self.path), "nodes": self.nodes, "seconds": self.solve_time, "nodes_per_second": nodes_per_second}
+
+# builds every table ahead of time, printing how long each part took
+if __name__ == "__main__":
+    start = perf_counter()
+    load_tables()
+    print("Optimal solver tables ready in " + str(round(perf_counter() - start, 2)) + " seconds")
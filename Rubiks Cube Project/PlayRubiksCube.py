@@ -2,13 +2,24 @@
 PlayRubiksCube
 
 - A program that implements player manipulation of the state of a rubiks cube through the PlayCube class
+- Usage:
+    python PlayRubiksCube.py - plays interactively
+    python PlayRubiksCube.py --headless [files ...] [--format facelets|key] [--cumulative] [--seed N]
+        reads lines from the files (or stdin) and writes one line with the resulting state per line read, without drawing anything
+        a line is either moves in standard notation (see the Notation module) or "scramble [number of moves] [seed]", and lines starting with # are skipped
+        every line starts from a solved cube, unless --cumulative is given, in which case every line continues from the state of the line before it
+        states are written as facelet strings (see Cube.facelets()) or as the compact key of Cube.compact_key() in hex, or as "error: ..." when a line can't be read
+    lines are read, applied, and written one at a time, so any number of lines can be streamed through a pipeline in a fixed amount of memory
 
 """
 
+import random
+import sys
 from RubiksCube import Cube
-from random import randint
-from copy import deepcopy
-import os
+from Commands import format_state, scramble_cube
+from Notation import compile_algorithm, parse, simplify
+from Renderer import Renderer
+from Journal import MoveJournal
 
 """
 PlayCube Class
@@ -17,65 +28,80 @@ PlayCube Class
 - self.cube is an instance of the Cube class that is the rubiks cube a player interacts with
 - self.print_type is a field that indicates the format the rubiks cube is printed in the UI
     either is the value "face" or "cube", respectively meaning only the front face is printed or all faces of the cube are printed
+- self.renderer is the Renderer that draws the cube and clears the screen with ANSI escape sequences
+    every prompt printed under the cube is passed to self.renderer.wrote_below(), so the cube is drawn in full again once the prompts have scrolled the screen
+- self.journal is the MoveJournal of every move made to the cube, which the undo and redo commands step through
 
 """
 
+# raised by any text prompt when the user enters "cancel", and caught by the main loop to return to the main screen
+class CancelPrompt(Exception):
+    pass
+
+
 class PlayCube:
 
     def __init__(self):
         self.cube = Cube()
         self.print_type = "face"
+        self.renderer = Renderer()
+        self.journal = MoveJournal(self.cube)
 
     # helper function to ask for the user's input and to keep doing so until a valid input is given
     def get_input(self, question, valid_responses):
 
         print(question)
+        self.renderer.wrote_below(question)
         valid = False
 
         # denies inputs that aren't on the list of valid responses and asks until it gets an acceptable answer
         while not valid:
             my_input = str(input(""))
+            self.renderer.wrote_below(my_input)
+
+            # to escape any current text prompt, the prompt is abandoned and the main loop takes over again
+            if my_input == "cancel":
+                raise CancelPrompt()
 
             for v in valid_responses:
 
                 if my_input == v:
                     valid = True
                     break
-                
-                # to escape any current text prompt, a new PlayCube class is created that's identical to the current one 
-                elif my_input == "cancel":
-                    new_play(self)
-                    break
 
             if not valid:
                 print("Not a valid input. Please try again: ")
+                self.renderer.wrote_below("Not a valid input. Please try again: ")
 
         return my_input
 
     # presents all the commands
     def commands(self):
 
-        os.system("cls")
+        self.renderer.clear()
         print("All commands:")
         print("cancel - cancels any current text prompt and returns to the main screen")
         print("commands - presents all commands")
         print("cube - changes the format of the displayed cube to print all faces")
         print("face - changes the format of the displayed cube to print only the front face")
+        print("moves - applies moves written in standard notation, such as R U R' U' F2 M E' x y2")
         print("quit - quits the program")
+        print("redo - makes the last undone move again")
         print("references - lists various information necessary for interacting with the cube through the UI")
         print("rotate - rotates a 3 x 3 portion of the cube")
         print("scramble - randomly scrambles the cube")
         print("turn - rotates the entire cube")
+        print("undo - takes back the last move")
         input("\n(enter anything to exit the commands screen)\n")
 
     # lists various information necessary for interacting with the cube through the UI
     def references(self):
 
-        os.system("cls")
+        self.renderer.clear()
         print("References:")
         possible_responses = ["directioning", "numbering"]
         choice = self.get_input("Would you like information on how rotation directioning works or how the front face of the cube is numbered? \n(enter either \'directioning\' or \'numbering\')", possible_responses)
-        os.system("cls")
+        self.renderer.clear()
 
         # prints a cartesian plane for reference
         if choice == "directioning":
@@ -129,7 +155,7 @@ class PlayCube:
         if sign == "negative":
             angle = angle * -1 
 
-        self.cube.rotate(piece, axis, angle, "degrees")
+        self.journal.record(self.cube.rotate(piece, axis, angle, "degrees"))
 
     # rotates the entire cube
     def turn(self):
@@ -149,18 +175,51 @@ class PlayCube:
         if sign == "negative":
             angle = angle * -1 
 
-        self.cube.turn(axis, angle, "degrees")
+        self.journal.record(self.cube.turn(axis, angle, "degrees"))
+
+    # applies any number of moves written in standard notation at once
+    def moves(self):
+
+        question = "What moves do you want to apply? \n(enter moves in standard notation, such as \'R U R\' U\' F2 M E\' x y2\')"
+        print(question)
+        self.renderer.wrote_below(question)
+
+        # asks until the moves can be read
+        while True:
+            my_input = str(input(""))
+            self.renderer.wrote_below(my_input)
+
+            if my_input == "cancel":
+                raise CancelPrompt()
+
+            try:
+                algorithm = compile_algorithm(my_input)
+                break
+
+            except Exception as error:
+                print(str(error) + ". Please try again: ")
+                self.renderer.wrote_below(str(error) + ". Please try again: ")
+
+        self.journal.apply_algorithm(algorithm)
 
     # randomly scrambles the cube
     def scramble(self):
 
-        # completes 100 random moves
-        for x in range(100):
+        self.random_moves()
+        self.renderer.clear()
+        print("Cube randomized!")
+        input("\n(enter anything to proceed)\n")
+
+    # completes random moves of 3 x 3 portions of the cube, picked through the front face pieces
+    # rng is the random module by default, or a random.Random to make the moves without touching the global random state
+    def random_moves(self, num_moves = 100, rng = random):
 
-            piece_num = randint(1,9)
-            axis = randint(1,3)
-            angle = randint(1,3)
-            sign = randint(1,2)
+        for x in range(num_moves):
+
+            piece_num = rng.randint(1,9)
+            axis = rng.randint(1,3)
+            angle = rng.randint(1,3)
+            sign = rng.randint(1,2)
 
             piece = self.cube.get_face_piece(piece_num)
 
@@ -188,63 +247,135 @@ class PlayCube:
             if sign == 2:
                 angle = angle * -1
 
-            self.cube.rotate(piece, axis, angle, "degrees")
-
-        os.system("cls")
-        print("Cube randomized!")
-        input("\n(enter anything to proceed)\n")
+            self.journal.record(self.cube.rotate(piece, axis, angle, "degrees"))
 
     # the base of the UI
     def interact_cube(self):
 
-        possible_responses = ["cancel", "commands", "cube", "face", "quit", "references", "rotate", "scramble", "turn"]
+        possible_responses = ["commands", "cube", "face", "moves", "quit", "redo", "references", "rotate", "scramble", "turn", "undo"]
         quit = False
 
         while not quit:
-            os.system("cls")
-            
-            # controls the format of the cube that is displayed
-            if self.print_type == "face":
-                self.cube.print_face()
 
-            else:
-                self.cube.print_cube()
+            # controls the format of the cube that is displayed, only redrawing what changed since the last time
+            self.renderer.draw_cube(self.cube, self.print_type)
 
-            my_input = self.get_input("What do you want to do? \n(enter \'commands\' for a list of commands)", possible_responses)
-            
-            # where all the various commands are called
-            if my_input == "cancel":
-                new_play(self)
+            # "cancel" in any text prompt (including this one) abandons the command and comes back here, without copying the game or starting a new loop
+            try:
+                my_input = self.get_input("What do you want to do? \n(enter \'commands\' for a list of commands)", possible_responses)
+
+                # where all the various commands are called
+                if my_input == "commands":
+                    self.commands()
 
-            elif my_input == "commands":
-                self.commands()
+                elif my_input == "cube":
+                    self.print_type = "cube"
 
-            elif my_input == "cube":
-                self.print_type = "cube"
+                elif my_input == "face":
+                    self.print_type = "face"
 
-            elif my_input == "face":
-                self.print_type = "face"
+                elif my_input == "moves":
+                    self.moves()
 
-            elif my_input == "quit":
-                quit = True
+                elif my_input == "quit":
+                    quit = True
 
-            elif my_input == "references":
-                self.references()
+                elif my_input == "redo":
+                    self.journal.redo()
 
-            elif my_input == "rotate":
-                self.rotate()
+                elif my_input == "references":
+                    self.references()
 
-            elif my_input == "scramble":
-                self.scramble()
+                elif my_input == "rotate":
+                    self.rotate()
 
-            elif my_input == "turn":
-                self.turn()
+                elif my_input == "scramble":
+                    self.scramble()
+
+                elif my_input == "turn":
+                    self.turn()
+
+                elif my_input == "undo":
+                    self.journal.undo()
+
+            except CancelPrompt:
+                pass
 
 # driver function
-def new_play(old_game):
+def new_play(game):
+    game.interact_cube()
+
+# yields the lines of every file (or stdin when there are no files, or for the file "-"), without the ones that are blank or comments
+def read_lines(paths):
+
+    for path in paths or ["-"]:
+        source = sys.stdin if path == "-" else open(path)
+
+        for line in source:
+            line = line.strip()
+
+            if line and not line.startswith("#"):
+                yield line
+
+        if source is not sys.stdin:
+            source.close()
+
+# yields the cube reached by every line, or the error of a line that couldn't be read
+# the same cube is yielded every time, so a state has to be used before the next one is asked for
+def run_lines(lines, cumulative = False, seed = None):
+
+    rng = random.Random(seed)
+    cube = Cube()
+
+    for line in lines:
+
+        if not cumulative:
+            cube.init_cube()
+
+        try:
+            words = line.split()
+
+            if words[0] == "scramble":
+                scramble_cube(cube, words, rng)
+
+            # every line is usually different, so its moves are applied one at a time instead of being compiled and cached
+            else:
+
+                for move in simplify(parse(line)):
+                    cube.apply_move(move)
+
+            yield cube, None
+
+        except Exception as error:
+            yield cube, str(error)
+
+# reads the command line, playing interactively unless --headless is given
+def main(argv = None):
+
+    # argparse is only imported here, as importing it takes longer than importing the whole cube
+    import argparse
+
+    parser = argparse.ArgumentParser(description = "Play with a rubiks cube, or apply moves from files or stdin without drawing anything")
+    parser.add_argument("files", nargs = "*", help = "files of moves or scramble requests, one per line (stdin when there are none)")
+    parser.add_argument("--headless", action = "store_true", help = "write the state reached by every line instead of playing interactively")
+    parser.add_argument("--format", choices = ["facelets", "key"], default = "facelets", help = "how states are written")
+    parser.add_argument("--cumulative", action = "store_true", help = "continue every line from the state of the line before it")
+    parser.add_argument("--seed", type = int, default = None, help = "seed of the scrambles that don't give their own")
+    args = parser.parse_args(argv)
+
+    if not args.headless:
+        new_play(PlayCube())
+        return
+
+    output = sys.stdout
+
+    for cube, error in run_lines(read_lines(args.files), args.cumulative, args.seed):
+
+        if error is not None:
+            output.write("error: " + error + "\n")
 
-    new_game = deepcopy(old_game)
-    del old_game
-    new_game.interact_cube()
+        else:
+            output.write(format_state(cube, args.format) + "\n")
 
-new_play(PlayCube())
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
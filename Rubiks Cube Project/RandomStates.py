@@ -0,0 +1,136 @@
+"""
+RandomStates
+
+- A program that draws uniformly random solvable states of the cube, instead of scrambling with random moves (which favors states close to solved)
+- A state is drawn straight as the canonical integer of the Cubies module:
+    corner_perm - any of the 8! permutations of the corners
+    twist - any twist of the first 7 corners, as the twist of the 8th corner is implied
+    edge_perm - any of the 12! permutations of the sides with the same parity as the corners, found by swapping the last 2 sides of the drawn permutation when the parities differ
+    flip - any flip of the first 11 sides, as the flip of the 12th side is implied
+    the face pieces stay where they belong, unless any_orientation is given, in which case the cube is also held in any of its 24 ways
+    and the parity of the sides then has to make up for the parity of the face pieces as well
+- Every state is drawn from a random.Random, so the same seed always gives the same states
+- States can be Cube objects, canonical integers, compact keys of Cube.compact_key(), or facelet strings of Cube.facelets()
+- Usage:
+    python RandomStates.py count [--seed N] [--format key|facelets|int|binary] [--any-orientation] [--output file]
+    states are written one per line (or as ENCODED_BYTES bytes each for the binary format), a block at a time, so any number of states can be streamed into a file
+
+"""
+
+import argparse
+import random
+import sys
+from Cubies import CENTER_PARITIES, ENCODED_BYTES, NUM_CENTERS, NUM_CORNER_PERMS, NUM_EDGE_PERMS, NUM_FLIPS, NUM_TWISTS
+from RubiksCube import Cube
+
+# returns the parity of the permutation of 0 to n - 1 with a given rank, which is the parity of the sum of the digits of its Lehmer code
+def rank_parity(rank, n):
+
+    parity = 0
+
+    # the digits of a Lehmer code are read from the lowest in bases 2, 3, ..., n
+    for base in range(2, n + 1):
+        rank, digit = divmod(rank, base)
+        parity ^= digit & 1
+
+    return parity
+
+# returns the canonical integer of a uniformly random solvable state
+def random_encoding(rng, any_orientation = False):
+
+    centers = rng.randrange(NUM_CENTERS) if any_orientation else 0
+    corner_perm = rng.randrange(NUM_CORNER_PERMS)
+    twist = rng.randrange(NUM_TWISTS)
+    edge_perm = rng.randrange(NUM_EDGE_PERMS)
+    flip = rng.randrange(NUM_FLIPS)
+
+    # the last digit of the Lehmer code that can change is worth 1, so flipping the lowest bit swaps the last 2 sides and changes the parity
+    if rank_parity(edge_perm, 12) != rank_parity(corner_perm, 8) ^ CENTER_PARITIES[centers]:
+        edge_perm ^= 1
+
+    value = centers
+    value = value * NUM_CORNER_PERMS + corner_perm
+    value = value * NUM_TWISTS + twist
+    value = value * NUM_EDGE_PERMS + edge_perm
+    return value * NUM_FLIPS + flip
+
+# returns a Cube in a uniformly random solvable state
+def random_cube(rng, any_orientation = False):
+    return Cube.decode(random_encoding(rng, any_orientation))
+
+# yields count uniformly random states (or never stops when count is None) in one of the formats "cube", "int", "key", or "facelets"
+def random_states(count = None, seed = None, state_format = "cube", any_orientation = False):
+
+    rng = random.Random(seed)
+    n = 0
+
+    while count is None or n < count:
+        value = random_encoding(rng, any_orientation)
+        n += 1
+
+        if state_format == "int":
+            yield value
+
+        elif state_format == "key":
+            yield value.to_bytes(ENCODED_BYTES, "big")
+
+        elif state_format == "cube":
+            yield Cube.decode(value)
+
+        elif state_format == "facelets":
+            yield Cube.decode(value).facelets()
+
+        else:
+            raise Exception("Unknown state format " + state_format + ", expected cube, int, key, or facelets")
+
+# writes count random states to a file object, block_size states at a time
+# the "key" format is the compact key in hex, and the "binary" format is the compact keys back to back with no separators
+def write_states(output, count, seed = None, state_format = "key", any_orientation = False, block_size = 4096):
+
+    binary = state_format == "binary"
+    states = random_states(count, seed, "key" if state_format in ("key", "binary") else state_format, any_orientation)
+    block = []
+
+    for state in states:
+
+        if binary:
+            block.append(state)
+
+        elif state_format == "key":
+            block.append(state.hex() + "\n")
+
+        else:
+            block.append(str(state) + "\n")
+
+        if len(block) == block_size:
+            output.write(b"".join(block) if binary else "".join(block))
+            block = []
+
+    if block:
+        output.write(b"".join(block) if binary else "".join(block))
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Write uniformly random solvable states of the cube")
+    parser.add_argument("count", type = int, help = "number of states to write")
+    parser.add_argument("--seed", type = int, default = None, help = "seed of the random number generator, for the same states every time")
+    parser.add_argument("--format", choices = ["key", "facelets", "int", "binary"], default = "key", help = "how states are written")
+    parser.add_argument("--any-orientation", action = "store_true", help = "also hold the cube in a random one of its 24 ways")
+    parser.add_argument("--output", default = "-", help = "file to write the states to, or - for stdout")
+    args = parser.parse_args(argv)
+
+    binary = args.format == "binary"
+
+    if args.output == "-":
+        output = sys.stdout.buffer if binary else sys.stdout
+
+    else:
+        output = open(args.output, "wb" if binary else "w")
+
+    write_states(output, args.count, args.seed, args.format, args.any_orientation)
+
+    if args.output != "-":
+        output.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Renderer
+
+- A helper module that draws the cube in a terminal with ANSI escape sequences, instead of clearing the screen by starting a shell with os.system("cls")
+- A frame is a list of rows and every row is a list of cells, where a cell is a (style, character) pair and a style is an ANSI escape sequence ("" for plain text)
+- Every frame is built into a single string and written at once, and only the cells that changed since the last frame are redrawn
+    cells are redrawn at fixed rows, so whatever prints prompts under the frame tells the renderer with wrote_below(), and once the screen may have scrolled the next frame is drawn in full
+- Stickers are drawn as colored cells, either from the 256 color palette or in truecolor (24 bit) when the terminal supports it
+    truecolor is used by default when the COLORTERM environment variable says the terminal supports it
+- References:
+    ANSI escape sequences - https://en.wikipedia.org/wiki/ANSI_escape_code
+
+"""
+
+import os
+import shutil
+import sys
+from RubiksCube import COLORS
+
+RESET = "\x1b[0m"
+CLEAR = "\x1b[H\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+# the 256 color palette index and the (red, green, blue) value of every color
+PALETTE = {"white": 15, "red": 160, "green": 34, "yellow": 226, "orange": 208, "blue": 27, "empty": 0}
+RGB = {"white": (255, 255, 255), "red": (196, 30, 58), "green": (0, 158, 96), "yellow": (255, 213, 0), "orange": (255, 88, 0), "blue": (0, 81, 186), "empty": (0, 0, 0)}
+
+# black text on the background color of every color
+PALETTE_STYLES = tuple(["\x1b[30;48;5;" + str(PALETTE[color]) + "m" for color in COLORS])
+RGB_STYLES = tuple(["\x1b[30;48;2;" + ";".join([str(v) for v in RGB[color]]) + "m" for color in COLORS])
+
+# the color code of the first letter of every color, as used by Cube.get_face() and Cube.cube_lines()
+LETTER_CODES = {}
+
+for n in range(len(COLORS)):
+    LETTER_CODES[COLORS[n][0]] = n
+
+# turns lines of plain text into a frame
+def text_frame(lines):
+    return [[("", ch) for ch in line] for line in lines]
+
+# the frame of the front face of a cube, laid out like Cube.print_face() with every box filled with the color of its sticker
+def face_frame(cube, truecolor = False):
+
+    styles = RGB_STYLES if truecolor else PALETTE_STYLES
+    frame = text_frame(cube.face_lines())
+    front = cube.get_face()
+
+    # the insides of the boxes are the 3 lines under every border line and the 8 cells between every pair of "|"
+    for r in range(3):
+
+        for c in range(3):
+            style = styles[LETTER_CODES[front[c][r]]]
+
+            for line in range(2 + r * 4, 5 + r * 4):
+
+                for col in range(1 + c * 9, 9 + c * 9):
+                    frame[line][col] = (style, frame[line][col][1])
+
+    return frame
+
+# the frame of all faces of a cube, laid out like Cube.print_cube() with every sticker letter and the space after it drawn in the color of the sticker
+def cube_frame(cube, truecolor = False):
+
+    styles = RGB_STYLES if truecolor else PALETTE_STYLES
+    frame = text_frame(cube.cube_lines())
+
+    # the first line is the title, whose letters aren't stickers
+    for row in frame[1:]:
+
+        for col in range(len(row) - 1):
+
+            if row[col][1] in LETTER_CODES:
+                style = styles[LETTER_CODES[row[col][1]]]
+                row[col] = (style, row[col][1])
+                row[col + 1] = (style, row[col + 1][1])
+
+    return frame
+
+# whether the terminal says it can draw truecolor
+def supports_truecolor():
+    return os.environ.get("COLORTERM", "") in ("truecolor", "24bit")
+
+
+class Renderer:
+
+    def __init__(self, output = None, truecolor = None):
+
+        self.output = output if output is not None else sys.stdout
+        self.truecolor = supports_truecolor() if truecolor is None else truecolor
+
+        # the frame currently on the screen, or None when what is on the screen isn't known
+        self.previous = None
+
+        # the number of lines written under the frame on the screen since it was drawn
+        self.lines_below = 0
+
+        # the windows console only understands escape sequences once a console program has turned them on, which an empty command does
+        if os.name == "nt":
+            os.system("")
+
+    # clears the whole screen, for screens that are printed as plain text rather than drawn as frames
+    def clear(self):
+
+        self.output.write(CLEAR)
+        self.output.flush()
+        self.previous = None
+
+    # notes that text was printed under the frame, forgetting the frame once the text may have scrolled it away from the rows it was drawn on
+    def wrote_below(self, text):
+
+        columns, rows = shutil.get_terminal_size()
+
+        # a line longer than the terminal is wide takes up more than one row
+        self.lines_below += sum([max(1, -(-len(line) // columns)) for line in text.split("\n")])
+
+        if self.previous is not None and len(self.previous) + self.lines_below >= rows:
+            self.previous = None
+
+    # draws a frame, only rewriting the cells that differ from the frame on the screen
+    # the cursor is left on the line below the frame with everything below it cleared, so prompts can be printed under the frame
+    def draw(self, frame):
+
+        parts = []
+        previous = self.previous
+
+        if previous is None:
+            parts.append(CLEAR)
+            previous = []
+
+        style = ""
+
+        for r in range(len(frame)):
+            row = frame[r]
+            old = previous[r] if r < len(previous) else []
+            c = 0
+
+            while c < len(row):
+
+                if c < len(old) and row[c] == old[c]:
+                    c += 1
+                    continue
+
+                # moves the cursor to the first changed cell and writes cells until they match the old frame again
+                parts.append("\x1b[" + str(r + 1) + ";" + str(c + 1) + "H")
+
+                while c < len(row) and (c >= len(old) or row[c] != old[c]):
+
+                    if row[c][0] != style:
+                        parts.append(RESET + row[c][0])
+                        style = row[c][0]
+
+                    parts.append(row[c][1])
+                    c += 1
+
+            # erases what is left of a longer old row
+            if len(old) > len(row):
+
+                if style:
+                    parts.append(RESET)
+                    style = ""
+
+                parts.append("\x1b[" + str(r + 1) + ";" + str(len(row) + 1) + "H" + CLEAR_LINE)
+
+        if style:
+            parts.append(RESET)
+
+        parts.append("\x1b[" + str(len(frame) + 1) + ";1H" + CLEAR_BELOW)
+        self.output.write("".join(parts))
+        self.output.flush()
+        self.previous = frame
+        self.lines_below = 0
+
+    # draws the cube in either the "face" or the "cube" format of PlayCube.print_type
+    def draw_cube(self, cube, print_type = "face"):
+
+        if print_type == "face":
+            self.draw(face_frame(cube, self.truecolor))
+
+        else:
+            self.draw(cube_frame(cube, self.truecolor))
@@ -2,19 +2,109 @@
 RotationMatrices
 
 - A helper module used to create a rotation matrix relative to either the x, y, or z axes based on an angle given in radians
+- Only quarter turns are ever needed for a rubiks cube, so every rotation is exact and comes out of precomputed tables instead of sin and cos
+    a quarter turn rotation is identified by (axis, k), meaning k quarter turns (k * 90 degrees) about the axis, where k is either 0, 1, 2, or 3
+    the 24 rotations that map the cube onto itself are stored in ROTATIONS and are referred to by their index
+    COMPOSE[a][b] is the index of applying rotation a followed by rotation b, and INVERSE[a] is the index of the rotation that undoes rotation a
+    COLOR_ORDERS[a] is how rotation a reorders the (x, y, z) colors of a piece
+- Matrices are column-major two-dimensional lists, just like in the Matrix module, and rotate a position p by matrix_mul(p, matrix)
 - References:
-    Rotation matrices - https://journals.iucr.org/d/issues/2001/10/00/ba5006/#:~:text=The%20rows%20of%20a%20rotation%20matrix%20are%20orthogonal%20unit%20vectors&text=3.2%2C%20since%20the%20inverse%20(transposed,in%20exactly%20the%20opposite%20direction. 
+    Rotation matrices - https://journals.iucr.org/d/issues/2001/10/00/ba5006/#:~:text=The%20rows%20of%20a%20rotation%20matrix%20are%20orthogonal%20unit%20vectors&text=3.2%2C%20since%20the%20inverse%20(transposed,in%20exactly%20the%20opposite%20direction.
 
 """
 
 # **** UNITS FOR ANGLES ARE RADIANS ****
-from math import sin, cos
+from math import pi
+from Matrix import matrix_mul
+from Tables import load_or_build
 
+# exact values of cos and sin for 0, 1, 2, and 3 quarter turns
+COS = (1, 0, -1, 0)
+SIN = (0, 1, 0, -1)
+
+# converts an angle into a number of quarter turns between 0 and 3, refusing angles that aren't a multiple of 90 degrees
+def quarter_turns(angle, units = "radians"):
+
+    if units == "radians":
+        k = round(angle / (pi / 2))
+
+        if abs(angle - k * pi / 2) > 1e-9:
+            raise Exception("Angle of rotation must be a multiple of pi / 2 radians")
+
+    else:
+        if angle % 90 != 0:
+            raise Exception("Angle of rotation must be a multiple of 90 degrees")
+
+        k = int(angle // 90)
+
+    return k % 4
+
+def quarter_x_matrix(k):
+    return [[1, 0, 0], [0, COS[k], SIN[k]], [0, -1 * SIN[k], COS[k]]]
+
+def quarter_y_matrix(k):
+    return [[COS[k], 0, -1 * SIN[k]], [0, 1, 0], [SIN[k], 0, COS[k]]]
+
+def quarter_z_matrix(k):
+    return [[COS[k], SIN[k], 0], [-1 * SIN[k], COS[k], 0], [0, 0, 1]]
+
+# generating all 24 rotations by repeatedly applying quarter turns to the identity until no new rotation is found
+ROTATIONS = [quarter_x_matrix(0)]
+GENERATORS = [quarter_x_matrix(1), quarter_y_matrix(1), quarter_z_matrix(1)]
+index = 0
+
+while index < len(ROTATIONS):
+
+    for g in GENERATORS:
+        m = matrix_mul(ROTATIONS[index], g)
+
+        if m not in ROTATIONS:
+            ROTATIONS.append(m)
+
+    index += 1
+
+# composition and inverse lookup tables, where the 576 multiplications of the composition table are only done once and then loaded from disk
+COMPOSE_TABLE = load_or_build("rotation_compose", "B", lambda: [ROTATIONS.index(matrix_mul(a, b)) for a in ROTATIONS for b in ROTATIONS])
+COMPOSE = [COMPOSE_TABLE[a * 24:(a + 1) * 24].tolist() for a in range(24)]
+INVERSE = [row.index(0) for row in COMPOSE]
+
+# the index of every (axis, k) quarter turn rotation
+QUARTER_TURNS = {}
+
+for k in range(4):
+    QUARTER_TURNS[("x", k)] = ROTATIONS.index(quarter_x_matrix(k))
+    QUARTER_TURNS[("y", k)] = ROTATIONS.index(quarter_y_matrix(k))
+    QUARTER_TURNS[("z", k)] = ROTATIONS.index(quarter_z_matrix(k))
+
+# the color facing axis j ends up facing the axis c where matrix[c][j] is not 0, so new_colors[c] = colors[j]
+COLOR_ORDERS = []
+
+for m in ROTATIONS:
+    order = [0, 0, 0]
+
+    for c in range(3):
+
+        for j in range(3):
+
+            if m[c][j] != 0:
+                order[c] = j
+
+    COLOR_ORDERS.append(tuple(order))
+
+# returns the index of the rotation of an angle about an axis
+def rotation_index(axis, angle, units = "radians"):
+
+    if (axis, 0) not in QUARTER_TURNS:
+        raise Exception("Inputted an invalid axis")
+
+    return QUARTER_TURNS[(axis, quarter_turns(angle, units))]
+
+# the rotate matrix functions return a new matrix on every call, so a caller that changes it can't change ROTATIONS
 def rotate_x_matrix(angle):
-    return [[1, 0, 0], [0, int(cos(angle)), int(sin(angle))],[0, -1 * int(sin(angle)), int(cos(angle))]]
+    return [list(column) for column in ROTATIONS[QUARTER_TURNS[("x", quarter_turns(angle))]]]
 
 def rotate_y_matrix(angle):
-    return [[int(cos(angle)), 0, -1 * int(sin(angle))], [0, 1, 0], [int(sin(angle)), 0, int(cos(angle))]]
+    return [list(column) for column in ROTATIONS[QUARTER_TURNS[("y", quarter_turns(angle))]]]
 
 def rotate_z_matrix(angle):
-    return [[int(cos(angle)), int(sin(angle)), 0], [-1 * int(sin(angle)), int(cos(angle)), 0], [0, 0, 1]]
+    return [list(column) for column in ROTATIONS[QUARTER_TURNS[("z", quarter_turns(angle))]]]
@@ -13,9 +13,70 @@ RubiksCube
 
 """
 
-from math import pi
 from Matrix import matrix_mul
-from RotationMatrices import rotate_x_matrix, rotate_y_matrix, rotate_z_matrix
+from RotationMatrices import COLOR_ORDERS, ROTATIONS, quarter_turns, rotation_index
+from Cubies import CubieCube, ENCODED_BYTES
+from operator import itemgetter
+from MoveTables import AXES, FACES, FRONT_POSITIONS, LAYER_POSITIONS, MOVE_FACES, MOVE_IDS, PERMS, PIECE_STICKERS, apply_move, compose
+from Notation import compile_algorithm
+
+# the color of every face when the cube is solved
+FACE_COLORS = {"U": "white", "R": "red", "F": "green", "D": "yellow", "L": "orange", "B": "blue"}
+
+# colors are stored as small integer codes, where the code of a face's color is the index of the face in FACES and "empty" comes last
+COLORS = tuple([FACE_COLORS[face] for face in FACES]) + ("empty",)
+COLOR_CODES = {}
+
+for n in range(len(COLORS)):
+    COLOR_CODES[COLORS[n]] = n
+
+# the stickers of a solved cube
+SOLVED_STICKERS = bytes([n for n in range(len(FACES)) for s in range(9)])
+
+# the first letter of every color code, as a table for bytes.translate
+COLOR_LETTERS = bytes([ord(color[0]) for color in COLORS]).ljust(256, b"?")
+
+# the letter of the face whose color every color code is, as a table for bytes.translate, so a cube can be written as a facelet string such as "UUUUUUUUURRR..."
+FACELET_LETTERS = FACES.encode().ljust(256, b"?")
+
+# the color code of every face letter, as a table for bytes.translate that turns every other byte into 255
+FACELET_CODES = bytearray(b"\xff" * 256)
+
+for n in range(len(FACES)):
+    FACELET_CODES[ord(FACES[n])] = n
+
+FACELET_CODES = bytes(FACELET_CODES)
+
+# the indices of the 9 stickers of every face in the order get_face() reads them, which is how the face looks when the entire cube is turned until the face is at the front
+# the top, back, and bottom faces are reached by turning about x and the left and right faces by turning about y, as print_cube() always has
+FACE_VIEWS = []
+
+for turns in ((), ("x",), ("x", "x"), ("x", "x", "x"), ("y",), ("y", "y", "y")):
+    p = tuple(range(54))
+
+    for axis in turns:
+        p = compose(p, PERMS[MOVE_IDS[(axis, None, 1)]])
+
+    FACE_VIEWS.append(itemgetter(*[p[FACES.index("F") * 9 + i] for i in range(9)]))
+
+# the faces in the order of FACE_VIEWS, and the bit of every face in Cube.dirty
+VIEW_FACES = "FUBDLR"
+FACE_BITS = [1 << FACES.index(face) for face in VIEW_FACES]
+ALL_FACES = (1 << len(FACES)) - 1
+
+# the positions of all 26 pieces: 8 corner pieces, 12 side pieces, and 6 face pieces
+PIECE_POSITIONS = []
+
+for n in (3, 2, 1):
+
+    for x in (1, 0, -1):
+
+        for y in (1, 0, -1):
+
+            for z in (1, 0, -1):
+
+                if abs(x) + abs(y) + abs(z) == n:
+                    PIECE_POSITIONS.append((x, y, z))
 
 """
 Piece Class
@@ -24,36 +85,32 @@ Piece Class
 
 class Piece:
 
+    # __slots__ keeps every piece down to its position and a 3 byte string of color codes
+    __slots__ = ("pos", "codes")
+
     def __init__(self, pos, colors):
         self.pos = pos
         self.colors = colors
 
-    # rotates a piece by multiplying the position matrix by a rotation matrix and swapping the color values that are NOT on the axis of rotation
-    def rotate(self, axis, angle):
-        
-        # swapping colors is only necessary when the angle of rotation is not a multiple of an 180 degree or pi radians rotation 
-        swap = not (angle / pi).is_integer()  
-
-        if axis == "x":
-            self.pos = matrix_mul(self.pos, rotate_x_matrix(angle))
-
-            if swap:
-                self.colors = [self.x_color(), self.z_color(), self.y_color()]
+    # the names of the (x, y, z) colors of the piece
+    @property
+    def colors(self):
+        return [COLORS[c] for c in self.codes]
 
-        elif axis == "y":
-            self.pos = matrix_mul(self.pos, rotate_y_matrix(angle))
+    @colors.setter
+    def colors(self, colors):
+        self.codes = bytes([COLOR_CODES[c] for c in colors])
 
-            if swap:
-                self.colors = [self.z_color(), self.y_color(), self.x_color()]
+    # rotates a piece by multiplying the position matrix by a rotation matrix and reordering the colors that are NOT on the axis of rotation
+    def rotate(self, axis, angle, units = "radians"):
+        self.apply_rotation(rotation_index(axis, angle, units))
 
-        elif axis == "z":
-            self.pos = matrix_mul(self.pos, rotate_z_matrix(angle))
+    # rotates a piece by one of the 24 precomputed rotations of the RotationMatrices module
+    def apply_rotation(self, r):
 
-            if swap:
-                self.colors = [self.y_color(), self.x_color(), self.z_color()]
-
-        else:
-            Exception("Inputted an invalid axis") 
+        order = COLOR_ORDERS[r]
+        self.pos = matrix_mul(self.pos, ROTATIONS[r])
+        self.codes = bytes([self.codes[order[0]], self.codes[order[1]], self.codes[order[2]]])
 
     # needs to be indexed twice as the self.pos is a matrix, which is implemented by a two-dimensional list
     def x(self):
@@ -66,13 +123,13 @@ class Piece:
         return self.pos[2][0]
     
     def x_color(self):
-        return self.colors[0]
+        return COLORS[self.codes[0]]
     
     def y_color(self):
-        return self.colors[1]
+        return COLORS[self.codes[1]]
     
     def z_color(self):
-        return self.colors[2]
+        return COLORS[self.codes[2]]
     
     # lists out important information of a piece
     def print_info(self):
@@ -82,242 +139,294 @@ class Piece:
 
 
 # a rubiks cube has 6 faces, 8 corner pieces, 12 side pieces, and 6 faces pieces
+# the state of the cube is 54 bytes of sticker color codes laid out as described in the MoveTables module, and every move is a precomputed permutation of it
+# the stickers are immutable bytes, so copying a cube shares them and a cube can be hashed and compared by its stickers
+# the hash of a cube changes whenever it is rotated, so a cube shouldn't be rotated while it is being used as a key of a set or dictionary
+# faces read by get_face() are cached, and self.dirty has the bit of every face (1 << FACES.index(face)) whose cache is out of date
+# the stickers should only be changed through init_cube(), apply_move(), and apply_algorithm(), which keep the dirty bits up to date
 class Cube:
 
+    __slots__ = ("stickers", "faces", "dirty")
+
     def __init__(self):
-        self.pieces = []
         self.init_cube()
 
-    # manually adding all the pieces of the cube
+    # puts every sticker back on its solved face
     def init_cube(self):
 
-        # corner pieces
-        self.pieces.append(Piece([[1],[1],[1]], ["red","white","blue"]))
-        self.pieces.append(Piece([[1],[1],[-1]], ["red","white","green"]))
-        self.pieces.append(Piece([[1],[-1],[1]], ["red","yellow","blue"]))
-        self.pieces.append(Piece([[1],[-1],[-1]], ["red","yellow","green"]))
-        self.pieces.append(Piece([[-1],[1],[1]], ["orange","white","blue"]))
-        self.pieces.append(Piece([[-1],[1],[-1]], ["orange","white","green"]))
-        self.pieces.append(Piece([[-1],[-1],[1]], ["orange","yellow","blue"]))
-        self.pieces.append(Piece([[-1],[-1],[-1]], ["orange","yellow","green"]))
-
-        # side pieces
-        self.pieces.append(Piece([[0],[1],[-1]], ["empty","white","green"]))
-        self.pieces.append(Piece([[0],[-1],[-1]], ["empty","yellow","green"]))
-        self.pieces.append(Piece([[0],[1],[1]], ["empty","white","blue"]))
-        self.pieces.append(Piece([[0],[-1],[1]], ["empty","yellow","blue"]))
-        self.pieces.append(Piece([[1],[0],[-1]], ["red","empty","green"]))
-        self.pieces.append(Piece([[-1],[0],[-1]], ["orange","empty","green"]))
-        self.pieces.append(Piece([[1],[0],[1]], ["red","empty","blue"]))
-        self.pieces.append(Piece([[-1],[0],[1]], ["orange","empty","blue"]))
-        self.pieces.append(Piece([[1],[1],[0]], ["red","white","empty"]))
-        self.pieces.append(Piece([[1],[-1],[0]], ["red","yellow","empty"]))
-        self.pieces.append(Piece([[-1],[1],[0]], ["orange","white","empty"]))
-        self.pieces.append(Piece([[-1],[-1],[0]], ["orange","yellow","empty"]))
-
-        # face pieces
-        self.pieces.append(Piece([[0],[0],[1]], ["empty","empty","blue"]))
-        self.pieces.append(Piece([[0],[0],[-1]], ["empty","empty","green"]))
-        self.pieces.append(Piece([[1],[0],[0]], ["red","empty","empty"]))
-        self.pieces.append(Piece([[-1],[0],[0]], ["orange","empty","empty"]))
-        self.pieces.append(Piece([[0],[1],[0]], ["empty","white","empty"]))
-        self.pieces.append(Piece([[0],[-1],[0]], ["empty","yellow","empty"]))
+        self.stickers = SOLVED_STICKERS
+        self.faces = [None] * len(FACES)
+        self.dirty = ALL_FACES
 
-    # prints the face of the cube that is at z = -1
-    def print_face(self):
+    # builds a cube out of the 54 bytes returned by key()
+    @classmethod
+    def from_key(cls, key):
 
-        # ordering the pieces into their proper positions as self.pieces is unordered
-        face = [[0,0,0],[0,0,0],[0,0,0]]
-        index = 0
-        n = 0
+        cube = cls.__new__(cls)
+        cube.set_key(key)
+        return cube
 
-        while n != 9:
-            curr_piece = self.pieces[index]
+    # puts the cube in the state of the 54 bytes returned by key()
+    def set_key(self, key):
 
-            if curr_piece.z() == -1:
-                col_index = curr_piece.x() + 1
-                row_index = curr_piece.y() * -1 + 1
-                face[col_index][row_index] = curr_piece.z_color()
-                n += 1
- 
-            index += 1
+        if len(key) != 54:
+            raise Exception("A cube key must be 54 bytes long")
 
-        # prints out the "front" face of a rubiks cube in a formatted way
-        print("Rubik's Cube:")
+        self.stickers = bytes(key)
+        self.faces = [None] * len(FACES)
+        self.dirty = ALL_FACES
 
-        for r in range(3):
-            print("----------------------------")
-            print("|        |        |        |")
-            line = "|"
+    # the state of the cube as 54 bytes
+    def key(self):
+        return self.stickers
 
-            for c in range(3):
-                curr_piece_color = face[c][r]
-                num_spaces = 7 - len(curr_piece_color)
-                line += " " + curr_piece_color
+    # the state of the cube as a string of 54 face letters in the order of the stickers (the facelet string of Kociemba's solvers)
+    def facelets(self):
+        return self.stickers.translate(FACELET_LETTERS).decode()
 
-                for n in range(num_spaces):
-                    line += " "
+    # builds a cube out of a facelet string such as the one returned by facelets(), refusing strings that aren't a solvable cube
+    @classmethod
+    def from_facelets(cls, facelets):
 
-                line += "|"
+        stickers = facelets.strip().encode().translate(FACELET_CODES)
 
-            print(line)
-            print("|        |        |        |")
-            
-        print("----------------------------")
+        if len(stickers) != 54 or 255 in stickers:
+            raise Exception("A facelet string must be 54 of the letters " + FACES)
 
-    # prints out all faces of the rubix cube in a format that is simpler than print_face()
-    def print_cube(self):
-            
-        # gets all faces of the rubiks cube by saving the front state of the cube and rotating it to access all sides
-        front = self.get_face()
-        self.turn("x", 90, "degrees")
-        top = self.get_face()
-        self.turn("x", 90, "degrees")
-        back = self.get_face()
-        self.turn("x", 90, "degrees")
-        bottom = self.get_face()
-        self.turn("x", 90, "degrees")
-        self.turn("y", 90, "degrees")
-        left = self.get_face()
-        self.turn("y", 180, "degrees")
-        right = self.get_face()
-        self.turn("y", 90, "degrees")
+        # reading the pieces refuses stickers that don't make up real pieces
+        if not CubieCube.from_stickers(stickers).is_solvable():
+            raise Exception("The provided facelets are not a solvable cube")
 
-        # printing the top row (includes a space and the top face)
-        print("Rubik's Cube:")
-        line = ""
-        print("        ---------")
+        return cls.from_key(stickers)
 
-        for r in range(3):
+    # the canonical integer of the state, built from the standard corner and side coordinates of the Cubies module
+    def encode(self):
+        return CubieCube.from_stickers(self.stickers).encode()
 
-            line += "        "
-            line += "| "
+    # the canonical integer as a fixed width key of ENCODED_BYTES (9) bytes
+    def compact_key(self):
+        return self.encode().to_bytes(ENCODED_BYTES, "big")
 
-            for c in range(3):
-                line += top[c][r] + " " 
+    # the 54 bytes of the representative of the symmetry class of the state (see the Symmetry module), which is the same for every state in the class
+    # only the 24 ways of holding the cube are used when mirrors is False
+    # the Symmetry module builds its tables when it is first imported, so it is only imported by the first cube that needs it
+    def canonical_key(self, mirrors = True):
 
-            line += "| "
-            print(line)
-            line = ""
+        from Symmetry import canonical_stickers
+        return canonical_stickers(self.stickers, mirrors)
 
-        print("---------------------------------")
-        line = ""
-        
-        # printing the middle row (includes the left, front, right, and back faces)
-        for r in range(3):
-            line += "| "
+    # the number of different states that are the same as this one up to symmetry, including this one
+    def symmetry_class_size(self, mirrors = True):
 
-            for c in range(3):
-                line += left[c][r] + " "
+        from Symmetry import class_size
+        return class_size(self.stickers, mirrors)
 
-            line += "| "
-            
-            for c in range(3):
-                line += front[c][r] + " "
+    # builds a cube out of either the integer returned by encode() or the bytes returned by compact_key()
+    @classmethod
+    def decode(cls, value):
 
-            line += "| "
+        if isinstance(value, (bytes, bytearray)):
+            value = int.from_bytes(value, "big")
 
-            for c in range(3):
-                line += right[c][r] + " "
+        return cls.from_key(CubieCube.decode(value).to_stickers())
 
-            line += "| "
+    # the copy keeps the cached faces, as they are immutable
+    def copy(self):
 
-            for c in range(3):
-                line += back[c][r] + " "
-                
-            line += "| "
-            print(line)
-            line = ""
-
-        print("---------------------------------")
-        
-        # printing the last row (includes a space and the bottom face)
-        line = ""
-        for r in range(3):
-            line += "        "
-            line += "| "
+        cube = Cube.from_key(self.stickers)
+        cube.faces = list(self.faces)
+        cube.dirty = self.dirty
+        return cube
 
-            for c in range(3):
-                line += bottom[c][r] + " " 
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __eq__(self, other):
+
+        if not isinstance(other, Cube):
+            return NotImplemented
+
+        return self.stickers == other.stickers
 
-            line += "| "   
-            print(line)    
-            line = "" 
+    def __hash__(self):
+        return hash(self.stickers)
 
-        print("        ---------")
+    # all 26 pieces of the cube, built from the stickers
+    # the pieces are copies, so changing them does not change the cube
+    @property
+    def pieces(self):
+        return [self.get_piece(pos) for pos in PIECE_POSITIONS]
 
-    # returns the front face of the cube as a two dimensional list
-    def get_face(self):
+    # returns a copy of the piece at a position
+    def get_piece(self, pos):
 
+        colors = []
+
+        for s in PIECE_STICKERS[pos]:
+
+            if s is None:
+                colors.append("empty")
+
+            else:
+                colors.append(COLORS[self.stickers[s]])
+
+        return Piece([[pos[0]], [pos[1]], [pos[2]]], colors)
+
+    # returns copies of the 9 pieces of the 3 x 3 portion of the cube at a coordinate value of an axis
+    def get_layer(self, axis, layer):
+        return [self.get_piece(pos) for pos in LAYER_POSITIONS[(axis, layer)]]
+
+    # applies one of the moves of the MoveTables module
+    def apply_move(self, move):
+        self.stickers = apply_move(self.stickers, move)
+        self.dirty |= MOVE_FACES[move]
+
+    # applies a whole algorithm at once, given as notation such as "R U R' U'", a list of move ids, or a compiled Notation.Algorithm
+    def apply_algorithm(self, algorithm):
+
+        algorithm = compile_algorithm(algorithm)
+        self.stickers = algorithm.apply(self.stickers)
+        self.dirty |= algorithm.faces
+
+    # returns the lines of the face of the cube that is at z = -1, drawn in a formatted way
+    def face_lines(self):
+
+        # ordering the front stickers into their proper positions
         face = [[],[],[]]
-        index = 1
+        front = FACES.index("F") * 9
 
         for r in range(3):
 
             for c in range(3):
-                face[c].append(self.get_face_piece(index).z_color()[0])
-                index += 1
+                face[c].append(COLORS[self.stickers[front + r * 3 + c]])
 
-        return face
+        lines = ["Rubik's Cube:"]
 
-    # used to retrieve pieces from the front face based on number between 1 through 9
-    def get_face_piece(self, piece_num):
+        for r in range(3):
+            lines.append("----------------------------")
+            lines.append("|        |        |        |")
+            lines.append("|" + "".join([" " + face[c][r].ljust(7) + "|" for c in range(3)]))
+            lines.append("|        |        |        |")
+
+        lines.append("----------------------------")
+        return lines
+
+    # prints the face of the cube that is at z = -1
+    def print_face(self):
+        print("\n".join(self.face_lines()))
+
+    # returns the lines of all faces of the rubix cube in a format that is simpler than face_lines()
+    def cube_lines(self):
+
+        # reads all faces without turning the cube, only recomputing the faces changed since the last time
+        front, top, back, bottom, left, right = self.get_faces()
+
+        # printing the top row (includes a space and the top face)
+        lines = ["Rubik's Cube:", "        ---------"]
+
+        for r in range(3):
+            lines.append("        | " + "".join([top[c][r] + " " for c in range(3)]) + "| ")
+
+        lines.append("---------------------------------")
+
+        # printing the middle row (includes the left, front, right, and back faces)
+        for r in range(3):
+            line = "| "
 
-        if piece_num == 1:
+            for face in (left, front, right, back):
+                line += "".join([face[c][r] + " " for c in range(3)]) + "| "
 
-            pos = (-1, 1)
+            lines.append(line)
 
-        elif piece_num == 2:
-            pos = (0, 1)
+        lines.append("---------------------------------")
 
-        elif piece_num == 3:
-            pos = (1, 1)
+        # printing the last row (includes a space and the bottom face)
+        for r in range(3):
+            lines.append("        | " + "".join([bottom[c][r] + " " for c in range(3)]) + "| ")
 
-        elif piece_num == 4:
-            pos = (-1, 0)
-            
-        elif piece_num == 5:
-            pos = (0, 0)
+        lines.append("        ---------")
+        return lines
+
+    # prints out all faces of the rubix cube in a format that is simpler than print_face()
+    def print_cube(self):
+        print("\n".join(self.cube_lines()))
 
-        elif piece_num == 6:
-            pos = (1, 0)
+    # returns the face at the front of the cube after the entire cube is turned so that the view-th face of VIEW_FACES is at the front
+    # the face is 3 strings, one per column, so face[c][r] is the first letter of the color at column c and row r
+    def read_face(self, view):
+        return tuple([bytes(FACE_VIEWS[view](self.stickers)).translate(COLOR_LETTERS).decode()[c::3] for c in range(3)])
 
-        elif piece_num == 7:
-            pos = (-1, -1)
+    # returns all 6 faces in the order of VIEW_FACES (front, top, back, bottom, left, right), each as read by get_face()
+    def get_faces(self):
 
-        elif piece_num == 8:
-            pos = (0, -1)
+        if self.dirty:
 
-        elif piece_num == 9:
-            pos = (1, -1)
+            for view in range(6):
 
-        for p in self.pieces:
+                if self.dirty & FACE_BITS[view]:
+                    self.faces[view] = self.read_face(view)
 
-            p_pos = (p.x(), p.y())
+            self.dirty = 0
 
-            if p_pos == pos and p.z() == -1:
-                return p    
+        return tuple(self.faces)
+
+    # returns a face of the cube without turning it (the front face by default), as it looks when the entire cube is turned until that face is at the front
+    # the face is indexed as face[c][r] and is cached until a move changes it, so it shouldn't be changed by the caller
+    def get_face(self, face = "F"):
+
+        view = VIEW_FACES.index(face)
+
+        if self.dirty & FACE_BITS[view]:
+            self.faces[view] = self.read_face(view)
+            self.dirty &= ~FACE_BITS[view]
+
+        return self.faces[view]
+
+    # used to retrieve pieces from the front face based on number between 1 through 9
+    def get_face_piece(self, piece_num):
+        return self.get_piece(FRONT_POSITIONS[piece_num - 1])
 
     # rotates a 3 x 3 portion of the cube
     def rotate(self, piece, axis, angle, units = "radians"):
 
-        # converting degrees to radians
-        if units != "radians":
-            angle = angle / 180 * pi
+        # rotating only the layer that shares the same axis value (based on the axis of rotation) as the chosen piece
+        if axis == "x":
+            layer = piece.x()
+
+        elif axis == "y":
+            layer = piece.y()
+
+        elif axis == "z":
+            layer = piece.z()
+
+        else:
+            raise Exception("Inputted an invalid axis")
+
+        k = quarter_turns(angle, units)
 
-        # rotating only the pieces that share the same axis value (based on the axis of rotation) as the chosen piece
-        for p in self.pieces:   
-            
-            if (axis == "x" and piece.x() == p.x()) or (axis == "y" and piece.y() == p.y()) or (axis == "z" and piece.z() == p.z()):
-                p.rotate(axis, angle)
+        # returns the id of the move that was applied, or None when the angle is a multiple of 360 degrees
+        if k == 0:
+            return None
+
+        move = MOVE_IDS[(axis, layer, k)]
+        self.apply_move(move)
+        return move
 
     # rotates all pieces in the cube
     def turn(self, axis, angle, units = "radians"):
 
-        # converting degrees to radians
-        if units != "radians":
-            angle = angle / 180 * pi
+        if axis not in AXES:
+            raise Exception("Inputted an invalid axis")
+
+        k = quarter_turns(angle, units)
+
+        # rotating every single piece of the cube, returning the id of the move like rotate()
+        if k == 0:
+            return None
 
-        # rotating every single piece of the cube
-        for x in self.pieces:
-            x.rotate(axis, angle)
+        move = MOVE_IDS[(axis, None, k)]
+        self.apply_move(move)
+        return move
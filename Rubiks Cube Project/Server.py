@@ -0,0 +1,370 @@
+"""
+Server
+
+- A program that serves many rubiks cubes at once to clients over TCP or a Unix socket, all in one process with asyncio
+- Every cube is a session with its own Cube and MoveJournal, kept in a SessionStore by a random session id
+    the store holds at most max_sessions sessions, forgetting the least recently used one to make room for a new one
+    and sessions that haven't been used for idle_timeout seconds are forgotten by a sweep that runs in the background
+    the store is ordered by last use, so both kinds of eviction only ever look at the sessions that are being forgotten
+    the history of every session keeps at most HISTORY_LIMIT moves, forgetting the oldest moves past that
+- Every command runs inside the event loop, so a command is limited to a fixed amount of work and can't hold up the other sessions for long
+    a line is at most LINE_LIMIT bytes, and a longer line is answered with an error and thrown away without closing the connection
+    moves and scramble are at most COMMAND_MOVE_LIMIT moves, counting every repeat of a group
+- The protocol is one command per line, answered by one line per command in the same order, so a client can send many commands without waiting for the answers
+    an answer is either "ok" followed by the result of the command, or "error: " followed by what went wrong, like the headless mode of PlayRubiksCube
+- Commands:
+    new - starts a new solved session and uses it, answering with its id
+    open ID - uses an existing session, which any connection can do as long as it knows the id
+    moves MOVES - applies moves written in standard notation (see the Notation module), answering with the number of moves applied
+    scramble [number of moves] [seed] - scrambles the cube like the headless mode of PlayRubiksCube and forgets the history of the session
+    state [facelets|key] - answers with the state of the cube as a facelet string or as the compact key in hex
+    solved - answers with "yes" when every face of the cube is a single color and "no" otherwise
+    undo, redo - takes back or makes again the last move, answering with "yes" when there was a move to take back or make again
+    reset - puts the cube back to solved and forgets the history of the session
+    close - forgets the session
+    ping - answers with "ok pong"
+    stats - answers with the number of sessions, sessions evicted, connections, and commands
+    quit - closes the connection, which doesn't forget the session
+- Usage:
+    python Server.py [--host 127.0.0.1] [--port 8765] [--unix path] [--max-sessions 10000] [--idle-timeout 600]
+
+"""
+
+import argparse
+import asyncio
+import random
+import secrets
+from collections import OrderedDict
+from time import monotonic
+from Commands import format_state, scramble_cube
+from Journal import MoveJournal
+from Notation import parse, simplify
+from RubiksCube import Cube
+
+# the longest line a client may send, in bytes
+LINE_LIMIT = 65536
+
+# the most moves a single moves or scramble command may make
+COMMAND_MOVE_LIMIT = 10000
+
+# the most moves the history of a session keeps for undo and redo
+HISTORY_LIMIT = 10000
+
+
+class Session:
+
+    __slots__ = ("cube", "journal", "last_used")
+
+    def __init__(self):
+
+        self.cube = Cube()
+        self.journal = MoveJournal(self.cube, max_moves = HISTORY_LIMIT)
+        self.last_used = monotonic()
+
+
+class SessionStore:
+
+    def __init__(self, max_sessions = 10000, idle_timeout = 600):
+
+        if max_sessions < 1:
+            raise Exception("The store must be able to hold at least 1 session")
+
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+
+        # the sessions by id, from the least recently used to the most recently used
+        self.sessions = OrderedDict()
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.sessions)
+
+    # starts a new session, forgetting the least recently used session when the store is full, and returns its id
+    def create(self):
+
+        while len(self.sessions) >= self.max_sessions:
+            self.sessions.popitem(last = False)
+            self.evicted += 1
+
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = Session()
+        return session_id
+
+    # returns the session of an id and marks it as used, or None when there is no such session
+    def get(self, session_id):
+
+        session = self.sessions.get(session_id)
+
+        if session is not None:
+            session.last_used = monotonic()
+            self.sessions.move_to_end(session_id)
+
+        return session
+
+    def remove(self, session_id):
+        return self.sessions.pop(session_id, None) is not None
+
+    # forgets every session that hasn't been used for idle_timeout seconds, returning how many were forgotten
+    def evict_idle(self, now = None):
+
+        now = monotonic() if now is None else now
+        count = 0
+
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+
+            if now - session.last_used < self.idle_timeout:
+                break
+
+            del self.sessions[session_id]
+            count += 1
+
+        self.evicted += count
+        return count
+
+
+# the state of a single client connection, which is only the session it is using
+class Connection:
+
+    __slots__ = ("session_id", "open")
+
+    def __init__(self):
+        self.session_id = None
+        self.open = True
+
+
+class CubeServer:
+
+    def __init__(self, max_sessions = 10000, idle_timeout = 600):
+
+        self.store = SessionStore(max_sessions, idle_timeout)
+        self.connections = 0
+        self.commands = 0
+        self.rng = random.Random()
+        self.sweeper = None
+
+    # returns the session a connection is using, raising an exception when it has none or it was forgotten
+    def session(self, connection):
+
+        if connection.session_id is None:
+            raise Exception("No session is being used, start one with new or open one with open")
+
+        session = self.store.get(connection.session_id)
+
+        if session is None:
+            connection.session_id = None
+            raise Exception("The session was closed or forgotten after being idle")
+
+        return session
+
+    # runs a single command line for a connection and returns the line that answers it (without the newline)
+    def execute(self, connection, line):
+
+        self.commands += 1
+        words = line.split()
+
+        if not words:
+            return "error: Empty command"
+
+        command = words[0].lower()
+
+        try:
+
+            if command == "new":
+                connection.session_id = self.store.create()
+                return "ok " + connection.session_id
+
+            elif command == "open":
+
+                if len(words) != 2 or self.store.get(words[1]) is None:
+                    raise Exception("There is no session with that id")
+
+                connection.session_id = words[1]
+                return "ok " + words[1]
+
+            elif command == "moves":
+                session = self.session(connection)
+
+                # every line is usually different, so its moves are applied one at a time instead of being compiled and cached
+                moves = simplify(parse(line.split(None, 1)[1] if len(words) > 1 else "", COMMAND_MOVE_LIMIT))
+
+                for move in moves:
+                    session.journal.apply_move(move)
+
+                return "ok " + str(len(moves))
+
+            elif command == "scramble":
+                session = self.session(connection)
+                scramble_cube(session.cube, words, self.rng, COMMAND_MOVE_LIMIT)
+                session.journal.clear()
+                return "ok"
+
+            elif command == "state":
+                session = self.session(connection)
+                state_format = words[1] if len(words) > 1 else "facelets"
+
+                if state_format not in ("facelets", "key"):
+                    raise Exception("Unknown state format " + state_format + ", expected facelets or key")
+
+                return "ok " + format_state(session.cube, state_format)
+
+            elif command == "solved":
+                stickers = self.session(connection).cube.stickers
+                solved = all([stickers.count(stickers[f * 9], f * 9, f * 9 + 9) == 9 for f in range(6)])
+                return "ok yes" if solved else "ok no"
+
+            elif command == "undo":
+                return "ok yes" if self.session(connection).journal.undo() else "ok no"
+
+            elif command == "redo":
+                return "ok yes" if self.session(connection).journal.redo() else "ok no"
+
+            elif command == "reset":
+                session = self.session(connection)
+                session.cube.init_cube()
+                session.journal.clear()
+                return "ok"
+
+            elif command == "close":
+                self.session(connection)
+                self.store.remove(connection.session_id)
+                connection.session_id = None
+                return "ok"
+
+            elif command == "ping":
+                return "ok pong"
+
+            elif command == "stats":
+                return "ok sessions=" + str(len(self.store)) + " evicted=" + str(self.store.evicted) + " connections=" + str(self.connections) + " commands=" + str(self.commands)
+
+            elif command == "quit":
+                connection.open = False
+                return "ok"
+
+            else:
+                raise Exception("Unknown command " + command)
+
+        except Exception as error:
+            return "error: " + str(error)
+
+    # answers the commands of one client until it quits or disconnects
+    async def handle(self, reader, writer):
+
+        self.connections += 1
+        connection = Connection()
+        pending = b""
+
+        # whether the rest of a line that was too long is still being thrown away
+        skipping = False
+
+        try:
+
+            while connection.open:
+                data = await reader.read(LINE_LIMIT)
+
+                # a last command without a newline is still answered when the client stops sending
+                if not data:
+
+                    if pending.strip():
+                        writer.write((self.execute(connection, pending.decode(errors = "replace")) + "\n").encode())
+
+                    break
+
+                if skipping:
+                    end = data.find(b"\n")
+
+                    if end < 0:
+                        continue
+
+                    data = data[end + 1:]
+                    skipping = False
+
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+
+                # every command that arrived together is answered together in a single write, so pipelined commands cost one write per batch
+                answers = []
+
+                for line in lines:
+
+                    if len(line) > LINE_LIMIT:
+                        answers.append("error: Line too long\n")
+
+                    else:
+                        answers.append(self.execute(connection, line.decode(errors = "replace")) + "\n")
+
+                    if not connection.open:
+                        break
+
+                # a line that is already too long before its newline is answered now, and the rest of it is thrown away as it arrives
+                if connection.open and len(pending) > LINE_LIMIT:
+                    answers.append("error: Line too long\n")
+                    pending = b""
+                    skipping = True
+
+                writer.write("".join(answers).encode())
+                await writer.drain()
+
+            await writer.drain()
+
+        except ConnectionError:
+            pass
+
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    # forgets idle sessions every so often for as long as the server runs
+    async def sweep(self):
+
+        while True:
+            await asyncio.sleep(max(1, self.store.idle_timeout / 4))
+            self.store.evict_idle()
+
+    # starts listening on a Unix socket when a path is given, and on a TCP port otherwise, returning the asyncio server
+    async def start(self, host = "127.0.0.1", port = 8765, path = None):
+
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path)
+
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+
+        # a server listening on both a port and a socket still only needs one sweep
+        if self.sweeper is None:
+            self.sweeper = asyncio.ensure_future(self.sweep())
+
+        return server
+
+    async def serve_forever(self, host = "127.0.0.1", port = 8765, path = None):
+
+        server = await self.start(host, port, path)
+
+        try:
+
+            async with server:
+                await server.serve_forever()
+
+        finally:
+            self.sweeper.cancel()
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Serve many rubiks cubes at once over a line protocol")
+    parser.add_argument("--host", default = "127.0.0.1", help = "address to listen on")
+    parser.add_argument("--port", type = int, default = 8765, help = "TCP port to listen on")
+    parser.add_argument("--unix", default = None, help = "path of a Unix socket to listen on instead of a TCP port")
+    parser.add_argument("--max-sessions", type = int, default = 10000, help = "most sessions kept at once")
+    parser.add_argument("--idle-timeout", type = float, default = 600, help = "seconds a session is kept without being used")
+    args = parser.parse_args(argv)
+
+    server = CubeServer(args.max_sessions, args.idle_timeout)
+
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
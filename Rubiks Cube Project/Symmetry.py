@@ -0,0 +1,115 @@
+"""
+Symmetry
+
+- A helper module that maps every state of the cube to a single representative of its symmetry class, so caches and tables keyed on the representative hold up to 48 times fewer states
+- A symmetry is one of the 24 ways of holding the cube (MoveTables.ROTATION_PERMS), optionally followed by the mirror that swaps the left and right of the cube, for 48 in total
+    symmetries 0 to 23 are the rotations, in the order of ROTATION_PERMS, and symmetry s + 24 is rotation s followed by the mirror
+- The conjugate of a state by a symmetry is the state seen through the symmetry: the stickers are moved by the symmetry and then recolored so the solved cube stays solved
+    conjugating never changes how many moves a state is from solved, as every move of a state becomes a move of its conjugate (see MOVE_CONJUGATES)
+    and both a state and all its conjugates are either solvable or not
+- The representative of a state is its conjugate with the smallest stickers, and its symmetry class is the set of all its different conjugates
+- Conjugation tables:
+    SYMMETRY_GETTERS[s] and SYMMETRY_COLORS[s] move and recolor the stickers for symmetry s (an itemgetter and a table for bytes.translate)
+    SYMMETRY_MULTIPLY[a][b] is the symmetry of conjugating by a and then by b, and SYMMETRY_INVERSE[s] is the symmetry that undoes s
+    MOVE_CONJUGATES[s][m] is the move that move m becomes in the conjugate by symmetry s, so conjugate(apply_move(stickers, m), s) is apply_move(conjugate(stickers, s), MOVE_CONJUGATES[s][m])
+
+"""
+
+from operator import itemgetter
+from MoveTables import MOVES, PERMS, ROTATION_PERMS, STICKERS, STICKER_INDEX, compose
+from Tables import load_or_build
+
+NUM_ROTATIONS = len(ROTATION_PERMS)
+
+# the mirror that swaps the left and right of the cube, which keeps every sticker on the same axis
+MIRROR_PERM = tuple([STICKER_INDEX[((-pos[0], pos[1], pos[2]), axis)] for pos, axis in STICKERS])
+
+SYMMETRY_PERMS = list(ROTATION_PERMS) + [compose(p, MIRROR_PERM) for p in ROTATION_PERMS]
+SYMMETRY_GETTERS = [itemgetter(*p) for p in SYMMETRY_PERMS]
+NUM_SYMMETRIES = len(SYMMETRY_PERMS)
+
+# the stickers of only the U face of every conjugate, which settle which conjugates can be the smallest before any conjugate is built in full
+PREFIX_GETTERS = [itemgetter(*p[:9]) for p in SYMMETRY_PERMS]
+
+# the color every color becomes under every symmetry, which is the face its face piece is moved to
+SYMMETRY_COLORS = []
+
+for p in SYMMETRY_PERMS:
+    colors = list(range(256))
+
+    for f in range(6):
+        colors[p[f * 9 + 4] // 9] = f
+
+    SYMMETRY_COLORS.append(bytes(colors))
+
+SYMMETRY_INDEX = {}
+
+for s in range(NUM_SYMMETRIES):
+    SYMMETRY_INDEX[SYMMETRY_PERMS[s]] = s
+
+# the products of every pair of symmetries, built once and then loaded from disk
+SYMMETRY_MULTIPLY_TABLE = load_or_build("symmetry_multiply", "B", lambda: [SYMMETRY_INDEX[compose(a, b)] for a in SYMMETRY_PERMS for b in SYMMETRY_PERMS])
+SYMMETRY_MULTIPLY = [SYMMETRY_MULTIPLY_TABLE[a * NUM_SYMMETRIES:(a + 1) * NUM_SYMMETRIES].tolist() for a in range(NUM_SYMMETRIES)]
+SYMMETRY_INVERSE = [row.index(0) for row in SYMMETRY_MULTIPLY]
+
+# returns the conjugate of the stickers of a cube by a symmetry
+def conjugate(stickers, s):
+    return bytes(SYMMETRY_GETTERS[s](stickers)).translate(SYMMETRY_COLORS[s])
+
+# returns MOVE_CONJUGATES as one flat list, row after row, found by conjugating the permutation of every move
+def build_move_conjugates():
+
+    move_index = {}
+
+    for m in range(len(MOVES)):
+        move_index[PERMS[m]] = m
+
+    table = []
+
+    for s in range(NUM_SYMMETRIES):
+        inverse = SYMMETRY_PERMS[SYMMETRY_INVERSE[s]]
+        table += [move_index[compose(compose(inverse, PERMS[m]), SYMMETRY_PERMS[s])] for m in range(len(MOVES))]
+
+    return table
+
+# the move that every move becomes under every symmetry, built once and then loaded from disk
+MOVE_CONJUGATES_TABLE = load_or_build("symmetry_move_conjugates", "B", build_move_conjugates)
+MOVE_CONJUGATES = [MOVE_CONJUGATES_TABLE[s * len(MOVES):(s + 1) * len(MOVES)].tolist() for s in range(NUM_SYMMETRIES)]
+
+# returns the moves of a list of move ids as they are in the conjugate by a symmetry
+def conjugate_moves(moves, s):
+    return [MOVE_CONJUGATES[s][m] for m in moves]
+
+# returns the conjugates of a state by every symmetry, or by only the 24 rotations when mirrors is False
+def conjugates(stickers, mirrors = True):
+
+    count = NUM_SYMMETRIES if mirrors else NUM_ROTATIONS
+    return [bytes(SYMMETRY_GETTERS[s](stickers)).translate(SYMMETRY_COLORS[s]) for s in range(count)]
+
+# returns the stickers of the representative of a state along with a symmetry that conjugates the state into it
+# most conjugates already differ in their U face, so only the ones with the smallest U face are built in full
+def canonical_symmetry(stickers, mirrors = True):
+
+    count = NUM_SYMMETRIES if mirrors else NUM_ROTATIONS
+    prefixes = [bytes(PREFIX_GETTERS[s](stickers)).translate(SYMMETRY_COLORS[s]) for s in range(count)]
+    smallest = min(prefixes)
+    best = None
+
+    for s in range(count):
+
+        if prefixes[s] == smallest:
+            conjugated = conjugate(stickers, s)
+
+            if best is None or conjugated < best:
+                best = conjugated
+                best_symmetry = s
+
+    return best, best_symmetry
+
+# returns the stickers of the representative of a state
+def canonical_stickers(stickers, mirrors = True):
+    return canonical_symmetry(stickers, mirrors)[0]
+
+# returns the number of different states in the symmetry class of a state, which is 48 (or 24 without mirrors) divided by the number of symmetries the state has
+def class_size(stickers, mirrors = True):
+    return len(set(conjugates(stickers, mirrors)))
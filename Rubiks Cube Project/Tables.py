@@ -0,0 +1,106 @@
+"""
+Tables
+
+- A helper module that saves large precomputed tables to disk once and memory-maps them on every later run
+- A table is a flat array of unsigned integers (an array.array typecode such as "B" or "H") saved in the machine's byte order, one file per table
+- Every file starts with a header of HEADER_SIZE bytes that holds:
+    MAGIC and FORMAT_VERSION - which change whenever the layout of the files changes
+    the version of the table - which the code that builds a table raises whenever the table it builds changes, so old files are built again
+    the typecode and number of entries of the table, and the CRC32 of the entries
+    a file whose header doesn't match what is asked for, or whose entries don't match their CRC32, is treated as missing and built again
+- Loaded tables are read-only memoryviews over the memory-mapped file, so nothing is copied and processes that load the same table share its pages
+- Tables are kept in the "tables" folder next to this module, unless the RUBIKS_TABLES_DIR environment variable points somewhere else
+    when the folder can't be written to, tables are built in memory on every run instead
+
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from array import array
+
+TABLES_DIR = os.environ.get("RUBIKS_TABLES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables"))
+
+MAGIC = b"RCTB"
+FORMAT_VERSION = 1
+
+# magic, format version, table version, typecode, number of entries, and CRC32, padded to 32 bytes so the entries stay aligned
+HEADER = struct.Struct(">4sHHc3xQI4x")
+HEADER_SIZE = HEADER.size
+
+# returns the path of the file of a table
+def table_path(name):
+    return os.path.join(TABLES_DIR, name + ".bin")
+
+# writes a table to disk, going through a temporary file so a half written table is never loaded
+def save_table(name, values, typecode, version = 1):
+
+    if not isinstance(values, array):
+        values = array(typecode, values)
+
+    os.makedirs(TABLES_DIR, exist_ok = True)
+    path = table_path(name)
+
+    # every process writes its own temporary file, so processes building the same table at once can't mix their writes
+    temporary = path + "." + str(os.getpid()) + ".tmp"
+    data = values.tobytes()
+
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, version, typecode.encode(), len(values), zlib.crc32(data)))
+        f.write(data)
+
+    os.replace(temporary, path)
+
+# memory-maps a table from disk, returning None if it hasn't been saved yet or its file is out of date or damaged
+def load_table(name, typecode, version = 1, verify = True):
+
+    path = table_path(name)
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+
+        if len(header) != HEADER_SIZE:
+            return None
+
+        magic, format_version, table_version, table_typecode, count, crc = HEADER.unpack(header)
+
+        if (magic, format_version, table_version, table_typecode) != (MAGIC, FORMAT_VERSION, version, typecode.encode()):
+            return None
+
+        if os.fstat(f.fileno()).st_size != HEADER_SIZE + count * array(typecode).itemsize:
+            return None
+
+        # the map stays open after the file is closed, for as long as the memoryview is referenced
+        data = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+    entries = memoryview(data)[HEADER_SIZE:]
+
+    # checking the CRC32 reads every page of the table once, which is far quicker than building it again
+    if verify and zlib.crc32(entries) != crc:
+        entries.release()
+        data.close()
+        return None
+
+    return entries.cast(typecode)
+
+# loads a table, first building and saving it with build() if it isn't on disk
+def load_or_build(name, typecode, build, version = 1):
+
+    table = load_table(name, typecode, version)
+
+    if table is None:
+        values = build()
+
+        try:
+            save_table(name, values, typecode, version)
+
+        except OSError:
+            return memoryview(values if isinstance(values, array) else array(typecode, values))
+
+        table = load_table(name, typecode, version)
+
+    return table
@@ -0,0 +1,318 @@
+"""
+TwoPhaseSolver
+
+- A program that solves a rubiks cube with Kociemba's two-phase algorithm, finding solutions of 22 moves or less
+- Phase 1 brings the cube into the subgroup <U, D, R2, F2, L2, B2>, where every twist and flip is 0 and the 4 slice sides are between U and D
+- Phase 2 solves the cube using only the 10 moves of that subgroup
+- Both phases are iterative deepening searches over the coordinates of the Cubies module
+    move tables give the coordinate reached by every move, and pruning tables give a lower bound of the number of moves left
+- The tables are built once (build_tables() times every step) and memory-mapped from disk through the Tables module on every later run
+- Solutions are lists of move names, such as ["R", "U2", "F'"], that can be applied through MoveTables.NAMED_MOVES
+- References:
+    Two-phase algorithm - https://kociemba.org/math/imptwophase.htm
+
+"""
+
+from time import perf_counter
+from Cubies import CENTER_MULTIPLY, CubieCube
+from MoveTables import MOVE_NAMES, NAMED_MOVES, ROTATION_MOVES, ROTATION_PERMS, apply_move
+from RubiksCube import SOLVED_STICKERS
+from Tables import load_or_build, save_table
+
+# the 18 face moves in the order U, U2, U', R, R2, R', F, ... , B', so move m turns face m // 3 clockwise m % 3 + 1 times
+FACE_MOVES = [NAMED_MOVES[face + suffix] for face in "URFDLB" for suffix in ("", "2", "'")]
+
+# the 10 moves that keep the cube in the phase 2 subgroup: U, U2, U', R2, F2, D, D2, D', L2, B2
+PHASE2_MOVES = [0, 1, 2, 4, 7, 9, 10, 11, 13, 16]
+
+# the cubie cube of every face move
+MOVE_CUBES = [CubieCube.from_stickers(apply_move(SOLVED_STICKERS, m)) for m in FACE_MOVES]
+
+NUM_TWISTS = 2187
+NUM_FLIPS = 2048
+NUM_SLICES = 495
+NUM_CORNER_PERMS = 40320
+NUM_UD_EDGE_PERMS = 40320
+NUM_SLICE_PERMS = 24
+
+# builds the table of the coordinate reached by each move from every coordinate
+def build_move_table(size, get_coord, set_coord, moves, corners):
+
+    table = [0] * (size * len(moves))
+
+    for c in range(size):
+        cube = CubieCube()
+        set_coord(cube, c)
+
+        for n in range(len(moves)):
+            moved = cube.copy()
+
+            if corners:
+                moved.corner_multiply(MOVE_CUBES[moves[n]])
+
+            else:
+                moved.edge_multiply(MOVE_CUBES[moves[n]])
+
+            table[c * len(moves) + n] = get_coord(moved)
+
+    return table
+
+# builds a pruning table of the fewest moves needed to bring the pair of coordinates (c1, c2) to (0, 0), stored at index c1 * size2 + c2
+def build_pruning_table(size1, move1, size2, move2, num_moves):
+
+    table = bytearray([255]) * (size1 * size2)
+    table[0] = 0
+    frontier = [0]
+    depth = 0
+
+    while frontier:
+        next_frontier = []
+
+        for index in frontier:
+            c1, c2 = divmod(index, size2)
+            c1 *= num_moves
+            c2 *= num_moves
+
+            for m in range(num_moves):
+                j = move1[c1 + m] * size2 + move2[c2 + m]
+
+                if table[j] == 255:
+                    table[j] = depth + 1
+                    next_frontier.append(j)
+
+        frontier = next_frontier
+        depth += 1
+
+    return table
+
+# the name, array typecode, and builder of every table, in the order they need to be built
+TABLE_SPECS = [
+    ("twophase_twist_move", "H", lambda t: build_move_table(NUM_TWISTS, CubieCube.twist, CubieCube.set_twist, list(range(18)), True)),
+    ("twophase_flip_move", "H", lambda t: build_move_table(NUM_FLIPS, CubieCube.flip, CubieCube.set_flip, list(range(18)), False)),
+    ("twophase_slice_move", "H", lambda t: build_move_table(NUM_SLICES, CubieCube.slice, CubieCube.set_slice, list(range(18)), False)),
+    ("twophase_corner_perm_move", "H", lambda t: build_move_table(NUM_CORNER_PERMS, CubieCube.corner_perm, CubieCube.set_corner_perm, PHASE2_MOVES, True)),
+    ("twophase_ud_edge_perm_move", "H", lambda t: build_move_table(NUM_UD_EDGE_PERMS, CubieCube.ud_edge_perm, CubieCube.set_ud_edge_perm, PHASE2_MOVES, False)),
+    ("twophase_slice_perm_move", "H", lambda t: build_move_table(NUM_SLICE_PERMS, CubieCube.slice_perm, CubieCube.set_slice_perm, PHASE2_MOVES, False)),
+    ("twophase_slice_twist_prune", "B", lambda t: build_pruning_table(NUM_SLICES, t["twophase_slice_move"], NUM_TWISTS, t["twophase_twist_move"], 18)),
+    ("twophase_slice_flip_prune", "B", lambda t: build_pruning_table(NUM_SLICES, t["twophase_slice_move"], NUM_FLIPS, t["twophase_flip_move"], 18)),
+    ("twophase_corner_perm_prune", "B", lambda t: build_pruning_table(NUM_CORNER_PERMS, t["twophase_corner_perm_move"], NUM_SLICE_PERMS, t["twophase_slice_perm_move"], 10)),
+    ("twophase_ud_edge_perm_prune", "B", lambda t: build_pruning_table(NUM_UD_EDGE_PERMS, t["twophase_ud_edge_perm_move"], NUM_SLICE_PERMS, t["twophase_slice_perm_move"], 10)),
+]
+
+# builds and saves every table from scratch, printing how long each one took, and returns the timings in seconds
+def build_tables(verbose = True):
+
+    tables = {}
+    timings = {}
+
+    for name, typecode, build in TABLE_SPECS:
+        start = perf_counter()
+        tables[name] = build(tables)
+        save_table(name, tables[name], typecode)
+        timings[name] = perf_counter() - start
+
+        if verbose:
+            print(name + ": " + str(len(tables[name])) + " entries in " + str(round(timings[name], 2)) + " seconds")
+
+    return timings
+
+# memory-maps every table, building the ones that aren't on disk yet
+def load_tables():
+
+    tables = {}
+
+    for name, typecode, build in TABLE_SPECS:
+        tables[name] = load_or_build(name, typecode, lambda: build(tables))
+
+    return tables
+
+# turns a Cube into the cubie cube a solver searches from, along with the entire cube turns that bring its face pieces back where they belong
+# the cubie cube is None when every face is already a single color, since the cube is solved no matter how it is held
+def prepare(cube):
+
+    cubie = CubieCube.from_stickers(cube.stickers)
+
+    if not cubie.is_solvable():
+        raise Exception("The provided cube cannot be solved")
+
+    if all([len(set(cube.stickers[f * 9:f * 9 + 9])) == 1 for f in range(6)]):
+        return None, []
+
+    # slice moves and entire cube turns move the face pieces, so the search starts from the cube turned until they are back where they belong
+    prefix = []
+
+    if cubie.centers != 0:
+        r = CENTER_MULTIPLY[cubie.centers].index(0)
+        cubie.multiply(CubieCube.from_stickers(bytes([SOLVED_STICKERS[i] for i in ROTATION_PERMS[r]])))
+        prefix = [MOVE_NAMES[m] for m in ROTATION_MOVES[r]]
+
+    return cubie, prefix
+
+# whether move m should be skipped after the move last, since turning the same face twice in a row or turning opposite faces in both orders is wasted effort
+def skip_move(m, last):
+
+    face = m // 3
+    last_face = last // 3
+    return face == last_face or face == last_face - 3
+
+
+class TwoPhaseSolver:
+
+    def __init__(self, tables = None):
+
+        if tables is None:
+            tables = load_tables()
+
+        self.twist_move = tables["twophase_twist_move"]
+        self.flip_move = tables["twophase_flip_move"]
+        self.slice_move = tables["twophase_slice_move"]
+        self.corner_perm_move = tables["twophase_corner_perm_move"]
+        self.ud_edge_perm_move = tables["twophase_ud_edge_perm_move"]
+        self.slice_perm_move = tables["twophase_slice_perm_move"]
+        self.slice_twist_prune = tables["twophase_slice_twist_prune"]
+        self.slice_flip_prune = tables["twophase_slice_flip_prune"]
+        self.corner_perm_prune = tables["twophase_corner_perm_prune"]
+        self.ud_edge_perm_prune = tables["twophase_ud_edge_perm_prune"]
+
+        # search state and the statistics of the last solve
+        self.start = None
+        self.path = []
+        self.max_length = 0
+        self.nodes = 0
+        self.solve_time = 0
+
+    # returns a list of move names that solves a Cube, at most max_length face moves long
+    def solve(self, cube, max_length = 22):
+
+        start_time = perf_counter()
+        self.nodes = 0
+        cubie, prefix = prepare(cube)
+
+        if cubie is None:
+            self.solve_time = perf_counter() - start_time
+            return []
+
+        self.start = cubie
+        self.path = []
+        self.max_length = max_length
+        twist = cubie.twist()
+        flip = cubie.flip()
+        slc = cubie.slice()
+
+        for depth in range(max_length + 1):
+
+            if self.phase1(twist, flip, slc, depth):
+                self.solve_time = perf_counter() - start_time
+                return prefix + [MOVE_NAMES[FACE_MOVES[m]] for m in self.path]
+
+        self.solve_time = perf_counter() - start_time
+        raise Exception("No solution of " + str(max_length) + " moves or less was found")
+
+    # searches every phase 1 move sequence of exactly togo more moves, handing each one that finishes phase 1 over to phase 2
+    def phase1(self, twist, flip, slc, togo):
+
+        self.nodes += 1
+
+        if togo == 0:
+
+            # phase 1 solutions ending in a phase 2 move are skipped, as the same solution without that move was already tried
+            if twist == 0 and flip == 0 and slc == 0 and (not self.path or self.path[-1] not in PHASE2_MOVES):
+                return self.start_phase2()
+
+            return False
+
+        path = self.path
+        twist_move = self.twist_move
+        flip_move = self.flip_move
+        slice_move = self.slice_move
+
+        for m in range(18):
+
+            if path and skip_move(m, path[-1]):
+                continue
+
+            t = twist_move[twist * 18 + m]
+            f = flip_move[flip * 18 + m]
+            s = slice_move[slc * 18 + m]
+
+            if self.slice_twist_prune[s * NUM_TWISTS + t] >= togo or self.slice_flip_prune[s * NUM_FLIPS + f] >= togo:
+                continue
+
+            path.append(m)
+
+            if self.phase1(t, f, s, togo - 1):
+                return True
+
+            path.pop()
+
+        return False
+
+    # reads the phase 2 coordinates of the cube after the phase 1 moves and searches for the shortest phase 2 that still fits within max_length
+    def start_phase2(self):
+
+        cubie = self.start.copy()
+
+        for m in self.path:
+            cubie.corner_multiply(MOVE_CUBES[m])
+            cubie.edge_multiply(MOVE_CUBES[m])
+
+        corner_perm = cubie.corner_perm()
+        ud_edge_perm = cubie.ud_edge_perm()
+        slice_perm = cubie.slice_perm()
+        lower_bound = max(self.corner_perm_prune[corner_perm * NUM_SLICE_PERMS + slice_perm], self.ud_edge_perm_prune[ud_edge_perm * NUM_SLICE_PERMS + slice_perm])
+
+        for depth in range(lower_bound, self.max_length - len(self.path) + 1):
+
+            if self.phase2(corner_perm, ud_edge_perm, slice_perm, depth):
+                return True
+
+        return False
+
+    # searches every phase 2 move sequence of exactly togo more moves for one that solves the cube
+    def phase2(self, corner_perm, ud_edge_perm, slice_perm, togo):
+
+        self.nodes += 1
+
+        if togo == 0:
+            return corner_perm == 0 and ud_edge_perm == 0 and slice_perm == 0
+
+        path = self.path
+
+        for n in range(10):
+            m = PHASE2_MOVES[n]
+
+            if path and skip_move(m, path[-1]):
+                continue
+
+            c = self.corner_perm_move[corner_perm * 10 + n]
+            u = self.ud_edge_perm_move[ud_edge_perm * 10 + n]
+            s = self.slice_perm_move[slice_perm * 10 + n]
+
+            if self.corner_perm_prune[c * NUM_SLICE_PERMS + s] >= togo or self.ud_edge_perm_prune[u * NUM_SLICE_PERMS + s] >= togo:
+                continue
+
+            path.append(m)
+
+            if self.phase2(c, u, s, togo - 1):
+                return True
+
+            path.pop()
+
+        return False
+
+# a solver shared by every call of solve(), so its tables are only loaded once per process
+shared_solver = None
+
+# solves a Cube with the shared solver and returns the list of move names
+def solve(cube, max_length = 22):
+
+    global shared_solver
+
+    if shared_solver is None:
+        shared_solver = TwoPhaseSolver()
+
+    return shared_solver.solve(cube, max_length)
+
+# builds every table ahead of time
+if __name__ == "__main__":
+    build_tables()
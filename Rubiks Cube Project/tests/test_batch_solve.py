@@ -0,0 +1,61 @@
+"""
+Tests of the BatchSolve module, with the two-phase solver in a small process pool
+
+"""
+
+from BatchSolve import main, solve_all, to_compact_key
+from MoveTables import NAMED_MOVES
+from RubiksCube import Cube
+
+def scrambled(algorithm):
+
+    cube = Cube()
+    cube.apply_algorithm(algorithm)
+    return cube
+
+def is_solved(cube):
+    return all([len(set(cube.stickers[f * 9:f * 9 + 9])) == 1 for f in range(6)])
+
+def test_every_kind_of_state_becomes_a_compact_key():
+
+    cube = scrambled("R U F")
+    key = cube.compact_key()
+    assert to_compact_key(cube) == key
+    assert to_compact_key(cube.encode()) == key
+    assert to_compact_key(key) == key
+    assert to_compact_key(key.hex() + "\n") == key
+
+def test_solve_all_keeps_order_and_reports_errors():
+
+    cubes = [scrambled("R U R' F2"), scrambled("D L2 B"), Cube(), scrambled("x M U")]
+    states = [cubes[0], cubes[1].encode(), cubes[2].compact_key(), cubes[3].compact_key().hex(), "not a state"]
+    results = list(solve_all(states, processes = 2, chunksize = 1))
+
+    assert len(results) == len(states)
+
+    for n in range(len(cubes)):
+        key, solution, error = results[n]
+        assert error is None
+        assert key == cubes[n].compact_key()
+
+        cube = cubes[n].copy()
+
+        for name in solution:
+            cube.apply_move(NAMED_MOVES[name])
+
+        assert is_solved(cube)
+
+    assert results[-1][0] == "not a state"
+    assert results[-1][2] is not None
+
+def test_main_writes_one_line_per_state(tmp_path):
+
+    states = tmp_path / "states.txt"
+    solutions = tmp_path / "solutions.txt"
+    states.write_text(scrambled("R U").compact_key().hex() + "\n\nzz\n")
+    main([str(states), "--output", str(solutions), "--processes", "1"])
+
+    lines = solutions.read_text().splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith(scrambled("R U").compact_key().hex() + " ")
+    assert lines[1].startswith("zz error: ")
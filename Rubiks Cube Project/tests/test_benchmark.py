@@ -0,0 +1,61 @@
+"""
+Tests of the Benchmark module, with far fewer operations than a real run
+
+"""
+
+import json
+import random
+import pytest
+import Benchmark
+from Benchmark import BENCHMARKS, compare, format_startup, measure_startup, run_all, run_benchmark
+
+RESULT_KEYS = ["ops", "ops_per_sec", "p50_us", "p90_us", "p99_us", "peak_kb", "seconds"]
+
+def test_every_benchmark_runs():
+
+    for name in BENCHMARKS:
+        result = run_benchmark(name, 20, repeat = 1)
+        assert sorted(result) == sorted(RESULT_KEYS)
+        assert result["ops"] == 20
+        assert result["p50_us"] <= result["p90_us"] <= result["p99_us"]
+
+def test_benchmarks_leave_the_global_random_state_alone():
+
+    random.seed(1)
+    state = random.getstate()
+    run_benchmark("scramble_verify", 5, repeat = 1)
+    assert random.getstate() == state
+
+def test_unknown_benchmark_raises():
+
+    with pytest.raises(Exception):
+        run_all(["no_such_benchmark"], verbose = False)
+
+def test_compare_finds_regressions():
+
+    old = {"cube_turn": {"ops_per_sec": 1000.0, "p99_us": 10.0, "peak_kb": 100.0}}
+    same = {"cube_turn": {"ops_per_sec": 950.0, "p99_us": 10.5, "peak_kb": 100.5}}
+    slower = {"cube_turn": {"ops_per_sec": 800.0, "p99_us": 20.0, "peak_kb": 100.0}}
+
+    assert compare(same, old) == []
+    assert len(compare(slower, old)) == 2
+    assert compare({"other": same["cube_turn"]}, old) == []
+
+def test_main_saves_and_compares(tmp_path, monkeypatch, capsys):
+
+    monkeypatch.setitem(Benchmark.QUICK_COUNTS, "cube_turn", 50)
+    baseline = tmp_path / "baseline.json"
+
+    assert Benchmark.main(["--quick", "--repeat", "1", "--only", "cube_turn", "--save", str(baseline)]) == 0
+    assert "cube_turn" in json.loads(baseline.read_text())
+
+    # a baseline that is far faster than any machine makes the comparison fail
+    baseline.write_text(json.dumps({"cube_turn": {"ops_per_sec": 1e12, "p99_us": 0.0, "peak_kb": 0.0}}))
+    assert Benchmark.main(["--quick", "--repeat", "1", "--only", "cube_turn", "--compare", str(baseline)]) == 1
+    assert "regression - cube_turn" in capsys.readouterr().out
+
+def test_startup_is_measured_in_new_processes():
+
+    timings = measure_startup("RubiksCube", repeat = 1)
+    assert len(timings) == 1 and timings[0] > 0
+    assert format_startup("RubiksCube", timings).startswith("cold start (import RubiksCube")
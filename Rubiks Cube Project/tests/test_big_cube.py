@@ -0,0 +1,100 @@
+"""
+Tests of the BigCube module
+
+"""
+
+import random
+import pytest
+from BigCube import BigCube
+from MoveTables import MOVES
+from RubiksCube import Cube
+
+# the stickers of the 3 x 3 x 3 that are corners, in the layout of the stickers of every face
+CORNER_STICKERS = [f * 9 + i for f in range(6) for i in (0, 2, 6, 8)]
+
+def test_three_by_three_matches_cube():
+
+    rng = random.Random(1)
+    big = BigCube(3)
+    cube = Cube()
+
+    for n in range(500):
+        m = rng.randrange(len(MOVES))
+        axis, layer, k = MOVES[m]
+        cube.apply_move(m)
+        big.apply_move(axis, None if layer is None else layer + 1, k)
+        assert big.key() == cube.stickers
+
+    assert big.facelets() == cube.facelets()
+
+@pytest.mark.parametrize("size", [2, 4, 5])
+def test_outer_layers_move_corners_like_cube(size):
+
+    rng = random.Random(size)
+    big = BigCube(size)
+    cube = Cube()
+    area = size * size
+    corners = [0, size - 1, area - size, area - 1]
+
+    for n in range(300):
+        m = rng.randrange(len(MOVES))
+        axis, layer, k = MOVES[m]
+
+        if layer == 0:
+            continue
+
+        cube.apply_move(m)
+        big.apply_move(axis, None if layer is None else (layer + 1) // 2 * (size - 1), k)
+
+    assert bytes([big.faces[f][i] for f in range(6) for i in corners]) == bytes([cube.stickers[i] for i in CORNER_STICKERS])
+
+@pytest.mark.parametrize("size", [2, 3, 6, 9])
+def test_undoing_every_move_solves_the_cube(size):
+
+    rng = random.Random(size)
+    cube = BigCube(size)
+    history = []
+
+    for n in range(200):
+        move = (rng.choice("xyz"), rng.randrange(size), rng.randint(1, 3))
+        history.append(move)
+        cube.apply_move(*move)
+
+    assert not cube.is_solved()
+    assert BigCube.from_key(cube.key()) == cube
+
+    for axis, layer, k in reversed(history):
+        cube.apply_move(axis, layer, 4 - k)
+
+    assert cube == BigCube(size)
+
+def test_rotate_and_turn():
+
+    cube = BigCube(4)
+    assert cube.rotate(1, "x", 90, "degrees") == ("x", 1, 1)
+    assert not cube.is_solved()
+    assert cube.rotate(1, "x", -90, "degrees") == ("x", 1, 3)
+    assert cube.is_solved()
+
+    assert cube.turn("y", 360, "degrees") is None
+    assert cube.turn("y", 90, "degrees") == ("y", None, 1)
+    assert cube.is_solved()
+
+    with pytest.raises(Exception):
+        cube.rotate(4, "x", 90, "degrees")
+
+    with pytest.raises(Exception):
+        cube.turn("w", 90, "degrees")
+
+def test_copies_are_independent():
+
+    cube = BigCube(5)
+    copy = cube.copy()
+    copy.apply_move("z", 2, 1)
+    assert cube.is_solved() and not copy.is_solved()
+
+def test_net_has_every_sticker():
+
+    lines = BigCube(4).cube_lines()
+    assert lines[0] == "Rubik's Cube (4 x 4 x 4):"
+    assert sum([line.count("w") for line in lines]) == 16
@@ -0,0 +1,74 @@
+"""
+Tests of the CubeBatch module, which needs NumPy
+
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from CubeBatch import CubeBatch
+from MoveTables import INVERSE_MOVES, NAMED_MOVES
+from RubiksCube import Cube
+
+def test_new_batch_is_solved():
+
+    batch = CubeBatch(5)
+    assert len(batch) == 5
+    assert batch.solved().all()
+
+def test_apply_move_matches_cube():
+
+    batch = CubeBatch(3)
+    batch.apply_move("R")
+    batch.apply_move(("y", 1, 3))
+    batch.apply_move(NAMED_MOVES["M2"])
+
+    cube = Cube()
+    cube.apply_algorithm("R U M2")
+
+    for i in range(len(batch)):
+        assert batch.to_cube(i) == cube
+
+def test_apply_moves_moves_every_cube_differently():
+
+    moves = [NAMED_MOVES["R"], NAMED_MOVES["U'"], NAMED_MOVES["x"]]
+    batch = CubeBatch(3)
+    batch.apply_moves(moves)
+
+    for i in range(3):
+        cube = Cube()
+        cube.apply_move(moves[i])
+        assert batch.to_cube(i) == cube
+
+    batch.apply_moves([INVERSE_MOVES[m] for m in moves])
+    assert batch.solved().all()
+
+    with pytest.raises(Exception):
+        batch.apply_moves([0, 1])
+
+def test_apply_sequence_matches_cube():
+
+    cubes = [Cube(), Cube()]
+    cubes[1].apply_algorithm("F2 D")
+    batch = CubeBatch.from_cubes(cubes)
+    batch.apply_sequence(["R", "U", "R'", "U'"])
+
+    for i in range(len(cubes)):
+        cubes[i].apply_algorithm("R U R' U'")
+        assert batch.to_cube(i) == cubes[i]
+
+def test_scramble_is_seeded_and_solved_checks_faces():
+
+    first = CubeBatch(20)
+    second = CubeBatch(20)
+    first.scramble(25, np.random.default_rng(4))
+    second.scramble(25, np.random.default_rng(4))
+
+    assert (first.states == second.states).all()
+    assert not first.solved().all()
+
+    # an entire cube turn leaves every face a single color
+    turned = CubeBatch(1)
+    turned.apply_move("x")
+    assert turned.solved()[0]
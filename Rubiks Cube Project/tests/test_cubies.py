@@ -0,0 +1,77 @@
+"""
+Tests of the Cubies module and the canonical integer encoding of cube states
+
+"""
+
+import random
+import pytest
+from Cubies import ENCODED_BYTES, NUM_STATES, CubieCube, decode, encode, perm_rank, perm_unrank
+from MoveTables import MOVES
+from RubiksCube import Cube, SOLVED_STICKERS
+
+# cubes scrambled with every kind of move, including slice moves and entire cube turns
+def scrambled_cubes(count, seed = 0):
+
+    rng = random.Random(seed)
+    cubes = []
+
+    for n in range(count):
+        cube = Cube()
+
+        for m in range(30):
+            cube.apply_move(rng.randrange(len(MOVES)))
+
+        cubes.append(cube)
+
+    return cubes
+
+def test_solved_cube_encodes_to_zero():
+
+    assert encode(SOLVED_STICKERS) == 0
+    assert decode(0) == SOLVED_STICKERS
+    assert CubieCube.from_stickers(SOLVED_STICKERS).is_solvable()
+
+def test_encoding_round_trips():
+
+    for cube in scrambled_cubes(50):
+        value = cube.encode()
+        assert 0 <= value < NUM_STATES
+        assert decode(value) == cube.stickers
+        assert Cube.decode(cube.compact_key()) == cube
+        assert len(cube.compact_key()) == ENCODED_BYTES
+
+def test_different_states_encode_differently():
+
+    cubes = scrambled_cubes(200, 1)
+    assert len(set([cube.encode() for cube in cubes])) == len(set([cube.stickers for cube in cubes]))
+
+def test_perm_rank_round_trips():
+
+    for rank in (0, 1, 5039, 40319):
+        assert perm_rank(perm_unrank(rank, 8)) == rank
+
+def test_multiplying_by_moves_matches_stickers():
+
+    rng = random.Random(2)
+    cubie = CubieCube()
+    cube = Cube()
+
+    for n in range(40):
+        m = rng.randrange(len(MOVES))
+        cube.apply_move(m)
+        moved = Cube()
+        moved.apply_move(m)
+        cubie.multiply(CubieCube.from_stickers(moved.stickers))
+        assert cubie.to_stickers() == cube.stickers
+
+def test_twisted_corner_is_not_solvable():
+
+    cubie = CubieCube()
+    cubie.co[0] = 1
+    assert not cubie.is_solvable()
+
+    with pytest.raises(Exception):
+        cubie.encode()
+
+    with pytest.raises(Exception):
+        CubieCube.decode(NUM_STATES)
@@ -0,0 +1,82 @@
+"""
+Tests of the Explorer module
+
+"""
+
+import os
+import pytest
+from Explorer import Explorer, subgroup_moves
+
+# the number of states of the full cube first reached at every depth of <U, R> in the half turn metric
+UR_DEPTHS = [1, 6, 18, 54, 162, 486]
+
+# the number of states of the corners reached by <U, R>
+UR_CORNER_STATES = 29160
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt(*args):
+    raise Interrupted()
+
+def test_subgroup_moves():
+
+    assert len(subgroup_moves("U R")) == 6
+    assert len(subgroup_moves("U R", "qtm")) == 4
+
+    with pytest.raises(Exception):
+        subgroup_moves("U", "nope")
+
+def test_full_depths(tmp_path):
+    assert Explorer(str(tmp_path), "U R", "full").run(max_depth = 5, verbose = False) == UR_DEPTHS
+
+def test_complete_exploration_keeps_only_the_last_depth(tmp_path):
+
+    assert Explorer(str(tmp_path), "U", "full", metric = "qtm").run(verbose = False) == [1, 2, 1]
+    assert sorted(os.listdir(str(tmp_path))) == ["depth_2.bin", "progress.json"]
+
+def test_bitset_and_sorting_agree(tmp_path):
+
+    bitset = Explorer(str(tmp_path / "bitset"), "U R", "corners").run(verbose = False)
+    sorting = Explorer(str(tmp_path / "sorting"), "U R", "corners", max_bitset_bits = 0, chunk_size = 5000).run(verbose = False)
+
+    assert sum(bitset) == UR_CORNER_STATES
+    assert sorting == bitset
+
+# a run that stopped at a smaller depth is picked up again by a new explorer, with the visited states kept by sorting or in a bitset
+@pytest.mark.parametrize("projection", ["full", "corners"])
+def test_resume_a_finished_run(tmp_path, projection):
+
+    expected = Explorer(str(tmp_path / "whole"), "U R", projection).run(max_depth = 5, verbose = False)
+
+    work_dir = str(tmp_path / "stopped")
+    Explorer(work_dir, "U R", projection).run(max_depth = 3, verbose = False)
+    assert Explorer(work_dir, "U R", projection).run(max_depth = 5, verbose = False) == expected
+
+# a depth interrupted before or after its progress is saved is picked up again with the same counts, with the visited states kept by sorting or in a bitset
+@pytest.mark.parametrize("step", ["save_progress", "remove_stale_files"])
+@pytest.mark.parametrize("projection, files", [("full", ["depth_4.bin", "depth_5.bin"]), ("corners", ["depth_4.bin", "depth_5.bin", "visited_5.bin"])])
+def test_resume_after_interruption(tmp_path, step, projection, files):
+
+    expected = Explorer(str(tmp_path / "whole"), "U R", projection).run(max_depth = 5, verbose = False)
+
+    work_dir = str(tmp_path / "interrupted")
+    explorer = Explorer(work_dir, "U R", projection)
+    explorer.run(max_depth = 3, verbose = False)
+    setattr(explorer, step, interrupt)
+
+    with pytest.raises(Interrupted):
+        explorer.explore_depth()
+
+    resumed = Explorer(work_dir, "U R", projection)
+    assert resumed.run(max_depth = 5, verbose = False) == expected
+    assert sorted(os.listdir(work_dir)) == sorted(files + ["progress.json"])
+
+def test_resume_with_other_settings_raises(tmp_path):
+
+    Explorer(str(tmp_path), "U R", "full").run(max_depth = 1, verbose = False)
+
+    with pytest.raises(Exception):
+        Explorer(str(tmp_path), "U F", "full")
@@ -0,0 +1,111 @@
+"""
+Tests of the Facelets module
+
+"""
+
+import io
+import random
+import pytest
+from Cubies import CORNER_FACELETS, EDGE_FACELETS
+from Facelets import REASONS, check_stickers, codes_to_facelets, facelets_to_codes, main, read_facelets, validate
+from RubiksCube import Cube, SOLVED_STICKERS
+
+# returns the solved stickers with the stickers at every pair of positions swapped
+def swapped(*pairs):
+
+    stickers = bytearray(SOLVED_STICKERS)
+
+    for a, b in pairs:
+        stickers[a], stickers[b] = stickers[b], stickers[a]
+
+    return bytes(stickers)
+
+# one line failing every check, in the order of REASONS
+def failing_lines():
+
+    corner = CORNER_FACELETS[0]
+    recolored = bytearray(SOLVED_STICKERS)
+    recolored[0] = recolored[9]
+
+    return [
+        SOLVED_STICKERS[:53],
+        bytes(recolored),
+        swapped((4, 13)),
+        swapped((corner[0], corner[1])),
+        swapped((EDGE_FACELETS[0][0], EDGE_FACELETS[1][1])),
+        swapped((corner[0], corner[1]), (corner[1], corner[2])),
+        swapped(EDGE_FACELETS[0]),
+        swapped((EDGE_FACELETS[0][0], EDGE_FACELETS[1][0]), (EDGE_FACELETS[0][1], EDGE_FACELETS[1][1])),
+    ]
+
+# returns the stickers of some scrambled cubes
+def scrambled_lines(count):
+
+    rng = random.Random(5)
+    lines = []
+
+    for _ in range(count):
+        cube = Cube()
+        cube.apply_algorithm(" ".join([rng.choice(["R", "U'", "F2", "M", "x", "Dw", "B'", "L"]) for _ in range(20)]))
+        lines.append(cube.key())
+
+    return lines
+
+def test_check_stickers_reasons():
+
+    assert [check_stickers(line) for line in failing_lines()] == list(range(len(REASONS)))
+    assert all([check_stickers(line) is None for line in scrambled_lines(20)])
+
+def test_numpy_agrees_with_pure_checks():
+
+    pytest.importorskip("numpy")
+    lines = failing_lines()
+    data = b"".join([line if len(line) == 54 else b"\xff" * 54 for line in lines] + scrambled_lines(20))
+
+    assert validate(data) == validate(data, use_numpy = False)
+    assert validate(data) == [(i, REASONS[i]) for i in range(len(REASONS))]
+
+def test_facelet_codes_round_trip():
+
+    cube = Cube()
+    cube.apply_algorithm("R U2 F'")
+    data = facelets_to_codes([cube.facelets() + "\n", b"UUU\n", Cube().facelets()])
+
+    assert len(data) == 3 * 54
+    assert data[:54] == cube.key() and data[108:] == SOLVED_STICKERS
+    assert check_stickers(data[54:108]) == 0
+    assert codes_to_facelets(data[:54] + data[108:]).decode() == cube.facelets() + "\n" + Cube().facelets() + "\n"
+
+def test_read_facelets_in_chunks():
+
+    lines = [Cube().facelets()] * 5 + ["bad"] + [Cube().facelets()] * 4
+    chunks = list(read_facelets(io.BytesIO(("\n".join(lines) + "\n").encode()), chunk_size = 4, use_numpy = False))
+
+    assert [start for start, data, invalid in chunks] == [0, 4, 8]
+    assert [len(data) // 54 for start, data, invalid in chunks] == [4, 4, 2]
+    assert [invalid for start, data, invalid in chunks] == [[], [(5, REASONS[0])], []]
+
+def test_cube_from_facelets():
+
+    cube = Cube()
+    cube.apply_algorithm("R U R' U' M")
+    assert Cube.from_facelets(cube.facelets()) == cube
+
+    with pytest.raises(Exception):
+        Cube.from_facelets("UUU")
+
+    with pytest.raises(Exception):
+        Cube.from_facelets(codes_to_facelets(failing_lines()[7]).decode())
+
+def test_main_writes_valid_lines(tmp_path, capsys):
+
+    source = tmp_path / "cubes.txt"
+    valid = tmp_path / "valid.txt"
+    source.write_bytes(codes_to_facelets(b"".join(failing_lines()[1:] + scrambled_lines(3))))
+
+    main([str(source), "--chunk-size", "4", "--valid-output", str(valid), "--no-numpy"])
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[-1] == "10 lines read, 7 invalid"
+    assert out[:-1] == [str(i) + ": " + REASONS[i + 1] for i in range(7)]
+    assert valid.read_bytes() == codes_to_facelets(b"".join(scrambled_lines(3)))
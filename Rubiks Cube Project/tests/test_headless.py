@@ -0,0 +1,53 @@
+"""
+Tests of the headless mode of PlayRubiksCube
+
+"""
+
+from PlayRubiksCube import main, read_lines, run_lines
+from RubiksCube import Cube
+
+def states(lines, cumulative = False, seed = None):
+    return [(cube.facelets(), error) for cube, error in run_lines(lines, cumulative, seed)]
+
+def test_every_line_starts_from_solved():
+
+    expected = Cube()
+    expected.apply_algorithm("R U")
+    results = states(["R U", "R U"])
+    assert results == [(expected.facelets(), None)] * 2
+
+def test_cumulative_lines_continue():
+
+    expected = Cube()
+    expected.apply_algorithm("R U R U")
+    assert states(["R U", "R U"], cumulative = True)[-1] == (expected.facelets(), None)
+
+def test_long_scrambles_are_not_limited():
+    assert states(["scramble 20001 1"])[0][1] is None
+
+def test_scrambles_are_seeded():
+
+    assert states(["scramble 20"], seed = 3) == states(["scramble 20"], seed = 3)
+    assert states(["scramble 20 9"]) == states(["scramble 20 9"])
+    assert states(["scramble 20 9"]) != states(["scramble 20 10"])
+
+def test_bad_lines_give_errors():
+
+    results = states(["R Q", "scramble 1 2 3", "scramble many"])
+
+    for facelets, error in results:
+        assert error is not None
+
+def test_main_streams_files(tmp_path, capsys):
+
+    path = tmp_path / "moves.txt"
+    path.write_text("# a comment\nR\n\nscramble 5 1\n")
+    assert list(read_lines([str(path)])) == ["R", "scramble 5 1"]
+
+    main(["--headless", str(path), "--format", "key"])
+    lines = capsys.readouterr().out.splitlines()
+
+    expected = Cube()
+    expected.apply_algorithm("R")
+    assert lines[0] == expected.compact_key().hex()
+    assert len(lines) == 2
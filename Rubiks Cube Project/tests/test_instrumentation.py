@@ -0,0 +1,90 @@
+"""
+Tests of the Instrumentation module
+
+"""
+
+import json
+import pytest
+import Instrumentation
+from Instrumentation import disable, enable, is_enabled, measure
+from Matrix import matrix_mul
+from RubiksCube import Cube, Piece
+
+def test_moves_and_pieces_are_counted():
+
+    cube = Cube()
+
+    with measure() as stats:
+        cube.apply_move(0)
+        cube.apply_algorithm("R U R' U'")
+        cube.turn("x", 90, "degrees")
+
+    # a face turn moves 9 pieces and an entire cube turn all 26
+    assert stats.moves == 6
+    assert stats.pieces_touched == 9 * 5 + 26
+    assert stats.calls["Cube.apply_algorithm"] == 1
+    assert stats.calls["Cube.turn"] == 1
+    assert json.loads(stats.to_json())["moves"] == 6
+    assert "moves=6" in stats.log_line()
+
+def test_matrix_muls_are_counted_through_other_modules():
+
+    piece = Piece([[1], [1], [1]], ["red", "white", "green"])
+
+    with measure() as stats:
+        piece.rotate("x", 90, "degrees")
+        matrix_mul([[1]], [[1]])
+
+    assert stats.matrix_muls == 2
+
+def test_turning_off_puts_the_original_functions_back():
+
+    original = Cube.apply_move
+    enable()
+
+    assert is_enabled()
+    assert Cube.apply_move is not original
+
+    with pytest.raises(Exception):
+        enable()
+
+    disable()
+    assert not is_enabled()
+    assert Cube.apply_move is original
+
+def test_failing_call_keeps_its_exception_and_is_not_counted():
+
+    cube = Cube()
+
+    with measure() as stats:
+
+        with pytest.raises(Exception, match = "Unknown move 'Q'"):
+            cube.apply_algorithm("R Q")
+
+    assert stats.moves == 0
+    assert stats.calls["Cube.apply_algorithm"] == 1
+    assert cube == Cube()
+
+def test_call_that_raises_after_compiling_is_not_counted():
+
+    # stickers that are too short make applying the compiled algorithm fail
+    cube = Cube()
+    cube.stickers = b"short"
+
+    with measure() as stats:
+
+        with pytest.raises(IndexError):
+            cube.apply_algorithm(algorithm = "R U")
+
+    assert stats.moves == 0
+    assert stats.calls["Cube.apply_algorithm"] == 1
+
+def test_log_interval_logs_through_the_rubiks_logger(caplog):
+
+    with caplog.at_level("INFO", logger = "rubiks"):
+
+        with measure(log_interval = 0):
+            Cube().apply_move(0)
+
+    assert any(["moves=" in record.message for record in caplog.records])
+    assert Instrumentation.active is None
@@ -0,0 +1,109 @@
+"""
+Tests of the Journal module
+
+"""
+
+import random
+import pytest
+from Journal import MoveJournal
+from MoveTables import MOVES, NAMED_MOVES
+from RubiksCube import Cube
+
+def test_undo_and_redo_step_through_the_history():
+
+    cube = Cube()
+    journal = MoveJournal(cube)
+    journal.apply_move(NAMED_MOVES["R"])
+    journal.apply_move(NAMED_MOVES["U"])
+    after = cube.copy()
+
+    assert journal.undo() and journal.undo()
+    assert cube == Cube()
+    assert not journal.undo()
+
+    assert journal.redo() and journal.redo()
+    assert cube == after
+    assert not journal.redo()
+
+def test_new_move_after_undo_forgets_the_redo():
+
+    cube = Cube()
+    journal = MoveJournal(cube)
+    journal.apply_algorithm("R U F")
+    journal.undo()
+    journal.apply_move(NAMED_MOVES["D"])
+
+    assert len(journal) == 3
+    assert not journal.redo()
+
+    expected = Cube()
+    expected.apply_algorithm("R U D")
+    assert cube == expected
+
+def test_record_skips_moves_that_did_nothing():
+
+    cube = Cube()
+    journal = MoveJournal(cube)
+    journal.record(cube.turn("x", 360, "degrees"))
+    journal.record(cube.turn("x", 90, "degrees"))
+    assert len(journal) == 1
+
+def test_jump_reaches_every_state():
+
+    rng = random.Random(6)
+    cube = Cube()
+    journal = MoveJournal(cube, snapshot_interval = 8)
+    states = [cube.stickers]
+
+    for n in range(100):
+        journal.apply_move(rng.randrange(len(MOVES)))
+        states.append(cube.stickers)
+
+    for n in (0, 99, 7, 8, 64, 100, 33):
+        journal.jump(n)
+        assert cube.stickers == states[n]
+        assert journal.position == n
+
+    with pytest.raises(Exception):
+        journal.jump(101)
+
+def test_max_moves_forgets_the_oldest_moves():
+
+    rng = random.Random(7)
+    cube = Cube()
+    journal = MoveJournal(cube, snapshot_interval = 8, max_moves = 50)
+    states = [cube.stickers]
+
+    for n in range(500):
+        journal.apply_move(rng.randrange(len(MOVES)))
+        states.append(cube.stickers)
+        assert len(journal) <= 50
+
+    # the kept history ends at the current state and replays to the states it was made of
+    kept = len(journal)
+
+    for n in range(kept + 1):
+        journal.jump(n)
+        assert cube.stickers == states[len(states) - 1 - kept + n]
+
+    with pytest.raises(Exception):
+        MoveJournal(cube, max_moves = 0)
+
+def test_max_moves_with_long_algorithms():
+
+    cube = Cube()
+    journal = MoveJournal(cube, max_moves = 10)
+
+    for n in range(5):
+        journal.apply_algorithm("(R U R' U' F)4")
+
+    end = cube.stickers
+    assert len(journal) <= 10
+
+    while journal.undo():
+        pass
+
+    while journal.redo():
+        pass
+
+    assert cube.stickers == end
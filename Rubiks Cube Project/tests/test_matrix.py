@@ -0,0 +1,40 @@
+"""
+Tests of the matrix backends of the Matrix module
+
+"""
+
+import pytest
+import Matrix
+from Matrix import fast_matrix_mul, general_matrix_mul, matrix_positions, positions_matrix
+from RotationMatrices import ROTATIONS
+
+POSITIONS = [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)]
+
+def test_fast_backend_matches_general_multiplication():
+
+    for r in ROTATIONS:
+        assert fast_matrix_mul([[1], [0], [-1]], r) == general_matrix_mul([[1], [0], [-1]], r)
+
+        batch = positions_matrix(POSITIONS)
+        assert fast_matrix_mul(batch, r) == general_matrix_mul(batch, r)
+
+def test_other_sizes_fall_back_on_general_multiplication():
+
+    m1 = [[1, 2], [3, 4]]
+    m2 = [[5, 6], [7, 8]]
+    assert fast_matrix_mul(m1, m2) == general_matrix_mul(m1, m2) == [[23, 34], [31, 46]]
+
+    with pytest.raises(Exception):
+        general_matrix_mul([[1, 2, 3]], [[1, 2]])
+
+def test_positions_round_trip():
+    assert matrix_positions(positions_matrix(POSITIONS)) == POSITIONS
+
+def test_numpy_backend_matches(monkeypatch):
+
+    numpy = pytest.importorskip("numpy")
+    monkeypatch.setattr(Matrix, "numpy", numpy, raising = False)
+    batch = positions_matrix(POSITIONS)
+
+    for r in ROTATIONS:
+        assert Matrix.numpy_matrix_mul(batch, r) == general_matrix_mul(batch, r)
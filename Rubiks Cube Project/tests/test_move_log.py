@@ -0,0 +1,107 @@
+"""
+Tests of the MoveLog module
+
+"""
+
+import random
+import pytest
+from Journal import MoveJournal
+from MoveLog import HEADER_SIZE, MoveLogReader, MoveLogWriter, main, save_journal
+from MoveTables import MOVES, apply_move
+from RubiksCube import Cube, SOLVED_STICKERS
+
+# writes random moves to a move log and returns the moves and the stickers after every move
+def write_log(path, count, interval, start = SOLVED_STICKERS):
+
+    rng = random.Random(count)
+    moves = [rng.randrange(len(MOVES)) for _ in range(count)]
+    states = [start]
+
+    with MoveLogWriter(str(path), start, interval) as writer:
+
+        for move in moves:
+            writer.append(move)
+            states.append(apply_move(states[-1], move))
+
+    return moves, states
+
+def test_moves_and_states_round_trip(tmp_path):
+
+    path = tmp_path / "moves.log"
+    moves, states = write_log(path, 50, 8)
+
+    with MoveLogReader(str(path)) as reader:
+        assert len(reader) == 50 and reader.num_blocks == 7 and reader.interval == 8
+        assert list(reader.moves()) == moves
+        assert list(reader.moves(5, 21)) == moves[5:21]
+        assert reader.move(49) == moves[49]
+        assert all([reader.stickers_at(n) == states[n] for n in range(51)])
+        assert list(reader.replay(13, 30)) == [(n, states[n]) for n in range(14, 31)]
+        assert reader.cube_at(50) == Cube.from_key(states[50])
+        assert reader.verify() == 50
+
+        with pytest.raises(Exception):
+            reader.stickers_at(51)
+
+def test_empty_log_and_custom_start(tmp_path):
+
+    start = apply_move(SOLVED_STICKERS, 3)
+    path = tmp_path / "moves.log"
+    moves, states = write_log(path, 0, 4, start)
+
+    with MoveLogReader(str(path)) as reader:
+        assert len(reader) == 0 and reader.num_blocks == 0
+        assert reader.stickers_at(0) == start
+
+def test_damaged_blocks_are_found(tmp_path):
+
+    path = tmp_path / "moves.log"
+    write_log(path, 20, 8)
+
+    with open(path, "r+b") as f:
+        f.seek(HEADER_SIZE + (4 + 8 + 54 + 4) + 6)
+        f.write(b"\x00")
+
+    with MoveLogReader(str(path)) as reader:
+        assert reader.stickers_at(8) is not None
+
+        with pytest.raises(Exception, match = "Block 1"):
+            reader.stickers_at(10)
+
+        with pytest.raises(Exception, match = "Block 1"):
+            reader.verify()
+
+def test_files_that_are_not_move_logs_are_refused(tmp_path):
+
+    path = tmp_path / "other.log"
+    path.write_bytes(b"")
+
+    with pytest.raises(Exception):
+        MoveLogReader(str(path))
+
+    path.write_bytes(b"x" * 100)
+
+    with pytest.raises(Exception):
+        MoveLogReader(str(path))
+
+def test_save_journal(tmp_path):
+
+    cube = Cube()
+    journal = MoveJournal(cube)
+    journal.apply_algorithm("R U R' U' F2")
+    journal.undo()
+
+    path = tmp_path / "journal.log"
+    save_journal(journal, str(path), interval = 3)
+
+    with MoveLogReader(str(path)) as reader:
+        assert list(reader.moves()) == list(journal.moves[:journal.position])
+        assert reader.cube_at(len(reader)) == cube
+
+def test_main_prints_the_state(tmp_path, capsys):
+
+    path = tmp_path / "moves.log"
+    moves, states = write_log(path, 10, 4)
+    main([str(path), "--verify", "--state", "7", "--format", "key"])
+
+    assert capsys.readouterr().out.splitlines() == ["10 moves, 3 checkpoints every 4 moves", "every block is intact", Cube.from_key(states[7]).compact_key().hex()]
@@ -0,0 +1,121 @@
+"""
+Tests of the MoveTables module and of moving a Cube with its sticker permutations
+
+"""
+
+from math import pi
+from MoveTables import AXES, FRONT_POSITIONS, INVERSE_MOVES, LAYERS, LAYER_POSITIONS, MOVES, MOVE_IDS, NAMED_MOVES, PERMS, PIECE_STICKERS, apply_move, compose, inverse
+from RubiksCube import Cube
+
+SOLVED = Cube().stickers
+
+# returns a cube moved by the moves with the given names
+def moved_cube(names):
+
+    cube = Cube()
+
+    for name in names:
+        cube.apply_move(NAMED_MOVES[name])
+
+    return cube
+
+def test_moves_are_permutations():
+
+    assert len(MOVES) == 36
+
+    for p in PERMS:
+        assert sorted(p) == list(range(54))
+
+def test_inverse_moves_undo_moves():
+
+    for m in range(len(MOVES)):
+        assert apply_move(apply_move(SOLVED, m), INVERSE_MOVES[m]) == SOLVED
+
+def test_four_quarter_turns_are_no_move():
+
+    for m in range(len(MOVES)):
+
+        if MOVES[m][2] == 1:
+            stickers = SOLVED
+
+            for n in range(4):
+                stickers = apply_move(stickers, m)
+
+            assert stickers == SOLVED
+
+def test_compose_with_inverse_is_identity():
+
+    p = compose(compose(PERMS[NAMED_MOVES["R"]], PERMS[NAMED_MOVES["U"]]), PERMS[NAMED_MOVES["F'"]])
+    assert compose(p, inverse(p)) == tuple(range(54))
+
+# turning the pieces of a layer one at a time with rotation matrices, like the cube used to, gives the same cube as the move
+def test_moves_match_rotating_pieces():
+
+    cube = moved_cube(("R", "U'", "F2", "M", "x"))
+
+    for axis, layer, k in MOVES:
+        pieces = cube.pieces
+
+        for piece in pieces:
+
+            if layer is None or piece.pos[AXES.index(axis)][0] == layer:
+                piece.rotate(axis, pi / 2 * k)
+
+        moved = Cube()
+        moved.stickers = cube.stickers
+        moved.apply_move(MOVE_IDS[(axis, layer, k)])
+
+        for piece in pieces:
+            assert moved.get_piece((round(piece.x()), round(piece.y()), round(piece.z()))).colors == piece.colors
+
+def test_rotate_and_turn_return_the_applied_move():
+
+    cube = Cube()
+    move = cube.rotate(cube.get_face_piece(1), "x", -90, "degrees")
+    assert move == MOVE_IDS[("x", -1, 3)]
+    assert cube.stickers == apply_move(SOLVED, move)
+
+    before = cube.stickers
+    assert cube.turn("y", 360, "degrees") is None
+    assert cube.stickers == before
+
+    assert cube.turn("y", 90, "degrees") == MOVE_IDS[("y", None, 1)]
+    cube.turn("y", -90, "degrees")
+    assert cube.stickers == before
+
+    assert cube.turn("z", pi) == MOVE_IDS[("z", None, 2)]
+    assert cube.stickers == apply_move(before, MOVE_IDS[("z", None, 2)])
+
+def test_piece_index_covers_every_sticker_once():
+
+    assert len(PIECE_STICKERS) == 26
+
+    for pos, stickers in PIECE_STICKERS.items():
+        assert len([s for s in stickers if s is not None]) == sum([abs(c) for c in pos])
+
+    assert sorted([s for stickers in PIECE_STICKERS.values() for s in stickers if s is not None]) == list(range(54))
+
+def test_layers_hold_the_pieces_of_a_slice():
+
+    cube = moved_cube(("R", "U", "S'"))
+
+    for axis in AXES:
+
+        for layer in LAYERS:
+            positions = LAYER_POSITIONS[(axis, layer)]
+            assert len(positions) == (8 if layer == 0 else 9)
+            assert all([pos[AXES.index(axis)] == layer for pos in positions])
+            assert [piece.colors for piece in cube.get_layer(axis, layer)] == [cube.get_piece(pos).colors for pos in positions]
+
+# the front face pieces are numbered 1 through 9 in reading order, and get_face reads their front colors column by column
+def test_front_face_pieces_and_colors():
+
+    cube = moved_cube(("R", "U'", "L2", "F"))
+    assert [FRONT_POSITIONS[n][:2] for n in range(9)] == [(x, y) for y in (1, 0, -1) for x in (-1, 0, 1)]
+
+    face = cube.get_face()
+
+    for n in range(1, 10):
+        piece = cube.get_face_piece(n)
+        assert piece.z() == -1
+        assert face[(n - 1) % 3][(n - 1) // 3] == piece.z_color()[0]
@@ -0,0 +1,78 @@
+"""
+Tests of the Notation module
+
+"""
+
+import re
+import pytest
+from MoveTables import MOVE_IDS, NAMED_MOVES
+from Notation import MAX_MOVES, Algorithm, compile_algorithm, format_moves, parse, simplify
+from RubiksCube import Cube
+
+def test_parse_single_moves():
+
+    assert parse("R U' F2") == [NAMED_MOVES["R"], NAMED_MOVES["U'"], NAMED_MOVES["F2"]]
+    assert parse("M E S x y z") == [NAMED_MOVES[name] for name in ("M", "E", "S", "x", "y", "z")]
+    assert parse("") == []
+
+def test_wide_moves_turn_the_middle_slice():
+
+    assert parse("r") == parse("Rw") == [MOVE_IDS[("x", 1, 3)], MOVE_IDS[("x", 0, 3)]]
+    assert parse("R3") == parse("R'")
+    assert parse("R4") == []
+
+def test_groups_and_repeats():
+
+    assert parse("(R U)3") == parse("R U R U R U")
+    assert parse("(R U)'") == parse("U' R'")
+    assert parse("((R)2 U)2") == parse("R R U R R U")
+    assert parse("R(U)") == parse("R U")
+
+def test_errors_give_positions():
+
+    for text, message in (("R Q", "Unknown move 'Q' at position 2"), ("(R U", "Missing ')'"), ("R)", "Unmatched ')' at position 1")):
+
+        with pytest.raises(Exception, match = re.escape(message)):
+            parse(text)
+
+def test_huge_repeats_are_refused_before_they_are_built():
+
+    with pytest.raises(Exception, match = "repeats to more than"):
+        parse("(R)999999999")
+
+    with pytest.raises(Exception, match = "repeats to more than"):
+        parse("((R U)1000)1000")
+
+    assert len(parse("(R U)" + str(MAX_MOVES // 2))) == MAX_MOVES
+
+    with pytest.raises(Exception):
+        parse("R U F", 2)
+
+def test_simplify_merges_and_cancels():
+
+    assert simplify(parse("R R")) == parse("R2")
+    assert simplify(parse("R L R'")) == parse("L")
+    assert simplify(parse("R U U' R'")) == []
+    assert format_moves(simplify(parse("U U U"))) == "U'"
+
+def test_algorithm_matches_moves_one_at_a_time():
+
+    text = "R U R' U' F2 M E' x y2 (r U)2"
+    algorithm = Algorithm(text)
+
+    one_at_a_time = Cube()
+
+    for move in parse(text):
+        one_at_a_time.apply_move(move)
+
+    compiled = Cube()
+    compiled.apply_algorithm(algorithm)
+    assert compiled == one_at_a_time
+
+    compiled.apply_algorithm(algorithm.inverse())
+    assert compiled == Cube()
+
+def test_compiled_algorithms_are_cached():
+
+    assert compile_algorithm("R U R'") is compile_algorithm("R U R'")
+    assert compile_algorithm([NAMED_MOVES["R"]]).moves == [NAMED_MOVES["R"]]
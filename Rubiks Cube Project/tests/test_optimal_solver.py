@@ -0,0 +1,84 @@
+"""
+Tests of the OptimalSolver module
+- Databases of depth 2 are used, which are quick to build and still give optimal solutions, only more slowly
+
+"""
+
+import random
+import pytest
+from MoveTables import NAMED_MOVES, apply_move
+from OptimalSolver import OptimalSolver, announce, build_database
+from RubiksCube import Cube
+from TwoPhaseSolver import FACE_MOVES
+
+@pytest.fixture(scope = "module")
+def solver():
+    return OptimalSolver(max_depth = 2)
+
+def is_solved(stickers):
+    return all([len(set(stickers[f * 9:f * 9 + 9])) == 1 for f in range(6)])
+
+# the length of a shortest solution found by trying every sequence of face moves, up to max_length moves
+def brute_force_length(stickers, max_length):
+
+    level = set([stickers])
+
+    for length in range(max_length + 1):
+
+        if any([is_solved(s) for s in level]):
+            return length
+
+        level = set([apply_move(s, m) for s in level for m in FACE_MOVES])
+
+    return None
+
+def test_solved_cube_needs_no_moves(solver):
+    assert solver.solve(Cube()) == []
+
+def test_solutions_are_shortest(solver):
+
+    rng = random.Random(5)
+
+    for n in range(6):
+        cube = Cube()
+
+        for m in range(3):
+            cube.apply_move(rng.choice(FACE_MOVES))
+
+        solution = solver.solve(cube)
+        assert len(solution) == brute_force_length(cube.stickers, 3)
+
+        for name in solution:
+            cube.apply_move(NAMED_MOVES[name])
+
+        assert is_solved(cube.stickers)
+
+def test_report_counts_nodes(solver):
+
+    cube = Cube()
+    cube.apply_algorithm("R U2 F'")
+    solution = solver.solve(cube)
+    report = solver.report()
+    assert report["length"] == len(solution) == 3
+    assert report["nodes"] > 0
+
+def test_loading_built_tables_prints_nothing(solver, capsys):
+
+    OptimalSolver(max_depth = 2)
+    assert capsys.readouterr().err == ""
+
+def test_builds_report_their_progress(capsys):
+
+    assert announce("test table", lambda: [1, 2])() == [1, 2]
+    err = capsys.readouterr().err
+    assert "Building the test table" in err
+    assert "Built the test table in" in err
+
+    build = lambda: None
+    assert announce("test", build, False) is build
+
+    # a chain of 4 states, where every state leads to the next one
+    depths = []
+    database = build_database(4, 0, 0, lambda state: [(state + 1, state + 1)] if state < 3 else [], None, lambda depth, states: depths.append((depth, states)))
+    assert depths == [(1, 1), (2, 1), (3, 1), (4, 0)]
+    assert len(database) > 0
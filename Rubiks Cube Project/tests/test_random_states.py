@@ -0,0 +1,50 @@
+"""
+Tests of the RandomStates module
+
+"""
+
+import io
+import pytest
+from Cubies import ENCODED_BYTES, CubieCube, perm_parity, perm_unrank
+from RandomStates import random_states, rank_parity, write_states
+
+def test_states_are_solvable():
+
+    for cube in random_states(200, seed = 1):
+        assert CubieCube.from_stickers(cube.stickers).is_solvable()
+
+    for cube in random_states(200, seed = 2, any_orientation = True):
+        assert CubieCube.from_stickers(cube.stickers).is_solvable()
+
+def test_face_pieces_stay_unless_any_orientation():
+
+    assert set([CubieCube.from_stickers(cube.stickers).centers for cube in random_states(50, seed = 3)]) == set([0])
+    assert len(set([CubieCube.from_stickers(cube.stickers).centers for cube in random_states(200, seed = 3, any_orientation = True)])) > 1
+
+def test_rank_parity_matches_permutations():
+
+    for rank in range(0, 40320, 997):
+        assert rank_parity(rank, 8) == perm_parity(perm_unrank(rank, 8))
+
+def test_seed_gives_the_same_states_in_every_format():
+
+    values = list(random_states(20, seed = 4, state_format = "int"))
+    assert list(random_states(20, seed = 4, state_format = "int")) == values
+    assert list(random_states(20, seed = 4, state_format = "key")) == [v.to_bytes(ENCODED_BYTES, "big") for v in values]
+    assert [cube.encode() for cube in random_states(20, seed = 4)] == values
+    assert len(set(values)) == 20
+
+    with pytest.raises(Exception):
+        next(random_states(1, state_format = "nope"))
+
+def test_write_states_in_blocks():
+
+    text = io.StringIO()
+    write_states(text, 10, seed = 5, block_size = 3)
+    lines = text.getvalue().splitlines()
+    assert len(lines) == 10
+    assert [bytes.fromhex(line) for line in lines] == list(random_states(10, seed = 5, state_format = "key"))
+
+    binary = io.BytesIO()
+    write_states(binary, 10, seed = 5, state_format = "binary", block_size = 4)
+    assert binary.getvalue() == b"".join([bytes.fromhex(line) for line in lines])
@@ -0,0 +1,93 @@
+"""
+Tests of the Renderer module, drawing into a string instead of a terminal
+
+"""
+
+import io
+import os
+import shutil
+from Renderer import CLEAR, PALETTE_STYLES, Renderer, cube_frame, face_frame, text_frame
+from RubiksCube import Cube
+
+def make_renderer():
+    return Renderer(io.StringIO(), truecolor = False)
+
+# the output written since the last call, emptying the buffer
+def take(renderer):
+
+    text = renderer.output.getvalue()
+    renderer.output.seek(0)
+    renderer.output.truncate()
+    return text
+
+def test_first_frame_clears_the_screen():
+
+    renderer = make_renderer()
+    renderer.draw(text_frame(["abc", "def"]))
+    output = take(renderer)
+    assert output.startswith(CLEAR)
+    assert "abc" in output and "def" in output
+
+def test_only_changed_cells_are_redrawn():
+
+    renderer = make_renderer()
+    renderer.draw(text_frame(["abc", "def"]))
+    take(renderer)
+
+    renderer.draw(text_frame(["abc", "def"]))
+    assert take(renderer) == "\x1b[3;1H\x1b[J"
+
+    renderer.draw(text_frame(["abc", "dXf"]))
+    output = take(renderer)
+    assert CLEAR not in output
+    assert output.startswith("\x1b[2;2HX")
+
+def test_prompts_that_scroll_force_a_full_redraw(monkeypatch):
+
+    monkeypatch.setattr(shutil, "get_terminal_size", lambda: os.terminal_size((80, 24)))
+    renderer = make_renderer()
+    frame = text_frame(["x" * 10] * 14)
+    renderer.draw(frame)
+    take(renderer)
+
+    # a short prompt fits under the frame, so the next draw is incremental
+    renderer.wrote_below("What do you want to do? \n(enter 'commands' for a list of commands)")
+    renderer.wrote_below("rotate")
+    renderer.draw(frame)
+    assert not take(renderer).startswith(CLEAR)
+
+    for n in range(4):
+        renderer.wrote_below("What axis do you want to rotate about? \n(enter either 'x', 'y', or 'z')")
+        renderer.wrote_below("x")
+
+    renderer.draw(frame)
+    assert take(renderer).startswith(CLEAR)
+
+def test_long_lines_take_more_than_one_row(monkeypatch):
+
+    monkeypatch.setattr(shutil, "get_terminal_size", lambda: os.terminal_size((10, 24)))
+    renderer = make_renderer()
+    renderer.draw(text_frame(["x"] * 20))
+    renderer.wrote_below("y" * 35)
+    assert renderer.previous is None
+
+def test_clear_forgets_the_frame():
+
+    renderer = make_renderer()
+    renderer.draw(text_frame(["abc"]))
+    renderer.clear()
+    take(renderer)
+    renderer.draw(text_frame(["abc"]))
+    assert take(renderer).startswith(CLEAR)
+
+def test_frames_color_the_stickers():
+
+    cube = Cube()
+    frame = face_frame(cube)
+
+    # the front face of a solved cube is green, the color code of F
+    assert frame[2][1][0] == PALETTE_STYLES[2]
+
+    frame = cube_frame(cube)
+    styles = set([cell[0] for row in frame[1:] for cell in row if cell[0]])
+    assert styles == set(PALETTE_STYLES[:6])
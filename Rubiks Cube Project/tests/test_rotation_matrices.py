@@ -0,0 +1,70 @@
+"""
+Tests of the RotationMatrices module
+
+"""
+
+from math import cos, pi, sin
+import pytest
+from Matrix import matrix_mul
+from RotationMatrices import COLOR_ORDERS, COMPOSE, INVERSE, QUARTER_TURNS, ROTATIONS, quarter_turns, rotate_x_matrix, rotate_y_matrix, rotate_z_matrix, rotation_index
+
+def test_quarter_turns():
+
+    assert quarter_turns(pi / 2) == 1
+    assert quarter_turns(-pi / 2) == 3
+    assert quarter_turns(5 * pi) == 2
+    assert quarter_turns(-90, "degrees") == 3
+    assert quarter_turns(720, "degrees") == 0
+
+    with pytest.raises(Exception):
+        quarter_turns(pi / 3)
+
+    with pytest.raises(Exception):
+        quarter_turns(45, "degrees")
+
+def test_rotations_are_the_24_rotations_of_the_cube():
+
+    assert len(ROTATIONS) == 24
+    assert all([ROTATIONS.count(m) == 1 for m in ROTATIONS])
+
+    for a in range(24):
+        assert INVERSE[INVERSE[a]] == a
+        assert matrix_mul(ROTATIONS[a], ROTATIONS[INVERSE[a]]) == ROTATIONS[0]
+
+        for b in range(24):
+            assert ROTATIONS[COMPOSE[a][b]] == matrix_mul(ROTATIONS[a], ROTATIONS[b])
+
+# the exact matrices are the trigonometric ones with the rounding error taken out
+def test_quarter_turns_match_trig_matrices():
+
+    for k in range(4):
+        angle = k * pi / 2
+        c = round(cos(angle))
+        s = round(sin(angle))
+
+        assert rotate_x_matrix(angle) == [[1, 0, 0], [0, c, s], [0, -s, c]]
+        assert rotate_y_matrix(angle) == [[c, 0, -s], [0, 1, 0], [s, 0, c]]
+        assert rotate_z_matrix(angle) == [[c, s, 0], [-s, c, 0], [0, 0, 1]]
+        assert rotation_index("y", k * 90, "degrees") == QUARTER_TURNS[("y", k)]
+
+    with pytest.raises(Exception):
+        rotation_index("w", pi)
+
+def test_color_orders_follow_the_axes():
+
+    # a quarter turn about x swaps the colors facing y and z, and a half turn keeps every color on its axis
+    assert COLOR_ORDERS[QUARTER_TURNS[("x", 1)]] == (0, 2, 1)
+    assert COLOR_ORDERS[QUARTER_TURNS[("z", 3)]] == (1, 0, 2)
+    assert COLOR_ORDERS[QUARTER_TURNS[("y", 2)]] == (0, 1, 2)
+    assert all([sorted(order) == [0, 1, 2] for order in COLOR_ORDERS])
+
+def test_rotate_matrix_functions_return_new_matrices():
+
+    matrix = rotate_x_matrix(pi / 2)
+    assert matrix is not rotate_x_matrix(pi / 2)
+
+    matrix[0][0] = 5
+    rotate_z_matrix(pi)[1][1] = 5
+    assert rotate_x_matrix(pi / 2)[0][0] == 1
+    assert rotate_z_matrix(pi) == [[-1, 0, 0], [0, -1, 0], [0, 0, 1]]
+    assert all([abs(n) <= 1 for m in ROTATIONS for column in m for n in column])
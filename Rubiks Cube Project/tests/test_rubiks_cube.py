@@ -0,0 +1,134 @@
+"""
+Tests of the Cube and Piece objects of the RubiksCube module
+
+"""
+
+import copy
+import random
+import pytest
+from MoveTables import FACES, MOVES, MOVE_FACES, NAMED_MOVES
+from Notation import Algorithm, compile_algorithm
+from RubiksCube import COLORS, COLOR_CODES, Cube, Piece, SOLVED_STICKERS, VIEW_FACES
+
+# returns the faces of a cube read by a new cube with the same stickers, which has nothing cached
+def fresh_faces(cube):
+    return Cube.from_key(cube.stickers).get_faces()
+
+def test_colors_are_small_codes():
+
+    assert COLORS[-1] == "empty"
+    assert [COLOR_CODES[c] for c in COLORS] == list(range(7))
+    assert SOLVED_STICKERS == bytes([n // 9 for n in range(54)])
+    assert Cube().stickers == SOLVED_STICKERS
+
+def test_pieces_store_color_codes():
+
+    piece = Piece([[1], [1], [-1]], ["red", "white", "green"])
+    assert piece.codes == bytes([COLOR_CODES["red"], COLOR_CODES["white"], COLOR_CODES["green"]])
+    assert piece.colors == ["red", "white", "green"]
+
+    piece.rotate("y", 90, "degrees")
+    assert (piece.x(), piece.y(), piece.z()) == (1, 1, 1)
+    assert [piece.x_color(), piece.y_color(), piece.z_color()] == ["green", "white", "red"]
+
+    with pytest.raises(AttributeError):
+        piece.other = 1
+
+def test_keys_copies_and_equality():
+
+    cube = Cube()
+    cube.apply_move(NAMED_MOVES["R"])
+    same = Cube.from_key(cube.key())
+
+    assert same == cube and hash(same) == hash(cube)
+    assert same != Cube()
+    assert len(set([cube, same, Cube()])) == 2
+
+    for other in (cube.copy(), copy.copy(cube), copy.deepcopy(cube)):
+        assert other == cube
+        other.apply_move(NAMED_MOVES["U"])
+        assert other != cube
+
+    with pytest.raises(Exception):
+        Cube.from_key(b"short")
+
+# the faces are read the way print_cube() used to, by turning the entire cube until every face is at the front
+def test_faces_match_turning_the_cube():
+
+    cube = Cube()
+    cube.apply_algorithm("R U2 F' M D L2 b")
+    turned = cube.copy()
+    expected = []
+
+    for turns in ((), ("x",), ("x",), ("x",), ("x", "y"), ("y", "y")):
+
+        for axis in turns:
+            turned.turn(axis, 90, "degrees")
+
+        expected.append(Cube.from_key(turned.stickers).get_face())
+
+    assert list(cube.get_faces()) == expected
+    assert [cube.get_face(face) for face in VIEW_FACES] == expected
+    assert all([[len(set(column)) for column in face] == [1, 1, 1] for face in Cube().get_faces()])
+
+def test_moves_only_touch_their_faces():
+
+    # every sticker is told apart from the others, so a face that only turns in place is seen to change
+    numbered = bytes(range(54))
+
+    for m in range(len(MOVES)):
+        cube = Cube.from_key(numbered)
+        cube.apply_move(m)
+
+        for f in range(len(FACES)):
+            changed = cube.stickers[f * 9:f * 9 + 9] != numbered[f * 9:f * 9 + 9]
+            assert changed == bool(MOVE_FACES[m] & 1 << f)
+
+    algorithm = Algorithm("R U")
+    assert algorithm.faces == MOVE_FACES[NAMED_MOVES["R"]] | MOVE_FACES[NAMED_MOVES["U"]]
+    assert algorithm.inverse().faces == algorithm.faces
+    assert Algorithm("R R'").faces == 0
+
+# reading faces in between moves, algorithms, and copies always gives the faces of the current stickers
+def test_cached_faces_follow_moves_algorithms_and_copies():
+
+    rng = random.Random(11)
+    algorithms = [compile_algorithm(text) for text in ("R U R' U'", "M2 E2 S2", "x y'", "F2 B2", "r U' l'", "D")]
+    cubes = [Cube()]
+
+    for n in range(1500):
+        cube = rng.choice(cubes)
+        action = rng.randrange(6)
+
+        if action == 0:
+            cube.apply_move(rng.randrange(len(MOVES)))
+
+        elif action == 1:
+            cube.apply_algorithm(rng.choice(algorithms))
+
+        elif action == 2:
+            face = rng.choice(VIEW_FACES)
+            assert cube.get_face(face) == fresh_faces(cube)[VIEW_FACES.index(face)]
+
+        elif action == 3:
+            assert cube.get_faces() == fresh_faces(cube)
+
+        elif action == 4 and len(cubes) < 4:
+            cubes.append(rng.choice([cube.copy(), copy.copy(cube), copy.deepcopy(cube)]))
+
+        else:
+            cube.init_cube()
+
+    for cube in cubes:
+        assert cube.get_faces() == fresh_faces(cube)
+
+def test_copies_keep_their_own_cache():
+
+    cube = Cube()
+    cube.apply_move(NAMED_MOVES["R"])
+    before = cube.get_faces()
+    other = cube.copy()
+    other.apply_move(NAMED_MOVES["U"])
+
+    assert other.get_faces() == fresh_faces(other) != before
+    assert cube.get_faces() == before == fresh_faces(cube)
@@ -0,0 +1,121 @@
+"""
+Tests of the Server module and the Commands module it shares with the headless mode of PlayRubiksCube
+
+"""
+
+import asyncio
+import random
+import pytest
+from Commands import format_state, scramble_cube
+from RubiksCube import Cube
+from Server import COMMAND_MOVE_LIMIT, HISTORY_LIMIT, LINE_LIMIT, Connection, CubeServer, SessionStore
+
+# runs command lines for one connection and returns the answers
+def run(server, lines, connection = None):
+
+    connection = connection if connection is not None else Connection()
+    return [server.execute(connection, line) for line in lines]
+
+# sends data to a server listening on a free port and returns every answer line until the server closes the connection
+def exchange(data):
+
+    async def main():
+
+        server = CubeServer()
+        listener = await server.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", listener.sockets[0].getsockname()[1])
+        writer.write(data)
+        writer.write_eof()
+        answers = (await reader.read()).decode().splitlines()
+        writer.close()
+        listener.close()
+        server.sweeper.cancel()
+        return answers
+
+    return asyncio.run(main())
+
+def test_scramble_and_state_commands():
+
+    cube = Cube()
+    scramble_cube(cube, ["scramble", "20", "5"], random.Random())
+    same = Cube()
+    scramble_cube(same, ["scramble", "20", "5"], random.Random())
+    assert cube == same
+    assert format_state(cube, "key") == cube.compact_key().hex()
+    assert format_state(cube) == cube.facelets()
+
+    # scrambles have no limit unless one is given, as the Server does
+    scramble_cube(cube, ["scramble", "20001"], random.Random())
+
+    with pytest.raises(Exception, match = "at most 20000 moves"):
+        scramble_cube(cube, ["scramble", "20001"], random.Random(), 20000)
+
+    with pytest.raises(Exception):
+        scramble_cube(cube, ["scramble", "1", "2", "3"], random.Random())
+
+def test_session_commands():
+
+    server = CubeServer()
+    answers = run(server, ["state", "new", "moves R U R' U'", "solved", "undo", "redo", "reset", "solved", "moves x", "solved", "ping", "bogus", ""])
+
+    assert answers[0].startswith("error: No session")
+    assert answers[1].startswith("ok ")
+    assert answers[2:11] == ["ok 4", "ok no", "ok yes", "ok yes", "ok", "ok yes", "ok 1", "ok yes", "ok pong"]
+    assert answers[11] == "error: Unknown command bogus"
+    assert answers[12] == "error: Empty command"
+
+def test_sessions_are_shared_by_id():
+
+    server = CubeServer()
+    session_id = run(server, ["new"])[0].split()[1]
+    run(server, ["open " + session_id, "moves R"])
+
+    expected = Cube()
+    expected.apply_algorithm("R")
+    assert run(server, ["open " + session_id, "state"]) == ["ok " + session_id, "ok " + expected.facelets()]
+    assert run(server, ["open " + session_id, "close", "state", "open " + session_id])[1:] == ["ok", "error: No session is being used, start one with new or open one with open", "error: There is no session with that id"]
+
+def test_commands_are_limited():
+
+    server = CubeServer()
+    connection = Connection()
+    run(server, ["new"], connection)
+
+    answers = run(server, ["moves (R)999999999", "moves (R U)" + str(COMMAND_MOVE_LIMIT), "scramble " + str(COMMAND_MOVE_LIMIT + 1), "state"], connection)
+    assert answers[0].startswith("error: ") and answers[1].startswith("error: ") and answers[2].startswith("error: ")
+    assert answers[3] == "ok " + Cube().facelets()
+
+def test_history_is_limited():
+
+    server = CubeServer()
+    connection = Connection()
+    run(server, ["new"] + ["moves (R U)50"] * (HISTORY_LIMIT // 50), connection)
+    session = server.store.get(connection.session_id)
+    assert len(session.journal) <= HISTORY_LIMIT
+
+def test_store_evicts_least_recently_used_and_idle_sessions():
+
+    store = SessionStore(2, idle_timeout = 10)
+    first = store.create()
+    second = store.create()
+    store.get(first)
+    store.create()
+
+    assert first in store.sessions and second not in store.sessions
+    assert store.evicted == 1
+
+    assert store.evict_idle(store.sessions[first].last_used + 5) == 0
+    assert store.evict_idle(store.sessions[first].last_used + 60) == 2
+    assert len(store) == 0
+
+def test_pipelined_commands_over_a_socket():
+    assert exchange(b"ping\nnew\nmoves R\nsolved\nquit\nping\n")[2:] == ["ok 1", "ok no", "ok"]
+
+def test_last_line_without_newline_is_answered():
+    assert exchange(b"ping\nping") == ["ok pong", "ok pong"]
+
+def test_long_lines_are_refused_alone():
+
+    # complete lines that arrive with a line that is too long are still answered, and the connection keeps working
+    answers = exchange(b"ping\nping\n" + b"x" * (LINE_LIMIT * 3) + b"\nping\n" + b"y" * (LINE_LIMIT + 1) + b"\nping\n")
+    assert answers == ["ok pong", "ok pong", "error: Line too long", "ok pong", "error: Line too long", "ok pong"]
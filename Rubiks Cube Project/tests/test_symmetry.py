@@ -0,0 +1,87 @@
+"""
+Tests of the Symmetry module
+
+"""
+
+import random
+from MoveTables import MOVES, apply_move
+from RubiksCube import Cube, SOLVED_STICKERS
+from Symmetry import MOVE_CONJUGATES, NUM_ROTATIONS, NUM_SYMMETRIES, SYMMETRY_INVERSE, SYMMETRY_MULTIPLY, canonical_stickers, canonical_symmetry, class_size, conjugate, conjugate_moves, conjugates
+
+# returns the stickers of a cube after some random moves, along with the moves
+def scrambled(rng, length = 15):
+
+    moves = [rng.randrange(len(MOVES)) for _ in range(length)]
+    stickers = SOLVED_STICKERS
+
+    for m in moves:
+        stickers = apply_move(stickers, m)
+
+    return stickers, moves
+
+def test_solved_cube_is_fixed_by_every_symmetry():
+
+    assert all([conjugate(SOLVED_STICKERS, s) == SOLVED_STICKERS for s in range(NUM_SYMMETRIES)])
+    assert class_size(SOLVED_STICKERS) == 1
+
+def test_symmetry_group_tables():
+
+    stickers = scrambled(random.Random(1))[0]
+
+    for a in range(NUM_SYMMETRIES):
+        assert SYMMETRY_MULTIPLY[a][SYMMETRY_INVERSE[a]] == 0
+        assert conjugate(conjugate(stickers, a), SYMMETRY_INVERSE[a]) == stickers
+
+        for b in range(0, NUM_SYMMETRIES, 7):
+            assert conjugate(conjugate(stickers, a), b) == conjugate(stickers, SYMMETRY_MULTIPLY[a][b])
+
+def test_move_conjugates_commute_with_conjugation():
+
+    stickers, moves = scrambled(random.Random(2))
+
+    for s in range(NUM_SYMMETRIES):
+        assert sorted(MOVE_CONJUGATES[s]) == list(range(len(MOVES)))
+
+        for m in range(len(MOVES)):
+            assert conjugate(apply_move(stickers, m), s) == apply_move(conjugate(stickers, s), MOVE_CONJUGATES[s][m])
+
+    # a whole scramble of the conjugate rebuilds the conjugate of the scramble
+    conjugated = SOLVED_STICKERS
+
+    for m in conjugate_moves(moves, 30):
+        conjugated = apply_move(conjugated, m)
+
+    assert conjugated == conjugate(stickers, 30)
+
+def test_canonical_stickers_are_shared_by_the_class():
+
+    rng = random.Random(3)
+
+    for _ in range(10):
+        stickers = scrambled(rng)[0]
+        best, s = canonical_symmetry(stickers)
+        assert best == min(conjugates(stickers)) == conjugate(stickers, s)
+        assert all([canonical_stickers(c) == best for c in conjugates(stickers)])
+        assert canonical_stickers(stickers, mirrors = False) == min(conjugates(stickers, mirrors = False))
+
+def test_class_sizes():
+
+    rng = random.Random(4)
+    stickers = scrambled(rng, 30)[0]
+    assert class_size(stickers) == NUM_SYMMETRIES
+    assert class_size(stickers, mirrors = False) == NUM_ROTATIONS
+
+    # the rotations map a clockwise quarter turn of the U face to a clockwise quarter turn of every face, and the mirrors to the counterclockwise ones too
+    cube = Cube()
+    cube.apply_algorithm("U")
+    assert cube.symmetry_class_size() == 12
+    assert cube.symmetry_class_size(mirrors = False) == 6
+
+def test_cube_canonical_key():
+
+    cube = Cube()
+    cube.apply_algorithm("R U R' U'")
+    other = Cube()
+    other.apply_algorithm("L' U' L U")
+    assert cube.canonical_key() == other.canonical_key()
+    assert cube.canonical_key() != Cube().canonical_key()
@@ -0,0 +1,81 @@
+"""
+Tests of the Tables module
+
+"""
+
+import os
+import pytest
+import Tables
+from Tables import HEADER_SIZE, load_or_build, load_table, save_table, table_path
+
+@pytest.fixture(autouse = True)
+def tables_dir(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(Tables, "TABLES_DIR", str(tmp_path))
+    return tmp_path
+
+def test_saved_tables_load_as_memoryviews(tables_dir):
+
+    save_table("numbers", range(1000), "H", version = 3)
+    table = load_table("numbers", "H", version = 3)
+
+    assert table.tolist() == list(range(1000))
+    assert table.readonly
+    assert os.listdir(str(tables_dir)) == ["numbers.bin"]
+
+def test_tables_that_dont_match_are_missing():
+
+    save_table("numbers", [1, 2, 3], "B", version = 2)
+
+    assert load_table("other", "B", version = 2) is None
+    assert load_table("numbers", "B", version = 1) is None
+    assert load_table("numbers", "H", version = 2) is None
+    assert load_table("numbers", "B", version = 2).tolist() == [1, 2, 3]
+
+def test_damaged_tables_are_built_again():
+
+    save_table("numbers", [1, 2, 3, 4], "B")
+
+    with open(table_path("numbers"), "r+b") as f:
+        f.seek(HEADER_SIZE + 2)
+        f.write(b"\x09")
+
+    assert load_table("numbers", "B") is None
+    assert load_table("numbers", "B", verify = False).tolist() == [1, 2, 9, 4]
+    assert load_or_build("numbers", "B", lambda: [1, 2, 3, 4]).tolist() == [1, 2, 3, 4]
+    assert load_table("numbers", "B").tolist() == [1, 2, 3, 4]
+
+def test_files_without_a_header_are_built_again():
+
+    with open(table_path("numbers"), "wb") as f:
+        f.write(bytes([1, 2, 3]))
+
+    assert load_table("numbers", "B") is None
+
+    # a table from before headers were added that happens to be long enough for a header
+    with open(table_path("numbers"), "wb") as f:
+        f.write(bytes(range(HEADER_SIZE + 8)))
+
+    assert load_table("numbers", "B") is None
+    assert load_or_build("numbers", "B", lambda: [7] * 8).tolist() == [7] * 8
+
+def test_tables_are_only_built_once():
+
+    calls = []
+
+    def build():
+
+        calls.append(1)
+        return [5, 6]
+
+    assert load_or_build("numbers", "B", build).tolist() == [5, 6]
+    assert load_or_build("numbers", "B", build).tolist() == [5, 6]
+    assert len(calls) == 1
+
+def test_tables_are_built_in_memory_when_they_cant_be_saved(tables_dir, monkeypatch):
+
+    blocked = tables_dir / "blocked"
+    blocked.write_bytes(b"")
+    monkeypatch.setattr(Tables, "TABLES_DIR", str(blocked))
+
+    assert load_or_build("numbers", "B", lambda: [1, 2]).tolist() == [1, 2]
@@ -0,0 +1,74 @@
+"""
+Tests of the TwoPhaseSolver module
+- The tables are built the first time the tests run, which takes a while, and are loaded from disk after that
+
+"""
+
+import random
+import pytest
+from MoveTables import MOVES, NAMED_MOVES
+from RubiksCube import Cube
+from TwoPhaseSolver import TwoPhaseSolver, solve
+
+@pytest.fixture(scope = "module")
+def solver():
+    return TwoPhaseSolver()
+
+# whether every face of a cube is a single color
+def is_solved(cube):
+    return all([len(set(cube.stickers[f * 9:f * 9 + 9])) == 1 for f in range(6)])
+
+def apply_names(cube, names):
+
+    for name in names:
+        cube.apply_move(NAMED_MOVES[name])
+
+def test_solved_cube_needs_no_moves(solver):
+
+    assert solver.solve(Cube()) == []
+
+    # a turned cube is solved no matter how it is held
+    cube = Cube()
+    cube.apply_move(NAMED_MOVES["y"])
+    assert solver.solve(cube) == []
+
+def test_solutions_solve_scrambles(solver):
+
+    rng = random.Random(3)
+
+    for n in range(5):
+        cube = Cube()
+
+        for m in range(40):
+            cube.apply_move(rng.randrange(len(MOVES)))
+
+        solution = solver.solve(cube)
+        apply_names(cube, solution)
+        assert is_solved(cube)
+
+def test_short_scramble_gets_short_solution(solver):
+
+    cube = Cube()
+    apply_names(cube, ["R", "U", "F"])
+    solution = solver.solve(cube, 3)
+    assert len(solution) <= 3
+
+    apply_names(cube, solution)
+    assert is_solved(cube)
+
+def test_unsolvable_cube_raises(solver):
+
+    stickers = bytearray(Cube().stickers)
+
+    # swapping two stickers of a corner makes a corner piece no cube has
+    stickers[8], stickers[9] = stickers[9], stickers[8]
+
+    with pytest.raises(Exception):
+        solver.solve(Cube.from_key(stickers))
+
+def test_shared_solver():
+
+    cube = Cube()
+    apply_names(cube, ["F2", "L'"])
+    apply_names(cube, solve(cube))
+    assert is_solved(cube)